@@ -1,14 +1,28 @@
 from adapters.database_connection import DatabaseConnection
+import aiohttp
 import libsql_client as lb
 from libsql_client import Client
+from typing import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
 from errors.database_errors import DatabaseConnectionError, DatabaseQueryError
 
+# Códigos de error de libsql que indican un cliente o transporte caído, recuperables reconectando.
+RECONNECTABLE_ERROR_CODES = {"CLIENT_CLOSED", "STREAM_CLOSED", "HRANA_WEBSOCKET_ERROR"}
+# Sentencias que no modifican la base de datos y pueden repetirse sin riesgo tras perder la conexión.
+READ_ONLY_STATEMENTS = {"SELECT", "EXPLAIN"}
+
 class AdapterDBConnLibsqlClient(DatabaseConnection):
     """
     Clase adaptadora para gestionar la conexión a una base de datos utilizando el cliente Libsql.
 
-    Esta clase implementa el patrón Singleton para asegurar que solo haya una instancia de la conexión a la base de datos.
-    Hereda de la clase `DatabaseConnection`.
+    Cada instancia mantiene su propio cliente, de modo que un `DatabaseConnectionPool` puede abrir varias
+    conexiones independientes. Hereda de la clase `DatabaseConnection`.
+
+    El cliente es de larga duración: `lease()` reutiliza el cliente abierto sin cerrarlo al terminar, y
+    `execute()` reconecta automáticamente si el cliente o su transporte fallan. Sólo se reintentan las
+    consultas de lectura: una escritura pudo haberse confirmado antes de perder la conexión, por lo que
+    repetirla podría aplicarla dos veces. El cliente sólo se cierra al llamar explícitamente a `close()`,
+    normalmente al apagar la aplicación.
 
     Attributes:
         database_url (str): URL de la base de datos.
@@ -17,13 +31,6 @@ class AdapterDBConnLibsqlClient(DatabaseConnection):
         current_client (Client | None): Cliente actual de la base de datos.
     """
     
-    __instance = None
-
-    def __new__(cls, *args, **kwargs):
-        if cls.__instance is None:
-            cls.__instance = super().__new__(cls)
-        return cls.__instance
-    
     def __init__(self, database_url: str, auth_token: str | None = None, tls: bool | None = None):
         """
         Inicializa una nueva instancia de AdapterDBConnLibsqlClient.
@@ -33,12 +40,10 @@ class AdapterDBConnLibsqlClient(DatabaseConnection):
             auth_token (str | None): Token de autenticación para la conexión a la base de datos.
             tls (bool | None): Indica si se debe usar TLS para la conexión.
         """
-        if not hasattr(self, "__initialized"):
-            self.__initialized = True
-            self.database_url = database_url
-            self.auth_token = auth_token
-            self.tls = tls
-            self.current_client: Client = None
+        self.database_url = database_url
+        self.auth_token = auth_token
+        self.tls = tls
+        self.current_client: Client = None
             
     async def connect(self) -> None:
         """
@@ -47,7 +52,7 @@ class AdapterDBConnLibsqlClient(DatabaseConnection):
         Raises:
             DatabaseConnectionError: Si ocurre un error al intentar conectar a la base de datos.
         """
-        if self.current_client is None:
+        if self.current_client is None or self.current_client.closed:
             try:
                 self.current_client = lb.create_client( url=self.database_url,
                                                         auth_token=self.auth_token,
@@ -66,18 +71,112 @@ class AdapterDBConnLibsqlClient(DatabaseConnection):
         Returns:
             list[tuple]: Resultados de la consulta.
 
+        Si el cliente o su transporte fallan, se reconecta y, si la consulta es de lectura, se reintenta una
+        única vez.
+
         Raises:
-            DatabaseConnectionError: Si la conexión a la base de datos está cerrada.
+            DatabaseConnectionError: Si la conexión a la base de datos está cerrada o no pudo restablecerse, o
+                si se perdió durante una escritura (que pudo haberse aplicado o no).
             DatabaseQueryError: Si ocurre un error al ejecutar la consulta.
         """
+        result = await self.__run_with_reconnect(lambda client: client.execute(stmt=query, args=params),
+                                                 _is_read_only(query))
+        return result.rows
+
+    async def execute_many(self, query: str, params_list: list[list]) -> None:
+        """
+        Ejecuta la misma consulta una vez por cada conjunto de parámetros en un único `batch` de libsql,
+        que se aplica de forma atómica.
+
+        Args:
+            query (str): La consulta SQL a ejecutar.
+            params_list (list[list]): Parámetros de cada ejecución.
+
+        Raises:
+            DatabaseConnectionError: Si la conexión a la base de datos está cerrada o no pudo restablecerse.
+            DatabaseQueryError: Si alguna ejecución falla. No se aplica ninguna.
+        """
+        await self.batch([(query, params) for params in params_list])
+
+    async def batch(self, statements: list[tuple[str, list]]) -> list[list[tuple]]:
+        """
+        Envía varias sentencias en un único viaje a la base de datos mediante `batch` de libsql, que las
+        ejecuta en orden y de forma atómica. Como en `execute`, sólo se reintenta tras una reconexión si
+        todas las sentencias son de lectura.
+
+        Args:
+            statements (list[tuple[str, list]]): Pares (consulta SQL, parámetros).
+
+        Returns:
+            list[list[tuple]]: Resultados de cada sentencia, en el mismo orden.
+
+        Raises:
+            DatabaseConnectionError: Si la conexión a la base de datos está cerrada o no pudo restablecerse, o
+                si se perdió durante un lote con escrituras (que pudo haberse aplicado o no).
+            DatabaseQueryError: Si alguna sentencia falla. No se aplica ninguna sentencia.
+        """
+        if not statements:
+            return []
+
+        stmts = [lb.Statement(query, params) for query, params in statements]
+        results = await self.__run_with_reconnect(lambda client: client.batch(stmts),
+                                                  all(_is_read_only(query) for query, _ in statements))
+        return [result.rows for result in results]
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["LibsqlTransaction"]:
+        """
+        Abre una transacción interactiva de libsql durante el bloque `async with`.
+
+        La transacción se confirma al salir del bloque y se revierte si el bloque lanza una excepción.
+        A diferencia de `execute`, las consultas de la transacción no se reintentan ante una reconexión.
+
+        Yields:
+            LibsqlTransaction: Conexión sobre la cual ejecutar las consultas de la transacción.
+
+        Raises:
+            DatabaseConnectionError: Si la conexión a la base de datos está cerrada.
+        """
         if self.current_client is None:
             raise DatabaseConnectionError("La conexión a la base de datos está cerrada.")
-        
+
+        tx = LibsqlTransaction(self.current_client.transaction())
         try:
-            result = await self.current_client.execute(stmt=query, args=params)
-            return result.rows
-        except lb.LibsqlError as error:
-            raise DatabaseQueryError(f"Error al realizar la consulta. Detalles: {str(error)}")
+            yield tx
+            await tx.commit()
+        except BaseException:
+            await tx.rollback()
+            raise
+        finally:
+            await tx.close()
+
+    async def reconnect(self) -> None:
+        """
+        Descarta el cliente actual y abre uno nuevo.
+
+        Raises:
+            DatabaseConnectionError: Si ocurre un error al intentar conectar a la base de datos.
+        """
+        client, self.current_client = self.current_client, None
+        if client is not None:
+            try:
+                await client.close()
+            except Exception:
+                pass
+        await self.connect()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator["AdapterDBConnLibsqlClient"]:
+        """
+        Presta el cliente de larga duración, abriéndolo si aún no existe o si fue cerrado.
+
+        A diferencia de la implementación por defecto, el cliente no se cierra al salir del bloque.
+
+        Yields:
+            AdapterDBConnLibsqlClient: La propia conexión, lista para ejecutar consultas.
+        """
+        await self.connect()
+        yield self
         
     async def close(self) -> None:
         """
@@ -86,3 +185,126 @@ class AdapterDBConnLibsqlClient(DatabaseConnection):
         if self.current_client is not None:
             await self.current_client.close()
             self.current_client = None
+
+    async def __run_with_reconnect(self, operation: Callable[[Client], Awaitable], retry: bool):
+        if self.current_client is None:
+            raise DatabaseConnectionError("La conexión a la base de datos está cerrada.")
+        if self.current_client.closed:
+            # Nada se envió todavía, por lo que reconectar antes de ejecutar es seguro también para escrituras.
+            await self.reconnect()
+
+        try:
+            return await operation(self.current_client)
+        except Exception as error:
+            if not _is_reconnectable(error):
+                raise DatabaseQueryError(f"Error al realizar la consulta. Detalles: {str(error)}")
+            if not retry and not _failed_before_sending(error):
+                await self.reconnect()
+                raise DatabaseConnectionError("Se perdió la conexión a la base de datos durante una escritura; "
+                                              f"no se sabe si se aplicó. Detalles: {str(error)}")
+
+        await self.reconnect()
+        try:
+            return await operation(self.current_client)
+        except Exception as error:
+            if _is_reconnectable(error):
+                raise DatabaseConnectionError(f"Se perdió la conexión a la base de datos. Detalles: {str(error)}")
+            raise DatabaseQueryError(f"Error al realizar la consulta. Detalles: {str(error)}")
+
+
+class LibsqlTransaction(DatabaseConnection):
+    """
+    Transacción interactiva de libsql expuesta con la interfaz de `DatabaseConnection`.
+
+    Se obtiene con `AdapterDBConnLibsqlClient.transaction()`, que la confirma o revierte al terminar.
+    Las transacciones anidadas se integran en la transacción en curso.
+    """
+
+    def __init__(self, transaction: lb.Transaction):
+        """
+        Inicializa una nueva instancia de LibsqlTransaction.
+
+        Args:
+            transaction (lb.Transaction): Transacción abierta del cliente de libsql.
+        """
+        self.__transaction = transaction
+
+    async def connect(self) -> None:
+        """
+        La transacción ya se encuentra abierta; no realiza ninguna acción.
+        """
+        pass
+
+    async def execute(self, query: str, params: list) -> list[tuple]:
+        """
+        Ejecuta una consulta dentro de la transacción.
+
+        Args:
+            query (str): La consulta SQL a ejecutar.
+            params (list): Lista de parámetros para la consulta.
+
+        Returns:
+            list[tuple]: Resultados de la consulta.
+
+        Raises:
+            DatabaseConnectionError: Si se perdió la conexión durante la transacción.
+            DatabaseQueryError: Si ocurre un error al ejecutar la consulta.
+        """
+        try:
+            result = await self.__transaction.execute(query, params)
+            return result.rows
+        except Exception as error:
+            if _is_reconnectable(error):
+                raise DatabaseConnectionError(f"Se perdió la conexión durante la transacción. Detalles: {str(error)}")
+            raise DatabaseQueryError(f"Error al realizar la consulta. Detalles: {str(error)}")
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["LibsqlTransaction"]:
+        """
+        Devuelve la propia transacción: las sentencias se confirman junto con la transacción en curso.
+
+        Yields:
+            LibsqlTransaction: La propia transacción.
+        """
+        yield self
+
+    async def commit(self) -> None:
+        """
+        Confirma la transacción.
+
+        Raises:
+            DatabaseQueryError: Si la transacción no pudo confirmarse.
+        """
+        try:
+            await self.__transaction.commit()
+        except Exception as error:
+            raise DatabaseQueryError(f"Error al confirmar la transacción. Detalles: {str(error)}")
+
+    async def rollback(self) -> None:
+        """
+        Revierte la transacción si aún está abierta.
+        """
+        if not self.__transaction.closed:
+            try:
+                await self.__transaction.rollback()
+            except Exception:
+                pass
+
+    async def close(self) -> None:
+        """
+        Libera la transacción.
+        """
+        self.__transaction.close()
+
+
+def _is_read_only(query: str) -> bool:
+    words = query.split(None, 1)
+    return bool(words) and words[0].rstrip(";").upper() in READ_ONLY_STATEMENTS
+
+def _failed_before_sending(error: Exception) -> bool:
+    return isinstance(error, aiohttp.ClientConnectorError)
+
+def _is_reconnectable(error: Exception) -> bool:
+    if isinstance(error, lb.LibsqlError):
+        return error.code in RECONNECTABLE_ERROR_CODES
+    return isinstance(error, (OSError, aiohttp.ClientConnectionError))
@@ -0,0 +1,393 @@
+import queue
+import sqlite3
+import asyncio
+from typing import AsyncIterator
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from adapters.database_connection import DatabaseConnection
+from adapters.statement_cache import StatementCacheStats
+from errors.database_errors import DatabaseConnectionError, DatabaseQueryError
+from utils.sampling_profiler import profiled_call
+
+# Sentencias que pueden ejecutarse sobre las conexiones de sólo lectura.
+READ_STATEMENTS = ("SELECT", "EXPLAIN")
+WRITE_KEYWORDS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+class AdapterDBConnSqlite3(DatabaseConnection):
+    """
+    Clase adaptadora para una base de datos SQLite local en modo WAL.
+
+    Las consultas nunca bloquean el event loop: las lecturas se ejecutan en un pool de hilos sobre varias
+    conexiones de sólo lectura, y las escrituras sobre una única conexión de escritura con un hilo propio.
+    Las escrituras concurrentes se agrupan en una misma transacción (group commit): cada operación se
+    aísla con un SAVEPOINT, de modo que el error de una no afecta a las demás, y el lote completo se
+    confirma con un único COMMIT. Hereda de la clase `DatabaseConnection`.
+
+    Attributes:
+        database_path (str): Ruta del archivo de la base de datos.
+        read_connections (int): Cantidad de conexiones (e hilos) de lectura.
+        group_commit_max_size (int): Cantidad máxima de operaciones confirmadas en un mismo COMMIT.
+        busy_timeout_ms (int): Milisegundos de espera ante una base de datos bloqueada.
+        pragmas (dict[str, str | int]): PRAGMAs aplicados a cada conexión.
+        cached_statements (int): Capacidad de la caché de sentencias preparadas de cada conexión.
+    """
+
+    def __init__(self, database_path: str, read_connections: int = 4, group_commit_max_size: int = 64,
+                 busy_timeout_ms: int = 5000, pragmas: dict[str, str | int] | None = None,
+                 cached_statements: int = 256):
+        """
+        Inicializa una nueva instancia de AdapterDBConnSqlite3.
+
+        Args:
+            database_path (str): Ruta del archivo de la base de datos. Se crea si no existe.
+            read_connections (int): Cantidad de conexiones (e hilos) de lectura.
+            group_commit_max_size (int): Cantidad máxima de operaciones confirmadas en un mismo COMMIT.
+            busy_timeout_ms (int): Milisegundos de espera ante una base de datos bloqueada.
+            pragmas (dict[str, str | int] | None): PRAGMAs adicionales o que reemplazan a los predeterminados.
+            cached_statements (int): Capacidad de la caché de sentencias preparadas de cada conexión.
+        """
+        self.database_path = database_path
+        self.read_connections = max(1, read_connections)
+        self.group_commit_max_size = max(1, group_commit_max_size)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.pragmas = {
+            "synchronous": "NORMAL",
+            "temp_store": "MEMORY",
+            "cache_size": -20000,
+            "mmap_size": 268435456,
+            "foreign_keys": "ON",
+            **(pragmas or {})
+        }
+        self.cached_statements = cached_statements
+        self.__statement_cache = StatementCacheStats(cached_statements)
+
+        self.__writer: sqlite3.Connection | None = None
+        self.__readers: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+        self.__read_executor: ThreadPoolExecutor | None = None
+        self.__write_executor: ThreadPoolExecutor | None = None
+        self.__write_queue: asyncio.Queue | None = None
+        self.__writer_task: asyncio.Task | None = None
+        self.__writer_lock = asyncio.Lock()
+        self.__connect_lock = asyncio.Lock()
+
+    async def connect(self) -> None:
+        """
+        Abre la conexión de escritura y las conexiones de lectura, y aplica los PRAGMAs. Las llamadas
+        concurrentes esperan a la primera en lugar de abrir conexiones duplicadas.
+
+        Raises:
+            DatabaseConnectionError: Si ocurre un error al intentar abrir la base de datos.
+        """
+        # El group commit se inicia al final, por lo que indica que la conexión está completamente abierta.
+        if self.__writer_task is not None:
+            return
+
+        async with self.__connect_lock:
+            if self.__writer_task is None:
+                await self.__open()
+
+    async def __open(self) -> None:
+        self.__write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        self.__read_executor = ThreadPoolExecutor(max_workers=self.read_connections,
+                                                  thread_name_prefix="sqlite-reader")
+        loop = asyncio.get_running_loop()
+        try:
+            # La conexión de escritura se abre primero para activar WAL antes de abrir los lectores.
+            self.__writer = await loop.run_in_executor(self.__write_executor, self.__open_connection, False)
+            for _ in range(self.read_connections):
+                self.__readers.put(await loop.run_in_executor(self.__read_executor, self.__open_connection, True))
+        except Exception as error:
+            await self.close()
+            raise DatabaseConnectionError(f"Error al abrir la base de datos '{self.database_path}'. Detalles: {str(error)}")
+
+        self.__write_queue = asyncio.Queue()
+        self.__writer_task = asyncio.create_task(self.__group_commit_loop(self.__write_queue))
+
+    async def execute(self, query: str, params: list) -> list[tuple]:
+        """
+        Ejecuta una consulta en la base de datos.
+
+        Las lecturas se ejecutan en paralelo sobre las conexiones de lectura; las escrituras se encolan
+        para la conexión de escritura y retornan una vez confirmadas.
+
+        Args:
+            query (str): La consulta SQL a ejecutar.
+            params (list): Lista de parámetros para la consulta.
+
+        Returns:
+            list[tuple]: Resultados de la consulta.
+
+        Raises:
+            DatabaseConnectionError: Si la conexión a la base de datos está cerrada.
+            DatabaseQueryError: Si ocurre un error al ejecutar la consulta.
+        """
+        self.__statement_cache.record(query)
+        if _is_read_query(query):
+            return await self.__read(query, params)
+        return (await self.__write([(query, params)]))[0]
+
+    async def execute_many(self, query: str, params_list: list[list]) -> None:
+        """
+        Ejecuta la misma consulta una vez por cada conjunto de parámetros, de forma atómica.
+
+        Args:
+            query (str): La consulta SQL a ejecutar.
+            params_list (list[list]): Parámetros de cada ejecución.
+        """
+        self.__statement_cache.record(query)
+        await self.__write([(query, params) for params in params_list])
+
+    async def batch(self, statements: list[tuple[str, list]]) -> list[list[tuple]]:
+        """
+        Ejecuta varias sentencias en orden y de forma atómica sobre la conexión de escritura.
+
+        Args:
+            statements (list[tuple[str, list]]): Pares (consulta SQL, parámetros).
+
+        Returns:
+            list[list[tuple]]: Resultados de cada sentencia, en el mismo orden.
+        """
+        if not statements:
+            return []
+        for query, _ in statements:
+            self.__statement_cache.record(query)
+        return await self.__write(statements)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["Sqlite3Transaction"]:
+        """
+        Abre una transacción interactiva sobre la conexión de escritura.
+
+        Mientras la transacción está abierta, el group commit queda en espera, por lo que conviene
+        mantenerla lo más breve posible.
+
+        Yields:
+            Sqlite3Transaction: Conexión sobre la cual ejecutar las consultas de la transacción.
+
+        Raises:
+            DatabaseConnectionError: Si la conexión a la base de datos está cerrada.
+        """
+        if self.__writer is None:
+            raise DatabaseConnectionError("La conexión a la base de datos está cerrada.")
+
+        async with self.__writer_lock:
+            tx = Sqlite3Transaction(self.__writer, self.__write_executor)
+            await tx.execute("BEGIN IMMEDIATE;", [])
+            try:
+                yield tx
+                await tx.execute("COMMIT;", [])
+            except BaseException:
+                if self.__writer.in_transaction:
+                    await tx.execute("ROLLBACK;", [])
+                raise
+
+    def statement_cache_stats(self) -> dict:
+        """
+        Devuelve la tasa de aciertos de la caché de sentencias preparadas, medida sobre una réplica con la
+        misma capacidad que la caché de cada conexión.
+
+        Returns:
+            dict: Sentencias almacenadas, capacidad, aciertos, fallos y tasa de aciertos.
+        """
+        return self.__statement_cache.stats()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator["AdapterDBConnSqlite3"]:
+        """
+        Presta la propia conexión, abriéndola si aún no existe. Las conexiones no se cierran al salir.
+
+        Yields:
+            AdapterDBConnSqlite3: La propia conexión, lista para ejecutar consultas.
+        """
+        await self.connect()
+        yield self
+
+    async def close(self) -> None:
+        """
+        Confirma las escrituras pendientes y cierra todas las conexiones.
+        """
+        # Las escrituras posteriores fallan en lugar de quedar detrás del fin de la cola, que nadie consume.
+        write_queue, self.__write_queue = self.__write_queue, None
+        if self.__writer_task is not None:
+            await write_queue.put(None)
+            await self.__writer_task
+            self.__writer_task = None
+            while not write_queue.empty():
+                operation = write_queue.get_nowait()
+                if operation is not None and not operation[1].done():
+                    operation[1].set_exception(DatabaseConnectionError("La conexión a la base de datos está cerrada."))
+
+        loop = asyncio.get_running_loop()
+        if self.__writer is not None:
+            await loop.run_in_executor(self.__write_executor, self.__writer.close)
+            self.__writer = None
+        while not self.__readers.empty():
+            await loop.run_in_executor(self.__read_executor, self.__readers.get().close)
+
+        for executor in (self.__read_executor, self.__write_executor):
+            if executor is not None:
+                executor.shutdown(wait=False)
+        self.__read_executor = self.__write_executor = None
+
+    def __open_connection(self, read_only: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.database_path, isolation_level=None, check_same_thread=False,
+                               timeout=self.busy_timeout_ms / 1000, cached_statements=self.cached_statements)
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)};")
+        if not read_only:
+            conn.execute("PRAGMA journal_mode = WAL;")
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value};")
+        if read_only:
+            conn.execute("PRAGMA query_only = ON;")
+        return conn
+
+    async def __read(self, query: str, params: list) -> list[tuple]:
+        if self.__read_executor is None:
+            raise DatabaseConnectionError("La conexión a la base de datos está cerrada.")
+
+        def run() -> list[tuple]:
+            conn = self.__readers.get()
+            try:
+                return conn.execute(query, params).fetchall()
+            finally:
+                self.__readers.put(conn)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.__read_executor, profiled_call(run))
+        except sqlite3.Error as error:
+            raise DatabaseQueryError(f"Error al ejecutar la consulta. Detalles: {str(error)}")
+
+    async def __write(self, statements: list[tuple[str, list]]) -> list[list[tuple]]:
+        if self.__write_queue is None:
+            raise DatabaseConnectionError("La conexión a la base de datos está cerrada.")
+
+        future = asyncio.get_running_loop().create_future()
+        await self.__write_queue.put((statements, future))
+        return await future
+
+    async def __group_commit_loop(self, write_queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            operations = [await write_queue.get()]
+            while len(operations) < self.group_commit_max_size and not write_queue.empty():
+                operations.append(write_queue.get_nowait())
+
+            if None in operations:
+                stopping = True
+                operations = [operation for operation in operations if operation is not None]
+            if not operations:
+                continue
+
+            async with self.__writer_lock:
+                try:
+                    results = await loop.run_in_executor(self.__write_executor, _commit_group, self.__writer,
+                                                         [statements for statements, _ in operations])
+                except Exception as error:
+                    results = [DatabaseQueryError(f"Error al confirmar las escrituras. Detalles: {str(error)}")] * len(operations)
+
+            for (_, future), result in zip(operations, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+class Sqlite3Transaction(DatabaseConnection):
+    """
+    Transacción interactiva sobre la conexión de escritura de `AdapterDBConnSqlite3`.
+
+    Se obtiene con `AdapterDBConnSqlite3.transaction()`, que la confirma o revierte al terminar.
+    Las transacciones anidadas se integran en la transacción en curso.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, executor: ThreadPoolExecutor):
+        """
+        Inicializa una nueva instancia de Sqlite3Transaction.
+
+        Args:
+            connection (sqlite3.Connection): Conexión de escritura.
+            executor (ThreadPoolExecutor): Hilo dedicado a la conexión de escritura.
+        """
+        self.__connection = connection
+        self.__executor = executor
+
+    async def connect(self) -> None:
+        """
+        La transacción ya se encuentra abierta; no realiza ninguna acción.
+        """
+        pass
+
+    async def execute(self, query: str, params: list) -> list[tuple]:
+        """
+        Ejecuta una consulta dentro de la transacción.
+
+        Args:
+            query (str): La consulta SQL a ejecutar.
+            params (list): Lista de parámetros para la consulta.
+
+        Returns:
+            list[tuple]: Resultados de la consulta.
+
+        Raises:
+            DatabaseQueryError: Si ocurre un error al ejecutar la consulta.
+        """
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.__executor, profiled_call(lambda: self.__connection.execute(query, params).fetchall()))
+        except sqlite3.Error as error:
+            raise DatabaseQueryError(f"Error al ejecutar la consulta. Detalles: {str(error)}")
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["Sqlite3Transaction"]:
+        """
+        Devuelve la propia transacción: las sentencias se confirman junto con la transacción en curso.
+
+        Yields:
+            Sqlite3Transaction: La propia transacción.
+        """
+        yield self
+
+    async def close(self) -> None:
+        """
+        La transacción se cierra al salir de `transaction()`; no realiza ninguna acción.
+        """
+        pass
+
+
+def _is_read_query(query: str) -> bool:
+    statement = query.lstrip().upper()
+    if statement.startswith(READ_STATEMENTS):
+        return " RETURNING " not in statement
+    if statement.startswith("WITH"):
+        return not any(keyword in statement for keyword in WRITE_KEYWORDS)
+    return False
+
+def _commit_group(conn: sqlite3.Connection, groups: list[list[tuple[str, list]]]) -> list[list[list[tuple]] | Exception]:
+    """
+    Ejecuta en el hilo de escritura un grupo de operaciones dentro de una única transacción.
+
+    Cada operación se aísla con un SAVEPOINT: si falla, sólo se revierten sus sentencias y su resultado
+    es la excepción correspondiente.
+    """
+    results: list[list[list[tuple]] | Exception] = []
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        for statements in groups:
+            conn.execute("SAVEPOINT operation;")
+            try:
+                results.append([conn.execute(query, params).fetchall() for query, params in statements])
+                conn.execute("RELEASE operation;")
+            except sqlite3.Error as error:
+                conn.execute("ROLLBACK TO operation;")
+                conn.execute("RELEASE operation;")
+                results.append(DatabaseQueryError(f"Error al ejecutar la consulta. Detalles: {str(error)}"))
+        conn.execute("COMMIT;")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK;")
+        raise
+    return results
@@ -1,5 +1,9 @@
 import sqlite3
+import asyncio
+from typing import AsyncIterator
+from contextlib import asynccontextmanager
 from adapters.database_connection import DatabaseConnection
+from adapters.statement_cache import StatementCacheStats
 from errors.database_errors import DatabaseConnectionError, DatabaseQueryError
 
 
@@ -15,6 +19,8 @@ class AdapterDBConnMemorySqlite3Test(DatabaseConnection):
     """
     
     __instance = None
+    # Capacidad de la caché de sentencias preparadas de la conexión.
+    CACHED_STATEMENTS = 128
 
     def __new__(cls):
         if cls.__instance is None:
@@ -28,6 +34,8 @@ class AdapterDBConnMemorySqlite3Test(DatabaseConnection):
         if not hasattr(self, "__initialized"):
             self.__initialized = True
             self.__connection: sqlite3.Connection | None = None
+            self.__transaction_lock = asyncio.Lock()
+            self.__statement_cache = StatementCacheStats(self.CACHED_STATEMENTS)
             
     async def connect(self) -> None:
         """
@@ -37,7 +45,9 @@ class AdapterDBConnMemorySqlite3Test(DatabaseConnection):
             DatabaseConnectionError: Si ocurre un error al intentar conectar a la base de datos.
         """
         if self.__connection is None:
-            self.__connection = sqlite3.connect(":memory:")
+            # Modo autocommit: las transacciones se abren explícitamente con `transaction()`.
+            self.__connection = sqlite3.connect(":memory:", isolation_level=None,
+                                                cached_statements=self.CACHED_STATEMENTS)
             cursor = self.__connection.cursor()
             cursor.execute("""
                 CREATE TABLE user (
@@ -67,6 +77,7 @@ class AdapterDBConnMemorySqlite3Test(DatabaseConnection):
         if self.__connection is None:
             raise DatabaseConnectionError("La conexión a la base de datos está cerrada.")
         
+        self.__statement_cache.record(query)
         try:
             cursor = self.__connection.cursor()
             cursor.execute(query, params)
@@ -83,3 +94,77 @@ class AdapterDBConnMemorySqlite3Test(DatabaseConnection):
         if self.__connection is None:
             return
         self.__connection.close()
+
+    def statement_cache_stats(self) -> dict:
+        """
+        Devuelve la tasa de aciertos de la caché de sentencias preparadas de la conexión.
+
+        Returns:
+            dict: Sentencias almacenadas, capacidad, aciertos, fallos y tasa de aciertos.
+        """
+        return self.__statement_cache.stats()
+
+    async def execute_many(self, query: str, params_list: list[list]) -> None:
+        """
+        Ejecuta la misma consulta una vez por cada conjunto de parámetros, dentro de una transacción.
+
+        Args:
+            query (str): La consulta SQL a ejecutar.
+            params_list (list[list]): Parámetros de cada ejecución.
+
+        Raises:
+            DatabaseConnectionError: Si la conexión a la base de datos está cerrada.
+            DatabaseQueryError: Si ocurre un error al ejecutar la consulta. No se aplica ninguna ejecución.
+        """
+        self.__run_atomically(lambda cursor: cursor.executemany(query, params_list))
+
+    async def batch(self, statements: list[tuple[str, list]]) -> list[list[tuple]]:
+        """
+        Ejecuta varias sentencias en orden dentro de una transacción.
+
+        Args:
+            statements (list[tuple[str, list]]): Pares (consulta SQL, parámetros).
+
+        Returns:
+            list[list[tuple]]: Resultados de cada sentencia, en el mismo orden.
+
+        Raises:
+            DatabaseConnectionError: Si la conexión a la base de datos está cerrada.
+            DatabaseQueryError: Si alguna sentencia falla. No se aplica ninguna sentencia.
+        """
+        return self.__run_atomically(
+            lambda cursor: [cursor.execute(query, params).fetchall() for query, params in statements])
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["AdapterDBConnMemorySqlite3Test"]:
+        """
+        Abre una transacción interactiva durante el bloque `async with`.
+
+        Como todas las operaciones comparten una única conexión, las transacciones se serializan entre sí.
+
+        Yields:
+            AdapterDBConnMemorySqlite3Test: La propia conexión.
+        """
+        async with self.__transaction_lock:
+            await self.execute("BEGIN;", [])
+            try:
+                yield self
+            except BaseException:
+                await self.execute("ROLLBACK;", [])
+                raise
+            await self.execute("COMMIT;", [])
+
+    def __run_atomically(self, operation):
+        if self.__connection is None:
+            raise DatabaseConnectionError("La conexión a la base de datos está cerrada.")
+
+        cursor = self.__connection.cursor()
+        try:
+            cursor.execute("BEGIN;")
+            result = operation(cursor)
+            cursor.execute("COMMIT;")
+            return result
+        except Exception as E:
+            if self.__connection.in_transaction:
+                self.__connection.rollback()
+            raise DatabaseQueryError(f"Error al ejecutar la consulta. Detalles: {str(E)}")
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Hashable
 
 class DatabaseConnection(ABC):
     """
@@ -6,6 +8,10 @@ class DatabaseConnection(ABC):
 
     Esta clase proporciona métodos abstractos que deben ser implementados por cualquier clase que herede de ella.
     Los métodos incluyen la conexión a la base de datos, la ejecución de consultas y el cierre de la conexión.
+
+    Además ofrece `execute_many`, `batch` y `transaction` para agrupar varias sentencias. Sus implementaciones
+    por defecto se basan en `execute` con `BEGIN`/`COMMIT`/`ROLLBACK`; los adaptadores las sobrescriben para
+    enviar las sentencias en un único viaje a la base de datos cuando el motor lo permite.
     """
 
     @abstractmethod
@@ -16,7 +22,7 @@ class DatabaseConnection(ABC):
         Este método debe ser implementado por las subclases para definir cómo se establece la conexión.
         """
         pass
-    
+
     @abstractmethod
     async def execute(self, query: str, params: list) -> list[tuple]:
         """
@@ -32,7 +38,7 @@ class DatabaseConnection(ABC):
         Este método debe ser implementado por las subclases para definir cómo se ejecutan las consultas.
         """
         pass
-    
+
     @abstractmethod
     async def close(self) -> None:
         """
@@ -41,3 +47,98 @@ class DatabaseConnection(ABC):
         Este método debe ser implementado por las subclases para definir cómo se cierra la conexión.
         """
         pass
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator["DatabaseConnection"]:
+        """
+        Presta una conexión lista para ejecutar consultas durante el bloque `async with`.
+
+        La implementación por defecto abre la conexión al entrar y la cierra al salir. Las subclases
+        que mantienen conexiones reutilizables (por ejemplo, un pool) la sobrescriben para tomar y
+        devolver conexiones sin cerrarlas.
+
+        Yields:
+            DatabaseConnection: Conexión sobre la cual ejecutar las consultas.
+        """
+        await self.connect()
+        try:
+            yield self
+        finally:
+            await self.close()
+
+    @asynccontextmanager
+    async def reader(self, key: Hashable | None = None) -> AsyncIterator["DatabaseConnection"]:
+        """
+        Presta una conexión para consultas de sólo lectura.
+
+        Por defecto equivale a `lease()`. Las conexiones con réplicas de lectura la sobrescriben para
+        enviar las lecturas a una réplica.
+
+        Args:
+            key (Hashable | None): Clave de la entidad leída, usada para leer las propias escrituras.
+
+        Yields:
+            DatabaseConnection: Conexión sobre la cual ejecutar las consultas de lectura.
+        """
+        async with self.lease() as conn:
+            yield conn
+
+    def record_write(self, *keys: Hashable) -> None:
+        """
+        Registra que las claves indicadas acaban de escribirse, para que sus lecturas posteriores vean
+        la escritura. Por defecto no realiza ninguna acción.
+
+        Args:
+            *keys (Hashable): Claves de las entidades escritas.
+        """
+        pass
+
+    def statement_cache_stats(self) -> dict | None:
+        """
+        Devuelve la tasa de aciertos de la caché de sentencias preparadas de la conexión.
+
+        Returns:
+            dict | None: Estadísticas de la caché, o None si el adaptador no mantiene una.
+        """
+        return None
+
+    async def execute_many(self, query: str, params_list: list[list]) -> None:
+        """
+        Ejecuta la misma consulta una vez por cada conjunto de parámetros, de forma atómica.
+
+        Args:
+            query (str): La consulta SQL a ejecutar.
+            params_list (list[list]): Parámetros de cada ejecución.
+        """
+        await self.batch([(query, params) for params in params_list])
+
+    async def batch(self, statements: list[tuple[str, list]]) -> list[list[tuple]]:
+        """
+        Ejecuta varias sentencias en orden y de forma atómica: si alguna falla, no se aplica ninguna.
+
+        Args:
+            statements (list[tuple[str, list]]): Pares (consulta SQL, parámetros).
+
+        Returns:
+            list[list[tuple]]: Resultados de cada sentencia, en el mismo orden.
+        """
+        async with self.transaction() as tx:
+            return [await tx.execute(query, params) for query, params in statements]
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["DatabaseConnection"]:
+        """
+        Abre una transacción interactiva durante el bloque `async with`.
+
+        La transacción se confirma al salir del bloque y se revierte si el bloque lanza una excepción.
+
+        Yields:
+            DatabaseConnection: Conexión sobre la cual ejecutar las consultas de la transacción.
+        """
+        await self.execute("BEGIN;", [])
+        try:
+            yield self
+        except BaseException:
+            await self.execute("ROLLBACK;", [])
+            raise
+        await self.execute("COMMIT;", [])
@@ -0,0 +1,234 @@
+import time
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from adapters.database_connection import DatabaseConnection
+from errors.database_errors import DatabaseConnectionError, DatabasePoolTimeoutError
+
+
+class DatabaseConnectionPool(DatabaseConnection):
+    """
+    Pool asíncrono de conexiones a base de datos.
+
+    Mantiene un conjunto de conexiones abiertas creadas a partir de `connection_factory` y las presta a
+    los servicios mediante `lease()`, permitiendo que consultas independientes se ejecuten de forma
+    concurrente sin abrir ni cerrar una conexión por consulta. Hereda de la clase `DatabaseConnection`,
+    por lo que puede inyectarse en cualquier servicio que espere una conexión.
+
+    Attributes:
+        connection_factory (Callable[[], DatabaseConnection]): Función que construye una conexión nueva (sin conectar).
+        min_size (int): Cantidad de conexiones que se abren al llamar a `connect()`.
+        max_size (int): Cantidad máxima de conexiones prestadas en simultáneo.
+        acquire_timeout (float): Segundos máximos de espera para obtener una conexión.
+        health_check_interval (float): Segundos de inactividad a partir de los cuales una conexión se verifica
+            antes de volver a prestarse.
+        health_check_query (str): Consulta utilizada para verificar el estado de una conexión.
+    """
+
+    def __init__(self, connection_factory: Callable[[], DatabaseConnection], min_size: int = 1,
+                 max_size: int = 10, acquire_timeout: float = 10.0, health_check_interval: float = 30.0,
+                 health_check_query: str = "SELECT 1;"):
+        """
+        Inicializa una nueva instancia de DatabaseConnectionPool.
+
+        Args:
+            connection_factory (Callable[[], DatabaseConnection]): Función que construye una conexión nueva.
+            min_size (int): Cantidad de conexiones que se abren al llamar a `connect()`.
+            max_size (int): Cantidad máxima de conexiones prestadas en simultáneo.
+            acquire_timeout (float): Segundos máximos de espera para obtener una conexión.
+            health_check_interval (float): Segundos de inactividad tras los cuales se verifica una conexión.
+            health_check_query (str): Consulta utilizada para verificar el estado de una conexión.
+
+        Raises:
+            ValueError: Si los tamaños del pool no son coherentes.
+        """
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(f"Tamaños de pool inválidos: min_size={min_size}, max_size={max_size}.")
+
+        self.connection_factory = connection_factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+        self.health_check_query = health_check_query
+
+        self.__idle: deque[tuple[DatabaseConnection, float]] = deque()
+        self.__semaphore = asyncio.Semaphore(max_size)
+        self.__size = 0
+        self.__closed = False
+
+    async def connect(self) -> None:
+        """
+        Abre conexiones hasta alcanzar `min_size`.
+
+        Raises:
+            DatabaseConnectionError: Si ocurre un error al intentar conectar a la base de datos.
+        """
+        self.__closed = False
+        while self.__size < self.min_size:
+            self.__idle.append((await self.__open_connection(), time.monotonic()))
+
+    async def acquire(self) -> DatabaseConnection:
+        """
+        Toma una conexión del pool, abriendo una nueva si no hay conexiones ociosas.
+
+        Las conexiones que estuvieron inactivas más de `health_check_interval` segundos se verifican
+        antes de prestarse; si fallan, se descartan y se reemplazan.
+
+        Returns:
+            DatabaseConnection: Conexión lista para ejecutar consultas.
+
+        Raises:
+            DatabaseConnectionError: Si el pool está cerrado o no se pudo abrir una conexión.
+            DatabasePoolTimeoutError: Si no se obtuvo una conexión dentro de `acquire_timeout`.
+        """
+        if self.__closed:
+            raise DatabaseConnectionError("El pool de conexiones está cerrado.")
+
+        try:
+            await asyncio.wait_for(self.__semaphore.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise DatabasePoolTimeoutError(
+                f"No se obtuvo una conexión del pool en {self.acquire_timeout} segundos.")
+
+        try:
+            while self.__idle:
+                conn, last_used = self.__idle.pop()
+                if time.monotonic() - last_used < self.health_check_interval or await self.__is_healthy(conn):
+                    return conn
+                await self.__discard(conn)
+
+            return await self.__open_connection()
+        except BaseException:
+            self.__semaphore.release()
+            raise
+
+    async def release(self, conn: DatabaseConnection, discard: bool = False) -> None:
+        """
+        Devuelve una conexión al pool.
+
+        Args:
+            conn (DatabaseConnection): Conexión obtenida previamente con `acquire()`.
+            discard (bool): Si es True, la conexión se cierra en lugar de reutilizarse.
+        """
+        try:
+            if discard or self.__closed:
+                await self.__discard(conn)
+            else:
+                self.__idle.append((conn, time.monotonic()))
+        finally:
+            self.__semaphore.release()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[DatabaseConnection]:
+        """
+        Presta una conexión del pool durante el bloque `async with` y la devuelve al salir.
+
+        Si durante el bloque se produce un `DatabaseConnectionError`, la conexión se descarta.
+
+        Yields:
+            DatabaseConnection: Conexión sobre la cual ejecutar las consultas.
+        """
+        conn = await self.acquire()
+        discard = False
+        try:
+            yield conn
+        except DatabaseConnectionError:
+            discard = True
+            raise
+        finally:
+            await self.release(conn, discard=discard)
+
+    async def execute(self, query: str, params: list) -> list[tuple]:
+        """
+        Ejecuta una consulta sobre una conexión prestada por el pool.
+
+        Args:
+            query (str): La consulta SQL a ejecutar.
+            params (list): Lista de parámetros para la consulta.
+
+        Returns:
+            list[tuple]: Resultados de la consulta.
+        """
+        async with self.lease() as conn:
+            return await conn.execute(query, params)
+
+    async def execute_many(self, query: str, params_list: list[list]) -> None:
+        """
+        Ejecuta la misma consulta una vez por cada conjunto de parámetros, sobre una conexión prestada por el pool.
+
+        Args:
+            query (str): La consulta SQL a ejecutar.
+            params_list (list[list]): Parámetros de cada ejecución.
+        """
+        async with self.lease() as conn:
+            await conn.execute_many(query, params_list)
+
+    async def batch(self, statements: list[tuple[str, list]]) -> list[list[tuple]]:
+        """
+        Ejecuta varias sentencias de forma atómica sobre una conexión prestada por el pool.
+
+        Args:
+            statements (list[tuple[str, list]]): Pares (consulta SQL, parámetros).
+
+        Returns:
+            list[list[tuple]]: Resultados de cada sentencia, en el mismo orden.
+        """
+        async with self.lease() as conn:
+            return await conn.batch(statements)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[DatabaseConnection]:
+        """
+        Abre una transacción sobre una conexión prestada por el pool, que se devuelve al terminar.
+
+        Yields:
+            DatabaseConnection: Conexión sobre la cual ejecutar las consultas de la transacción.
+        """
+        async with self.lease() as conn:
+            async with conn.transaction() as tx:
+                yield tx
+
+    async def close(self) -> None:
+        """
+        Cierra el pool y todas sus conexiones ociosas. Las conexiones prestadas se cierran al devolverse.
+        """
+        self.__closed = True
+        while self.__idle:
+            conn, _ = self.__idle.pop()
+            await self.__discard(conn)
+
+    def stats(self) -> dict:
+        """
+        Devuelve el estado actual del pool.
+
+        Returns:
+            dict: Cantidad de conexiones abiertas, ociosas y en uso, junto con el tamaño máximo.
+        """
+        return {
+            "size": self.__size,
+            "idle": len(self.__idle),
+            "in_use": self.__size - len(self.__idle),
+            "max_size": self.max_size
+        }
+
+    async def __open_connection(self) -> DatabaseConnection:
+        conn = self.connection_factory()
+        await conn.connect()
+        self.__size += 1
+        return conn
+
+    async def __discard(self, conn: DatabaseConnection) -> None:
+        self.__size -= 1
+        try:
+            await conn.close()
+        except Exception:
+            pass
+
+    async def __is_healthy(self, conn: DatabaseConnection) -> bool:
+        try:
+            await conn.execute(self.health_check_query, [])
+            return True
+        except Exception:
+            return False
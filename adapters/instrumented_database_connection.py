@@ -0,0 +1,321 @@
+import re
+import time
+import logging
+import functools
+import threading
+from typing import AsyncIterator, Hashable
+from contextlib import asynccontextmanager
+from adapters.database_connection import DatabaseConnection
+from utils.metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+METRICS = MetricsRegistry()
+DB_QUERY_DURATION = METRICS.histogram("db_query_duration_seconds",
+                                      "Duración de las operaciones sobre la base de datos.",
+                                      ("operation", "statement"))
+DB_QUERY_ERRORS = METRICS.counter("db_query_errors_total",
+                                  "Operaciones sobre la base de datos que lanzaron una excepción.",
+                                  ("operation", "statement"))
+DB_QUERY_ROWS = METRICS.counter("db_query_rows_total", "Filas devueltas por las consultas.", ("statement",))
+DB_CONNECTION_OVERHEAD = METRICS.histogram("db_connection_overhead_seconds",
+                                           "Tiempo dedicado a abrir, cerrar, prestar y devolver conexiones.",
+                                           ("operation",))
+DB_SLOW_QUERIES = METRICS.counter("db_slow_queries_total", "Consultas que superaron el umbral de consulta lenta.")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+_REPEATED_ROWS = re.compile(r"(\(\?(?:, \?)*\))(?:, \(\?(?:, \?)*\))+")
+
+
+@functools.lru_cache(maxsize= 1024)
+def statement_kind(query: str) -> str:
+    """
+    Obtiene el tipo de una sentencia SQL (su primera palabra), usado como etiqueta de las métricas.
+
+    Args:
+        query (str): La consulta SQL.
+
+    Returns:
+        str: Primera palabra de la consulta en mayúsculas (por ejemplo, `SELECT`).
+    """
+    words = query.split(None, 1)
+    return words[0].rstrip(";").upper() if words else ""
+
+@functools.lru_cache(maxsize= 1024)
+def normalize_sql(query: str) -> str:
+    """
+    Normaliza una consulta SQL para agrupar sus ejecuciones: reemplaza los literales por `?`, unifica los
+    espacios y resume las listas de filas de los INSERT de varias filas.
+
+    Args:
+        query (str): La consulta SQL.
+
+    Returns:
+        str: Consulta normalizada.
+    """
+    query = _STRING_LITERAL.sub("?", query)
+    query = _NUMBER_LITERAL.sub("?", query)
+    query = _WHITESPACE.sub(" ", query).strip()
+    query = query.replace("( ", "(").replace(" )", ")").replace(" ,", ",")
+    return _REPEATED_ROWS.sub(r"\1, ...", query)
+
+
+class StatementStats():
+    """
+    Estadísticas acumuladas de una sentencia normalizada.
+    """
+
+    __slots__ = ("statement", "calls", "total_time", "max_time", "rows", "params")
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+        self.params = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "statement": self.statement,
+            "calls": self.calls,
+            "total_ms": round(self.total_time * 1000, 3),
+            "mean_ms": round(self.total_time * 1000 / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_time * 1000, 3),
+            "rows": self.rows,
+            "params": self.params
+        }
+
+
+class QueryStatistics():
+    """
+    Estadísticas por sentencia normalizada, para obtener las sentencias más costosas.
+
+    La cantidad de sentencias distintas está acotada por `max_statements`: al superarse, se descarta la
+    de menor tiempo total acumulado.
+
+    Attributes:
+        max_statements (int): Cantidad máxima de sentencias distintas registradas.
+    """
+
+    def __init__(self, max_statements: int = 500):
+        self.max_statements = max(1, max_statements)
+        self.__statements: dict[str, StatementStats] = {}
+        self.__lock = threading.Lock()
+
+    def record(self, statement: str, duration: float, params: int, rows: int) -> None:
+        """
+        Registra una ejecución.
+
+        Args:
+            statement (str): Sentencia normalizada.
+            duration (float): Duración en segundos.
+            params (int): Cantidad de parámetros.
+            rows (int): Filas devueltas.
+        """
+        with self.__lock:
+            stats = self.__statements.get(statement)
+            if stats is None:
+                if len(self.__statements) >= self.max_statements:
+                    cheapest = min(self.__statements.values(), key= lambda stats: stats.total_time)
+                    del self.__statements[cheapest.statement]
+                stats = self.__statements[statement] = StatementStats(statement)
+            stats.calls += 1
+            stats.total_time += duration
+            stats.max_time = max(stats.max_time, duration)
+            stats.rows += rows
+            stats.params += params
+
+    def top(self, limit: int = 10, order_by: str = "total_ms") -> list[dict]:
+        """
+        Devuelve las sentencias más costosas.
+
+        Args:
+            limit (int): Cantidad de sentencias.
+            order_by (str): Criterio de orden: `total_ms`, `mean_ms`, `max_ms`, `calls` o `rows`.
+
+        Returns:
+            list[dict]: Estadísticas de cada sentencia, de mayor a menor según `order_by`.
+        """
+        with self.__lock:
+            statements = [stats.as_dict() for stats in self.__statements.values()]
+        return sorted(statements, key= lambda stats: stats[order_by], reverse= True)[:limit]
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.__statements.clear()
+
+
+QUERY_STATISTICS = QueryStatistics()
+
+
+class InstrumentedDatabaseConnection(DatabaseConnection):
+    """
+    Envoltorio de una `DatabaseConnection` que mide cada operación sin modificar el adaptador envuelto.
+
+    De cada consulta registra la duración, el tipo de sentencia, la cantidad de parámetros y las filas
+    devueltas, y acumula estadísticas por sentencia normalizada en `statistics` para obtener las más
+    costosas. Las consultas que superan `slow_query_threshold` se registran en el log. También mide por
+    separado el tiempo de `connect()`, `close()` y el de prestar (`acquire`) y devolver (`release`)
+    conexiones, para distinguir el costo de obtener una conexión del de ejecutar las consultas.
+
+    Las conexiones prestadas por `lease()`, `reader()` y `transaction()` también se envuelven, por lo que
+    se miden todas las consultas de los servicios.
+
+    Attributes:
+        connection (DatabaseConnection): Conexión envuelta.
+        slow_query_threshold (float | None): Segundos a partir de los cuales una consulta se considera lenta.
+        statistics (QueryStatistics): Estadísticas por sentencia normalizada.
+    """
+
+    def __init__(self, connection: DatabaseConnection, slow_query_threshold: float | None = None,
+                 statistics: QueryStatistics | None = None):
+        """
+        Inicializa una nueva instancia de InstrumentedDatabaseConnection.
+
+        Args:
+            connection (DatabaseConnection): Conexión a instrumentar.
+            slow_query_threshold (float | None): Segundos a partir de los cuales una consulta se registra
+                como lenta. Si es None, no se registran consultas lentas.
+            statistics (QueryStatistics | None): Estadísticas por sentencia. Por defecto, las del proceso.
+        """
+        self.connection = connection
+        self.slow_query_threshold = slow_query_threshold
+        self.statistics = statistics if statistics is not None else QUERY_STATISTICS
+
+    async def connect(self) -> None:
+        start = time.perf_counter()
+        try:
+            await self.connection.connect()
+        finally:
+            DB_CONNECTION_OVERHEAD.observe(time.perf_counter() - start, "connect")
+
+    async def execute(self, query: str, params: list) -> list[tuple]:
+        start = time.perf_counter()
+        result = None
+        try:
+            result = await self.connection.execute(query, params)
+            return result
+        finally:
+            self.__record("execute", query, time.perf_counter() - start, len(params),
+                          len(result) if result is not None else None)
+
+    async def execute_many(self, query: str, params_list: list[list]) -> None:
+        start = time.perf_counter()
+        completed = False
+        try:
+            await self.connection.execute_many(query, params_list)
+            completed = True
+        finally:
+            self.__record("execute_many", query, time.perf_counter() - start,
+                          sum(len(params) for params in params_list), 0 if completed else None)
+
+    async def batch(self, statements: list[tuple[str, list]]) -> list[list[tuple]]:
+        start = time.perf_counter()
+        results = None
+        try:
+            results = await self.connection.batch(statements)
+            return results
+        finally:
+            self.__record("batch", "; ".join(query for query, _ in statements), time.perf_counter() - start,
+                          sum(len(params) for _, params in statements),
+                          sum(map(len, results)) if results is not None else None)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[DatabaseConnection]:
+        start = time.perf_counter()
+        try:
+            async with self.connection.transaction() as tx:
+                yield self.__wrap(tx)
+        except BaseException:
+            DB_QUERY_ERRORS.inc("transaction", "")
+            raise
+        finally:
+            DB_QUERY_DURATION.observe(time.perf_counter() - start, "transaction", "")
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[DatabaseConnection]:
+        async with self.__measure_lease(self.connection.lease()) as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def reader(self, key: Hashable | None = None) -> AsyncIterator[DatabaseConnection]:
+        async with self.__measure_lease(self.connection.reader(key)) as conn:
+            yield conn
+
+    def record_write(self, *keys: Hashable) -> None:
+        self.connection.record_write(*keys)
+
+    def statement_cache_stats(self) -> dict | None:
+        return self.connection.statement_cache_stats()
+
+    async def close(self) -> None:
+        start = time.perf_counter()
+        try:
+            await self.connection.close()
+        finally:
+            DB_CONNECTION_OVERHEAD.observe(time.perf_counter() - start, "close")
+
+    def __getattr__(self, name: str):
+        # Métodos propios del adaptador envuelto (por ejemplo, `stats()` del pool).
+        return getattr(self.connection, name)
+
+    @asynccontextmanager
+    async def __measure_lease(self, context) -> AsyncIterator[DatabaseConnection]:
+        start = time.perf_counter()
+        released_at = None
+        try:
+            async with context as conn:
+                DB_CONNECTION_OVERHEAD.observe(time.perf_counter() - start, "acquire")
+                try:
+                    yield self.__wrap(conn)
+                finally:
+                    released_at = time.perf_counter()
+        finally:
+            if released_at is not None:
+                DB_CONNECTION_OVERHEAD.observe(time.perf_counter() - released_at, "release")
+
+    def __wrap(self, conn: DatabaseConnection) -> "InstrumentedDatabaseConnection":
+        return InstrumentedDatabaseConnection(conn, self.slow_query_threshold, self.statistics)
+
+    def __record(self, operation: str, query: str, duration: float, params: int, rows: int | None) -> None:
+        kind = statement_kind(query) if operation != "batch" else ""
+        DB_QUERY_DURATION.observe(duration, operation, kind)
+        if rows is None:
+            DB_QUERY_ERRORS.inc(operation, kind)
+            return
+
+        statement = normalize_sql(query)
+        DB_QUERY_ROWS.inc(kind, amount= rows)
+        self.statistics.record(statement, duration, params, rows)
+
+        if self.slow_query_threshold is not None and duration >= self.slow_query_threshold:
+            DB_SLOW_QUERIES.inc()
+            logger.warning("Consulta lenta (%.1f ms, %d parámetros, %d filas): %s",
+                           duration * 1000, params, rows, statement)
+
+
+def register_connection_metrics(connection: DatabaseConnection) -> None:
+    """
+    Registra gauges calculados al exponer las métricas: el estado del pool de conexiones y la tasa de
+    aciertos de la caché de sentencias preparadas, cuando la conexión los ofrece.
+
+    Args:
+        connection (DatabaseConnection): Conexión compartida por la aplicación.
+    """
+    def pool_connections() -> dict[tuple[str, ...], float] | None:
+        stats = getattr(connection, "stats", None)
+        stats = stats() if callable(stats) else None
+        if not stats or "idle" not in stats:
+            return None
+        return {("idle",): stats["idle"], ("in_use",): stats["in_use"]}
+
+    def statement_cache_hit_ratio() -> float | None:
+        stats = connection.statement_cache_stats()
+        return stats["hit_rate"] if stats else None
+
+    METRICS.gauge("db_pool_connections", "Conexiones del pool por estado.", ("state",), callback= pool_connections)
+    METRICS.gauge("db_statement_cache_hit_ratio", "Tasa de aciertos de la caché de sentencias preparadas.",
+                  callback= statement_cache_hit_ratio)
@@ -0,0 +1,291 @@
+import time
+from typing import AsyncIterator, Hashable
+from contextlib import asynccontextmanager
+from adapters.database_connection import DatabaseConnection
+from errors.database_errors import DatabaseConnectionError, DatabasePoolTimeoutError
+
+
+class ReplicaState():
+    """
+    Estado de salud y carga de una réplica de lectura.
+
+    Attributes:
+        connection (DatabaseConnection): Conexión a la réplica.
+        in_flight (int): Consultas en curso sobre la réplica.
+        failures (int): Fallos de conexión consecutivos.
+        unhealthy_until (float): Instante (monotónico) hasta el cual la réplica no recibe lecturas.
+    """
+
+    def __init__(self, connection: DatabaseConnection):
+        self.connection = connection
+        self.in_flight = 0
+        self.failures = 0
+        self.unhealthy_until = 0.0
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+
+class ReplicatedDatabaseConnection(DatabaseConnection):
+    """
+    Conexión compuesta por una base de datos primaria y réplicas de lectura.
+
+    Las escrituras y todas las operaciones de `DatabaseConnection` se ejecutan sobre la primaria. Las
+    lecturas que los servicios solicitan con `reader(key)` se envían a la réplica disponible con menos
+    consultas en curso. Una réplica que falla por un error de conexión deja de recibir lecturas durante
+    `retry_interval` segundos y la consulta se reintenta en la primaria.
+
+    Para garantizar la lectura de las propias escrituras, los servicios informan las claves modificadas con
+    `record_write()`: durante `read_your_writes_window` segundos, las lecturas de esas claves se resuelven
+    en la primaria, dando tiempo a que la replicación las alcance.
+
+    Attributes:
+        primary (DatabaseConnection): Conexión a la base de datos primaria.
+        replicas (list[ReplicaState]): Réplicas de lectura con su estado.
+        read_your_writes_window (float): Segundos durante los cuales una clave escrita se lee de la primaria.
+        retry_interval (float): Segundos que una réplica con fallos deja de recibir lecturas.
+    """
+
+    def __init__(self, primary: DatabaseConnection, replicas: list[DatabaseConnection],
+                 read_your_writes_window: float = 5.0, retry_interval: float = 10.0):
+        """
+        Inicializa una nueva instancia de ReplicatedDatabaseConnection.
+
+        Args:
+            primary (DatabaseConnection): Conexión a la base de datos primaria.
+            replicas (list[DatabaseConnection]): Conexiones a las réplicas de lectura.
+            read_your_writes_window (float): Segundos durante los cuales una clave escrita se lee de la primaria.
+            retry_interval (float): Segundos que una réplica con fallos deja de recibir lecturas.
+        """
+        self.primary = primary
+        self.replicas = [ReplicaState(replica) for replica in replicas]
+        self.read_your_writes_window = read_your_writes_window
+        self.retry_interval = retry_interval
+        self.__recent_writes: dict[Hashable, float] = {}
+
+    async def connect(self) -> None:
+        """
+        Conecta la primaria y las réplicas. Una réplica que no puede conectarse queda marcada como no
+        disponible en lugar de impedir el inicio.
+
+        Raises:
+            DatabaseConnectionError: Si no se pudo conectar a la base de datos primaria.
+        """
+        await self.primary.connect()
+        for replica in self.replicas:
+            try:
+                await replica.connection.connect()
+            except DatabaseConnectionError:
+                self.__mark_failed(replica)
+
+    async def execute(self, query: str, params: list) -> list[tuple]:
+        """
+        Ejecuta una consulta sobre la base de datos primaria.
+
+        Args:
+            query (str): La consulta SQL a ejecutar.
+            params (list): Lista de parámetros para la consulta.
+
+        Returns:
+            list[tuple]: Resultados de la consulta.
+        """
+        return await self.primary.execute(query, params)
+
+    async def execute_many(self, query: str, params_list: list[list]) -> None:
+        """
+        Ejecuta la misma consulta una vez por cada conjunto de parámetros sobre la base de datos primaria.
+
+        Args:
+            query (str): La consulta SQL a ejecutar.
+            params_list (list[list]): Parámetros de cada ejecución.
+        """
+        await self.primary.execute_many(query, params_list)
+
+    async def batch(self, statements: list[tuple[str, list]]) -> list[list[tuple]]:
+        """
+        Ejecuta varias sentencias de forma atómica sobre la base de datos primaria.
+
+        Args:
+            statements (list[tuple[str, list]]): Pares (consulta SQL, parámetros).
+
+        Returns:
+            list[list[tuple]]: Resultados de cada sentencia, en el mismo orden.
+        """
+        return await self.primary.batch(statements)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[DatabaseConnection]:
+        """
+        Abre una transacción sobre la base de datos primaria.
+
+        Yields:
+            DatabaseConnection: Conexión sobre la cual ejecutar las consultas de la transacción.
+        """
+        async with self.primary.transaction() as tx:
+            yield tx
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[DatabaseConnection]:
+        """
+        Presta una conexión de la base de datos primaria.
+
+        Yields:
+            DatabaseConnection: Conexión sobre la cual ejecutar las consultas.
+        """
+        async with self.primary.lease() as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def reader(self, key: Hashable | None = None) -> AsyncIterator[DatabaseConnection]:
+        """
+        Presta una conexión para consultas de sólo lectura.
+
+        Cada consulta se envía a la réplica disponible con menos consultas en curso, salvo que `key` se
+        haya escrito dentro de la ventana de lectura de las propias escrituras o que no haya réplicas
+        disponibles, en cuyo caso se usa la primaria.
+
+        Args:
+            key (Hashable | None): Clave de la entidad leída (por ejemplo, el username).
+
+        Yields:
+            DatabaseConnection: Conexión sobre la cual ejecutar las consultas de lectura.
+        """
+        if not self.replicas or self.__written_recently(key):
+            async with self.primary.lease() as conn:
+                yield conn
+        else:
+            yield ReplicaReader(self)
+
+    def record_write(self, *keys: Hashable) -> None:
+        """
+        Registra que las claves indicadas acaban de escribirse en la primaria.
+
+        Args:
+            *keys (Hashable): Claves de las entidades escritas. Se ignoran los valores None.
+        """
+        if not self.replicas:
+            return
+
+        now = time.monotonic()
+        deadline = now + self.read_your_writes_window
+        for key in keys:
+            if key is not None:
+                self.__recent_writes[key] = deadline
+
+        # Se descartan las ventanas vencidas para acotar la memoria.
+        if len(self.__recent_writes) > 1024:
+            self.__recent_writes = {key: until for key, until in self.__recent_writes.items() if until > now}
+
+    async def read(self, query: str, params: list) -> list[tuple]:
+        """
+        Ejecuta una consulta de lectura en la réplica disponible con menos consultas en curso.
+
+        Si la réplica falla por un error de conexión, se marca como no disponible y la consulta se
+        reintenta en la primaria. Si su pool está agotado, la consulta se resuelve en la primaria sin
+        marcar la réplica.
+
+        Args:
+            query (str): La consulta SQL de lectura.
+            params (list): Lista de parámetros para la consulta.
+
+        Returns:
+            list[tuple]: Resultados de la consulta.
+        """
+        replica = self.__pick_replica()
+        if replica is None:
+            return await self.primary.execute(query, params)
+
+        replica.in_flight += 1
+        try:
+            async with replica.connection.lease() as conn:
+                result = await conn.execute(query, params)
+        except DatabasePoolTimeoutError:
+            # La réplica está ocupada, no caída: sólo esta consulta se resuelve en la primaria.
+            return await self.primary.execute(query, params)
+        except DatabaseConnectionError:
+            self.__mark_failed(replica)
+            return await self.primary.execute(query, params)
+        finally:
+            replica.in_flight -= 1
+
+        replica.failures = 0
+        return result
+
+    async def close(self) -> None:
+        """
+        Cierra la primaria y las réplicas.
+        """
+        await self.primary.close()
+        for replica in self.replicas:
+            try:
+                await replica.connection.close()
+            except Exception:
+                pass
+
+    def stats(self) -> dict:
+        """
+        Devuelve el estado de las réplicas.
+
+        Returns:
+            dict: Para cada réplica, si está disponible, sus consultas en curso y sus fallos consecutivos.
+        """
+        now = time.monotonic()
+        return {
+            "replicas": [{"available": replica.is_available(now), "in_flight": replica.in_flight,
+                          "failures": replica.failures} for replica in self.replicas],
+            "recent_writes": sum(until > now for until in self.__recent_writes.values())
+        }
+
+    def __written_recently(self, key: Hashable | None) -> bool:
+        until = self.__recent_writes.get(key) if key is not None else None
+        return until is not None and until > time.monotonic()
+
+    def __pick_replica(self) -> ReplicaState | None:
+        now = time.monotonic()
+        available = [replica for replica in self.replicas if replica.is_available(now)]
+        return min(available, key=lambda replica: replica.in_flight, default=None)
+
+    def __mark_failed(self, replica: ReplicaState) -> None:
+        replica.failures += 1
+        replica.unhealthy_until = time.monotonic() + self.retry_interval
+
+
+class ReplicaReader(DatabaseConnection):
+    """
+    Conexión de sólo lectura prestada por `ReplicatedDatabaseConnection.reader()`. Cada consulta se
+    balancea entre las réplicas disponibles.
+    """
+
+    def __init__(self, connection: ReplicatedDatabaseConnection):
+        """
+        Inicializa una nueva instancia de ReplicaReader.
+
+        Args:
+            connection (ReplicatedDatabaseConnection): Conexión replicada que resuelve las lecturas.
+        """
+        self.__connection = connection
+
+    async def connect(self) -> None:
+        """
+        Las réplicas se conectan desde la conexión replicada; no realiza ninguna acción.
+        """
+        pass
+
+    async def execute(self, query: str, params: list) -> list[tuple]:
+        """
+        Ejecuta una consulta de lectura en una réplica.
+
+        Args:
+            query (str): La consulta SQL de lectura.
+            params (list): Lista de parámetros para la consulta.
+
+        Returns:
+            list[tuple]: Resultados de la consulta.
+        """
+        return await self.__connection.read(query, params)
+
+    async def close(self) -> None:
+        """
+        Las réplicas se cierran desde la conexión replicada; no realiza ninguna acción.
+        """
+        pass
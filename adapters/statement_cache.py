@@ -0,0 +1,55 @@
+from utils.lru_cache import LRUCache
+
+
+class StatementCacheStats():
+    """
+    Réplica de la caché de sentencias preparadas de un adaptador, usada para medir su tasa de aciertos.
+
+    El módulo `sqlite3` mantiene por conexión una caché LRU de sentencias preparadas indexada por el texto
+    SQL (`cached_statements`), pero no expone sus aciertos. Esta clase reproduce la misma política sobre
+    los textos SQL ejecutados, de modo que sus contadores permiten dimensionar la caché.
+
+    Attributes:
+        max_size (int): Capacidad de la caché replicada.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        Inicializa una nueva instancia de StatementCacheStats.
+
+        Args:
+            max_size (int): Capacidad de la caché replicada, igual a `cached_statements`.
+        """
+        self.max_size = max_size
+        self.__statements: LRUCache[str, bool] = LRUCache(max_size= max(1, max_size))
+
+    def record(self, query: str) -> bool:
+        """
+        Registra la ejecución de una sentencia.
+
+        Args:
+            query (str): Texto SQL ejecutado.
+
+        Returns:
+            bool: True si la sentencia ya estaba preparada en la caché.
+        """
+        if self.__statements.get(query):
+            return True
+        if self.max_size > 0:
+            self.__statements.set(query, True)
+        return False
+
+    def stats(self) -> dict:
+        """
+        Devuelve el estado de la caché replicada.
+
+        Returns:
+            dict: Sentencias almacenadas, capacidad, aciertos, fallos y tasa de aciertos.
+        """
+        stats = self.__statements.stats()
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "max_size": self.max_size,
+            "hit_rate": stats["hits"] / lookups if lookups else 0.0
+        }
@@ -0,0 +1,90 @@
+"""
+Benchmark de los endpoints de la aplicación.
+
+Ejecuta la aplicación de `main.py` en el mismo proceso (transporte ASGI de httpx) sobre el backend
+`sqlite3`, con una base de datos temporal, y mide latencia (p50/p95/p99) y requests por segundo de cada
+escenario. Los workers de la cola de emails se deshabilitan para no contactar servidores SMTP.
+
+Uso:
+    python -m benchmarks [--requests N] [--concurrency C] [--scenarios login,me]
+                         [--output archivo.json] [--baseline archivo.json] [--threshold 0.1]
+
+Con `--baseline`, el proceso termina con código 1 si algún escenario presenta una regresión. Para
+registrar una nueva línea base se usa `--output benchmarks/baseline.json`.
+"""
+import os
+import sys
+import secrets
+import asyncio
+import argparse
+import tempfile
+import platform
+from datetime import datetime, timezone
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog= "python -m benchmarks", description= "Benchmark de los endpoints de la API.")
+    parser.add_argument("--requests", type= int, default= 200, help= "Requests medidos por escenario.")
+    parser.add_argument("--concurrency", type= int, default= 10, help= "Requests en simultáneo.")
+    parser.add_argument("--scenarios", default= None, help= "Escenarios separados por comas (por defecto, todos).")
+    parser.add_argument("--output", default= "benchmarks/results.json", help= "Archivo JSON de resultados.")
+    parser.add_argument("--baseline", default= None, help= "Archivo JSON de referencia para detectar regresiones.")
+    parser.add_argument("--threshold", type= float, default= 0.1, help= "Variación relativa tolerada respecto de la línea base.")
+    return parser.parse_args(argv)
+
+async def run(args: argparse.Namespace, database_dir: str) -> int:
+    # La configuración debe quedar definida antes de importar la aplicación.
+    admin_key = os.environ.setdefault("ADMIN_API_KEY", secrets.token_hex(16))
+    os.environ["DATABASE_BACKEND"] = "sqlite3"
+    os.environ["SQLITE_DATABASE_PATH"] = os.path.join(database_dir, "benchmark.db")
+    os.environ["DATABASE_RUN_MIGRATIONS"] = "true"
+    os.environ["EMAIL_OUTBOX_WORKERS"] = "0"
+
+    import httpx
+    from main import app
+    from benchmarks.runner import run_scenario
+    from benchmarks.scenarios import build_scenarios
+    from benchmarks.report import write_results, load_results, find_regressions, format_table
+
+    scenarios = build_scenarios(admin_key)
+    names = args.scenarios.split(",") if args.scenarios else list(scenarios)
+    unknown = [name for name in names if name not in scenarios]
+    if unknown:
+        print(f"Escenarios desconocidos: {', '.join(unknown)}. Disponibles: {', '.join(scenarios)}")
+        return 2
+
+    results = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app= app)
+        async with httpx.AsyncClient(transport= transport, base_url= "http://benchmark") as client:
+            for name in names:
+                results.append(await run_scenario(client, scenarios[name], args.requests, args.concurrency))
+
+    baseline = load_results(args.baseline) if args.baseline else None
+    print(format_table(results, baseline))
+
+    write_results(args.output, results, {
+        "date": datetime.now(timezone.utc).isoformat(),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "python": platform.python_version(),
+        "platform": platform.platform()
+    })
+    print(f"\nResultados guardados en {args.output}")
+
+    if baseline is None:
+        return 0
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESIÓN {regression}")
+    return 1 if regressions else 0
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as database_dir:
+        return asyncio.run(run(args, database_dir))
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,86 @@
+import json
+from benchmarks.runner import ScenarioResult
+
+
+def write_results(path: str, results: list[ScenarioResult], metadata: dict) -> None:
+    """
+    Escribe los resultados en formato JSON.
+
+    Args:
+        path (str): Ruta del archivo de salida.
+        results (list[ScenarioResult]): Resultados de los escenarios.
+        metadata (dict): Parámetros de la ejecución (concurrencia, cantidad de requests, etc.).
+    """
+    with open(path, "w", encoding= "utf-8") as file:
+        json.dump({"metadata": metadata, "scenarios": {result.name: result._asdict() for result in results}},
+                  file, indent= 2)
+
+def load_results(path: str) -> dict[str, dict]:
+    """
+    Lee los resultados de los escenarios de un archivo generado con `write_results`.
+
+    Args:
+        path (str): Ruta del archivo.
+
+    Returns:
+        dict[str, dict]: Resultados por nombre de escenario.
+    """
+    with open(path, encoding= "utf-8") as file:
+        return json.load(file)["scenarios"]
+
+def find_regressions(results: list[ScenarioResult], baseline: dict[str, dict], threshold: float) -> list[str]:
+    """
+    Compara los resultados con una línea base.
+
+    Un escenario presenta una regresión si su p95 supera al de la línea base en más de `threshold`
+    (relativo), si su throughput cae más de `threshold`, o si tiene errores que la línea base no tenía.
+    Los escenarios ausentes de la línea base no se comparan.
+
+    Args:
+        results (list[ScenarioResult]): Resultados de los escenarios.
+        baseline (dict[str, dict]): Resultados de referencia por nombre de escenario.
+        threshold (float): Variación relativa tolerada (por ejemplo, 0.1 para un 10 %).
+
+    Returns:
+        list[str]: Descripción de cada regresión encontrada.
+    """
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.name)
+        if reference is None:
+            continue
+
+        if reference["p95"] and result.p95 > reference["p95"] * (1 + threshold):
+            regressions.append(f"{result.name}: p95 {result.p95:.2f} ms > {reference['p95']:.2f} ms de la línea base")
+        if reference["rps"] and result.rps < reference["rps"] * (1 - threshold):
+            regressions.append(f"{result.name}: {result.rps:.1f} req/s < {reference['rps']:.1f} req/s de la línea base")
+        if result.errors > reference.get("errors", 0):
+            regressions.append(f"{result.name}: {result.errors} errores (línea base: {reference.get('errors', 0)})")
+
+    return regressions
+
+def format_table(results: list[ScenarioResult], baseline: dict[str, dict] | None = None) -> str:
+    """
+    Da formato de tabla a los resultados, con la variación del p95 respecto de la línea base si se indica.
+
+    Args:
+        results (list[ScenarioResult]): Resultados de los escenarios.
+        baseline (dict[str, dict] | None): Resultados de referencia por nombre de escenario.
+
+    Returns:
+        str: Tabla en texto plano.
+    """
+    header = f"{'escenario':<18}{'req':>7}{'errores':>9}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    if baseline is not None:
+        header += f"{'Δ p95':>9}"
+
+    lines = [header, "-" * len(header)]
+    for result in results:
+        line = (f"{result.name:<18}{result.requests:>7}{result.errors:>9}{result.rps:>10.1f}"
+                f"{result.p50:>10.2f}{result.p95:>10.2f}{result.p99:>10.2f}")
+        reference = (baseline or {}).get(result.name)
+        if baseline is not None:
+            line += f"{(result.p95 / reference['p95'] - 1) * 100:>+8.1f}%" if reference and reference["p95"] else f"{'-':>9}"
+        lines.append(line)
+
+    return "\n".join(lines)
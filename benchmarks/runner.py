@@ -0,0 +1,126 @@
+import math
+import time
+import asyncio
+from typing import Any, NamedTuple, Awaitable, Callable, Iterable
+import httpx
+
+
+class Scenario(NamedTuple):
+    """
+    Escenario de benchmark sobre un endpoint.
+
+    Attributes:
+        name (str): Nombre del escenario.
+        setup (Callable): Prepara los datos y devuelve un argumento por cada request a medir. No se mide.
+        request (Callable): Envía un request con uno de los argumentos preparados.
+        expected_status (int): Código de estado esperado; cualquier otro cuenta como error.
+    """
+    name: str
+    setup: Callable[[httpx.AsyncClient, int, int], Awaitable[list[Any]]]
+    request: Callable[[httpx.AsyncClient, Any], Awaitable[httpx.Response]]
+    expected_status: int = 200
+
+
+class ScenarioResult(NamedTuple):
+    """
+    Resultado de un escenario. Las latencias se expresan en milisegundos.
+    """
+    name: str
+    requests: int
+    concurrency: int
+    errors: int
+    duration: float
+    rps: float
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """
+    Calcula un percentil por el método del rango más cercano.
+
+    Args:
+        sorted_values (list[float]): Valores ordenados de menor a mayor.
+        fraction (float): Percentil entre 0 y 1.
+
+    Returns:
+        float: Valor del percentil, o 0 si no hay valores.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), math.ceil(fraction * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+async def gather_limited(coroutines: Iterable[Awaitable], limit: int) -> list:
+    """
+    Ejecuta corrutinas con a lo sumo `limit` en simultáneo, conservando el orden de los resultados.
+
+    Args:
+        coroutines (Iterable[Awaitable]): Corrutinas a ejecutar.
+        limit (int): Cantidad máxima de corrutinas en simultáneo.
+
+    Returns:
+        list: Resultados de las corrutinas.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def limited(coroutine: Awaitable):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(limited(coroutine) for coroutine in coroutines))
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, requests: int,
+                       concurrency: int) -> ScenarioResult:
+    """
+    Prepara y ejecuta un escenario, midiendo la latencia de cada request.
+
+    Se lanzan `concurrency` clientes concurrentes que toman los argumentos preparados hasta agotarlos.
+
+    Args:
+        client (httpx.AsyncClient): Cliente conectado a la aplicación.
+        scenario (Scenario): Escenario a ejecutar.
+        requests (int): Cantidad de requests a medir.
+        concurrency (int): Cantidad de requests en simultáneo.
+
+    Returns:
+        ScenarioResult: Latencias, throughput y errores del escenario.
+    """
+    arguments = await scenario.setup(client, requests, concurrency)
+    pending = iter(arguments)
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for argument in pending:
+            start = time.perf_counter()
+            try:
+                response = await scenario.request(client, argument)
+                failed = response.status_code != scenario.expected_status
+            except Exception:
+                failed = True
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    duration = time.perf_counter() - start
+
+    latencies.sort()
+    return ScenarioResult(
+        name= scenario.name,
+        requests= len(latencies),
+        concurrency= concurrency,
+        errors= errors,
+        duration= round(duration, 4),
+        rps= round(len(latencies) / duration, 2) if duration else 0.0,
+        mean= round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        p50= round(percentile(latencies, 0.50), 3),
+        p95= round(percentile(latencies, 0.95), 3),
+        p99= round(percentile(latencies, 0.99), 3),
+        max= round(latencies[-1], 3) if latencies else 0.0
+    )
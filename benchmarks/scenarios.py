@@ -0,0 +1,116 @@
+import json
+import functools
+import httpx
+from services.hashing_service import hashed_password
+from benchmarks.runner import Scenario, gather_limited
+
+PASSWORD = "benchmark-password"
+SENDER_EMAIL = "benchmark-sender@example.com"
+RECOVERY_CODE = "246810"
+
+
+@functools.lru_cache(maxsize= 1)
+def _password_hash() -> str:
+    # Un único hash para todos los usuarios sembrados: la siembra no debe medir bcrypt.
+    return hashed_password(PASSWORD)
+
+def _users(prefix: str, count: int) -> list[dict]:
+    return [{"full_name": f"{prefix} {index}", "username": f"{prefix}{index}",
+             "email": f"{prefix}{index}@example.com", "password": PASSWORD} for index in range(count)]
+
+async def seed_users(client: httpx.AsyncClient, admin_key: str, prefix: str, count: int) -> list[dict]:
+    """
+    Registra usuarios con `POST /user/bulk` usando una contraseña ya hasheada.
+
+    Args:
+        client (httpx.AsyncClient): Cliente conectado a la aplicación.
+        admin_key (str): Clave de administración de la aplicación.
+        prefix (str): Prefijo del username y del email de los usuarios.
+        count (int): Cantidad de usuarios.
+
+    Returns:
+        list[dict]: Usuarios registrados, con su contraseña en texto plano.
+
+    Raises:
+        RuntimeError: Si la importación falló.
+    """
+    users = _users(prefix, count)
+    body = "\n".join(json.dumps({**user, "password": _password_hash(), "hashed": True}) for user in users)
+    response = await client.post("/user/bulk", content= body, headers= {"X-Admin-Key": admin_key,
+                                                                        "Content-Type": "application/x-ndjson"})
+    summary = json.loads(response.text.splitlines()[-1]) if response.text else {}
+    if response.status_code != 200 or summary.get("summary", {}).get("created") != count:
+        raise RuntimeError(f"No se pudieron sembrar los usuarios del benchmark: {response.status_code} {response.text[-300:]}")
+    return users
+
+async def login(client: httpx.AsyncClient, user: dict) -> httpx.Response:
+    return await client.post("/login", data= {"username": user["username"], "password": user["password"]})
+
+async def request_code(client: httpx.AsyncClient, user: dict, code: str | None = None) -> httpx.Response:
+    return await client.post("/recovery-password/request", json= {"receiver_email": user["email"],
+                                                                  "sender_email": SENDER_EMAIL,
+                                                                  "password_email": "benchmark",
+                                                                  "custom_code": code})
+
+async def verify_code(client: httpx.AsyncClient, user: dict) -> httpx.Response:
+    return await client.post("/recovery-password/verify-code", json= {"code": RECOVERY_CODE,
+                                                                      "user_email": user["email"]})
+
+
+def build_scenarios(admin_key: str) -> dict[str, Scenario]:
+    """
+    Construye los escenarios disponibles, uno por endpoint medido.
+
+    Args:
+        admin_key (str): Clave de administración usada para sembrar usuarios.
+
+    Returns:
+        dict[str, Scenario]: Escenarios por nombre, en orden de ejecución.
+    """
+    async def setup_register(client: httpx.AsyncClient, count: int, concurrency: int) -> list[dict]:
+        return _users("register", count)
+
+    async def register(client: httpx.AsyncClient, user: dict) -> httpx.Response:
+        return await client.post("/user/register", json= {"user": user})
+
+    async def setup_login(client: httpx.AsyncClient, count: int, concurrency: int) -> list[dict]:
+        return await seed_users(client, admin_key, "login", count)
+
+    async def setup_me(client: httpx.AsyncClient, count: int, concurrency: int) -> list[str]:
+        users = await seed_users(client, admin_key, "me", max(1, min(count, concurrency)))
+        responses = await gather_limited((login(client, user) for user in users), concurrency)
+        tokens = [response.json()["access_token"] for response in responses]
+        return [tokens[index % len(tokens)] for index in range(count)]
+
+    async def me(client: httpx.AsyncClient, token: str) -> httpx.Response:
+        return await client.get("/user/me", headers= {"Authorization": f"Bearer {token}"})
+
+    async def setup_recovery_request(client: httpx.AsyncClient, count: int, concurrency: int) -> list[dict]:
+        return await seed_users(client, admin_key, "recoveryrequest", count)
+
+    async def setup_recovery_verify(client: httpx.AsyncClient, count: int, concurrency: int) -> list[dict]:
+        users = await seed_users(client, admin_key, "recoveryverify", count)
+        await gather_limited((request_code(client, user, RECOVERY_CODE) for user in users), concurrency)
+        return users
+
+    async def setup_recovery_reset(client: httpx.AsyncClient, count: int, concurrency: int) -> list[tuple[dict, str]]:
+        users = await seed_users(client, admin_key, "recoveryreset", count)
+        await gather_limited((request_code(client, user, RECOVERY_CODE) for user in users), concurrency)
+        responses = await gather_limited((verify_code(client, user) for user in users), concurrency)
+        return [(user, response.json()["token"]) for user, response in zip(users, responses)]
+
+    async def reset(client: httpx.AsyncClient, argument: tuple[dict, str]) -> httpx.Response:
+        user, token = argument
+        return await client.post("/recovery-password/reset",
+                                 json= {"email": user["email"], "new_password": "new-" + PASSWORD},
+                                 headers= {"Authorization": f"Bearer {token}"})
+
+    scenarios = (
+        Scenario("register", setup_register, register),
+        Scenario("login", setup_login, login),
+        Scenario("me", setup_me, me),
+        Scenario("recovery_request", setup_recovery_request, request_code),
+        Scenario("recovery_verify", setup_recovery_verify, verify_code),
+        Scenario("recovery_reset", setup_recovery_reset, reset),
+    )
+    return {scenario.name: scenario for scenario in scenarios}
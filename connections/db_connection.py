@@ -1,22 +1,136 @@
 # DATABASE CONNECTION CONSTANTS
 from utils.env_loader import EnvManager
 from adapters.adapter_db_conn_libsql import AdapterDBConnLibsqlClient
+from adapters.adapter_db_conn_sqlite3 import AdapterDBConnSqlite3
+from adapters.database_connection import DatabaseConnection
+from adapters.database_connection_pool import DatabaseConnectionPool
+from adapters.replicated_database_connection import ReplicatedDatabaseConnection
+from adapters.instrumented_database_connection import InstrumentedDatabaseConnection, register_connection_metrics
 
-def db_conn_libsql_client() -> AdapterDBConnLibsqlClient:
+# Conexiones compartidas por todos los routers del proceso.
+_DB_CONN_LIBSQL: DatabaseConnection | None = None
+_DB_CONN_SQLITE3: AdapterDBConnSqlite3 | None = None
+_DB_CONN_INSTRUMENTED: InstrumentedDatabaseConnection | None = None
+
+def db_conn() -> DatabaseConnection:
     """
-    Retorna una conexión a una base de datos, obteniendo los datos de conexión a 
-    partir de las variables de entorno correspondientes.
+    Retorna la conexión a la base de datos del backend configurado en la variable de entorno
+    `DATABASE_BACKEND`: `libsql` (por defecto) o `sqlite3`.
+
+    Si `METRICS_ENABLED` es `true` o se define `DB_SLOW_QUERY_THRESHOLD_MS`, la conexión se envuelve en una
+    `InstrumentedDatabaseConnection` que mide cada consulta y registra en el log las que superan el umbral
+    (por defecto, 200 ms).
 
     Returns:
-        AdapterDBConnLibsqlClient: Instancia de la clase que implementa el patrón adaptador 
-        para la conexión a la base de datos.
+        DatabaseConnection: Conexión compartida por todo el proceso.
+
+    Raises:
+        ValueError: Si el backend configurado no existe.
     """
+    global _DB_CONN_INSTRUMENTED
+
     ENV = EnvManager()
+    backend = str(ENV.get("DATABASE_BACKEND", "libsql")).lower()
+
+    if backend == "libsql":
+        connection = db_conn_libsql_client()
+    elif backend == "sqlite3":
+        connection = db_conn_sqlite3()
+    else:
+        raise ValueError(f"Backend de base de datos desconocido: '{backend}'. Valores admitidos: 'libsql', 'sqlite3'.")
+
+    SLOW_QUERY_THRESHOLD_MS = ENV.get("DB_SLOW_QUERY_THRESHOLD_MS")
+    if str(ENV.get("METRICS_ENABLED", "false")).lower() != "true" and SLOW_QUERY_THRESHOLD_MS is None:
+        return connection
+
+    if _DB_CONN_INSTRUMENTED is None or _DB_CONN_INSTRUMENTED.connection is not connection:
+        _DB_CONN_INSTRUMENTED = InstrumentedDatabaseConnection(
+            connection,
+            slow_query_threshold=float(SLOW_QUERY_THRESHOLD_MS or 200) / 1000
+        )
+        register_connection_metrics(_DB_CONN_INSTRUMENTED)
+    return _DB_CONN_INSTRUMENTED
+
+def db_conn_sqlite3() -> AdapterDBConnSqlite3:
+    """
+    Retorna la conexión a una base de datos SQLite local, ubicada en la ruta indicada por la variable
+    de entorno `SQLITE_DATABASE_PATH`.
+
+    La conexión se construye una única vez por proceso. La cantidad de conexiones de lectura, el tamaño
+    del group commit y la capacidad de la caché de sentencias preparadas se configuran con las variables
+    opcionales `SQLITE_READ_CONNECTIONS`, `SQLITE_GROUP_COMMIT_MAX_SIZE` y `SQLITE_CACHED_STATEMENTS`.
+
+    Returns:
+        AdapterDBConnSqlite3: Conexión de la clase que implementa el patrón adaptador para SQLite.
+    """
+    global _DB_CONN_SQLITE3
+
+    if _DB_CONN_SQLITE3 is None:
+        ENV = EnvManager()
+
+        _DB_CONN_SQLITE3 = AdapterDBConnSqlite3(
+            database_path=ENV.get("SQLITE_DATABASE_PATH", "database.db"),
+            read_connections=int(ENV.get("SQLITE_READ_CONNECTIONS", 4)),
+            group_commit_max_size=int(ENV.get("SQLITE_GROUP_COMMIT_MAX_SIZE", 64)),
+            cached_statements=int(ENV.get("SQLITE_CACHED_STATEMENTS", 256))
+        )
+
+    return _DB_CONN_SQLITE3
+
+def db_conn_libsql_client() -> DatabaseConnection:
+    """
+    Retorna la conexión a la base de datos libsql, obteniendo los datos de conexión a partir de las
+    variables de entorno correspondientes.
+
+    La conexión se construye una única vez por proceso, por lo que todas las llamadas comparten las mismas
+    conexiones. La primaria (`PRODUCTION_DATABASE_URL`) se accede mediante un pool cuyo tamaño se configura
+    con las variables opcionales `DATABASE_POOL_MIN_SIZE`, `DATABASE_POOL_MAX_SIZE`,
+    `DATABASE_POOL_ACQUIRE_TIMEOUT` y `DATABASE_POOL_HEALTH_CHECK_INTERVAL`.
+
+    Si se define `PRODUCTION_DATABASE_REPLICA_URLS` (URLs separadas por comas), cada réplica obtiene su propio
+    pool y las lecturas de los servicios se balancean entre ellas. Las URLs `file:` no se admiten como
+    réplicas: `libsql_client` las abre como un archivo SQLite local que nunca se sincroniza con la primaria.
+
+    Returns:
+        DatabaseConnection: Pool de conexiones a la primaria, o una `ReplicatedDatabaseConnection` si hay réplicas.
+
+    Raises:
+        ValueError: Si alguna réplica se indica con una URL `file:`.
+    """
+    global _DB_CONN_LIBSQL
+
+    if _DB_CONN_LIBSQL is None:
+        ENV = EnvManager()
+
+        DATABASE_URL = ENV.get("PRODUCTION_DATABASE_URL")
+        DATABASE_AUTH_TOKEN = ENV.get("PRODUCTION_DATABASE_AUTH_TOKEN")
+        REPLICA_URLS = [url.strip() for url in ENV.get("PRODUCTION_DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+        REPLICA_AUTH_TOKEN = ENV.get("PRODUCTION_DATABASE_REPLICA_AUTH_TOKEN", DATABASE_AUTH_TOKEN)
+
+        local_replicas = [url for url in REPLICA_URLS if url.lower().startswith("file:")]
+        if local_replicas:
+            raise ValueError(f"Réplicas no admitidas: {local_replicas}. Una URL 'file:' es un archivo SQLite local "
+                             "que no se sincroniza con la primaria; indique réplicas libsql remotas.")
 
-    DATABASE_URL = ENV.get("PRODUCTION_DATABASE_URL")
-    DATABASE_AUTH_TOKEN = ENV.get("PRODUCTION_DATABASE_AUTH_TOKEN")
+        primary = _libsql_pool(ENV, DATABASE_URL, DATABASE_AUTH_TOKEN)
+        if not REPLICA_URLS:
+            _DB_CONN_LIBSQL = primary
+        else:
+            _DB_CONN_LIBSQL = ReplicatedDatabaseConnection(
+                primary=primary,
+                replicas=[_libsql_pool(ENV, url, REPLICA_AUTH_TOKEN) for url in REPLICA_URLS],
+                read_your_writes_window=float(ENV.get("DATABASE_READ_YOUR_WRITES_SECONDS", 5)),
+                retry_interval=float(ENV.get("DATABASE_REPLICA_RETRY_INTERVAL", 10))
+            )
 
-    DB_CONN = AdapterDBConnLibsqlClient(database_url=DATABASE_URL, 
-                                        auth_token=DATABASE_AUTH_TOKEN)
+    return _DB_CONN_LIBSQL
 
-    return DB_CONN
+def _libsql_pool(ENV: EnvManager, database_url: str, auth_token: str | None) -> DatabaseConnectionPool:
+    return DatabaseConnectionPool(
+        connection_factory=lambda: AdapterDBConnLibsqlClient(database_url=database_url,
+                                                             auth_token=auth_token),
+        min_size=int(ENV.get("DATABASE_POOL_MIN_SIZE", 1)),
+        max_size=int(ENV.get("DATABASE_POOL_MAX_SIZE", 10)),
+        acquire_timeout=float(ENV.get("DATABASE_POOL_ACQUIRE_TIMEOUT", 10)),
+        health_check_interval=float(ENV.get("DATABASE_POOL_HEALTH_CHECK_INTERVAL", 30))
+    )
@@ -1,12 +1,18 @@
+import hmac
 from fastapi.responses import JSONResponse
+from utils.env_loader import EnvManager
 from adapters.database_connection import DatabaseConnection
 from errors.token_format_error import TokenFormatError
+from models.token_claims import TokenClaims
 from services import auth_services as at
-from fastapi import HTTPException, status
+from fastapi import HTTPException, status, Depends, Header
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from errors.users_errors import UserNotFoundError, UsernameNotFoundError
 from jwt import InvalidTokenError, ExpiredSignatureError 
 
+# Clave para los endpoints de administración. Si no se define, dichos endpoints quedan deshabilitados.
+ADMIN_API_KEY = EnvManager().get("ADMIN_API_KEY")
+
 #TODO documentar
 async def login_for_access_token_controller(db_conn: DatabaseConnection, form_data: OAuth2PasswordRequestForm) -> JSONResponse:
     """
@@ -56,7 +62,7 @@ async def login_for_access_token_controller(db_conn: DatabaseConnection, form_da
     except UserNotFoundError as e:
         raise credential_exception
 
-async def get_current_user_controller(db_conn: DatabaseConnection, token: str) -> JSONResponse:
+async def get_current_user_controller(db_conn: DatabaseConnection, token: str | TokenClaims) -> JSONResponse:
     """
     Controlador para obtener la información del usuario actual a partir de un token.
 
@@ -65,7 +71,7 @@ async def get_current_user_controller(db_conn: DatabaseConnection, token: str) -
 
     Args:
         db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
-        token (str): El token de acceso del usuario.
+        token (str | TokenClaims): El token de acceso del usuario o sus claims ya verificados.
 
     Returns:
         JSONResponse: Respuesta JSON que contiene el estado de la operación y los datos del usuario.
@@ -130,4 +136,63 @@ async def get_current_user_controller(db_conn: DatabaseConnection, token: str) -
                 "message" : "Token expirado. Vuelva a iniciar sesión."
             }
         )
-    
+
+async def verified_token_claims(token: str = Depends(at.oauth2_schema)) -> TokenClaims:
+    """
+    Dependencia de FastAPI que verifica el token Bearer de la request una única vez.
+
+    Los claims resultantes se inyectan en los endpoints protegidos y se pasan a los controladores,
+    evitando que cada capa vuelva a decodificar el mismo token.
+
+    Args:
+        token (str): Token de acceso obtenido de la cabecera Authorization.
+
+    Returns:
+        TokenClaims: Claims verificados del token.
+
+    Raises:
+        HTTPException: Si el token no es válido, está expirado o no contiene el nombre de usuario.
+    """
+    try:
+        return at.verify_access_token(token)
+    except (InvalidTokenError, TokenFormatError, UsernameNotFoundError):
+        raise HTTPException(
+            status_code= status.HTTP_401_UNAUTHORIZED,
+            detail= {
+                "status": "error",
+                "message": "Token invalido. Vuelva a iniciar sesión."
+            },
+            headers= {
+                "WWW-Authenticate": "Bearer"
+            }
+        )
+
+async def verify_admin_api_key(x_admin_key: str | None = Header(None)) -> None:
+    """
+    Dependencia de FastAPI que restringe un endpoint a quien presente la clave de administración.
+
+    La clave se envía en la cabecera `X-Admin-Key` y se compara con la variable de entorno `ADMIN_API_KEY`.
+
+    Args:
+        x_admin_key (str | None): Valor de la cabecera X-Admin-Key.
+
+    Raises:
+        HTTPException: 403 si los endpoints de administración están deshabilitados, 401 si la clave no es válida.
+    """
+    if not ADMIN_API_KEY:
+        raise HTTPException(
+            status_code= status.HTTP_403_FORBIDDEN,
+            detail= {
+                "status": "error",
+                "message": "Endpoint de administración deshabilitado. Defina la variable ADMIN_API_KEY."
+            }
+        )
+
+    if x_admin_key is None or not hmac.compare_digest(x_admin_key.encode(), ADMIN_API_KEY.encode()):
+        raise HTTPException(
+            status_code= status.HTTP_401_UNAUTHORIZED,
+            detail= {
+                "status": "error",
+                "message": "Clave de administración no válida."
+            }
+        )
@@ -1,13 +1,26 @@
+import io
+import json
+import asyncio
+from typing import Any, AsyncIterator, Iterator
+from pydantic import ValidationError
 from adapters.database_connection import DatabaseConnection
-from models.user_db import User
+from models.user_db import User, UserDB
 import services.db_services as db
 import services.hashing_service as hs
 from libsql_client import LibsqlError
-from fastapi import status, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import status, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from models.request.add_user_request import AddUserRequest
 from models.request.update_user_request import UpdateUserRequest 
-from services.auth_services import validate_access_token, get_username_from_token
+from models.request.bulk_user_request import BulkUserRow
+from utils.env_loader import EnvManager
+from models.token_claims import TokenClaims
+from errors.users_errors import DuplicateUserError
+from errors.database_errors import DatabaseQueryError, DatabaseConnectionError
+from services.auth_services import validate_access_token, authorize_access_token, revoke_user_tokens
+
+# Cantidad de filas por sentencia INSERT en la importación masiva de usuarios
+BULK_INSERT_BATCH_SIZE = int(EnvManager().get("BULK_INSERT_BATCH_SIZE", 200))
 
 #======================================== CONTROLLERS ================================================#
 
@@ -23,7 +36,7 @@ async def add_user_controller(db_conn: DatabaseConnection, request: AddUserReque
         JSONResponse: Respuesta JSON con el estado de la operación y los datos del usuario registrado.
     """
     # Proceso de hashing de contraseña
-    hash = hs.hashed_password(password=request.user.password)
+    hash = await hs.hash_password_async(password=request.user.password)
     request.user.password = hash  # Asignación de contraseña hasheada al usuario  
 
     # Construcción de usuario a devolver en JSONResponse
@@ -31,19 +44,8 @@ async def add_user_controller(db_conn: DatabaseConnection, request: AddUserReque
 
     # Proceso de almacenamiento en db
     try:        
-        # Primera validación de unicidad de datos
-        if not await db.is_unique(db_conn=db_conn, user=request.user):
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail={
-                    "status": "error",
-                    "data": {"user": response_user.model_dump()},
-                    "message": "El 'email' y/o 'username' ya existen para otro usuario."
-                }
-            )
-        
-        # Proceso de almacenamiento en DDBB
-        await db.add_user(db_conn=db_conn, user=request.user)
+        # Validación de unicidad e inserción en una única operación atómica
+        await db.insert_user_if_unique(db_conn=db_conn, user=request.user)
         
         return JSONResponse(
             status_code=status.HTTP_200_OK,
@@ -54,7 +56,16 @@ async def add_user_controller(db_conn: DatabaseConnection, request: AddUserReque
             }
         )
 
-    # Segunda validación de unicidad de datos en caso de error.
+    except DuplicateUserError as error:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "status": "error",
+                "data": {"user": response_user.model_dump(), "fields": error.fields},
+                "message": "El 'email' y/o 'username' ya existen para otro usuario."
+            }
+        )
+
     except LibsqlError as error:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -107,14 +118,14 @@ async def get_user_controller(db_conn: DatabaseConnection, username: str) -> JSO
             }
         )
 
-async def update_user_controller(db_conn: DatabaseConnection, request: UpdateUserRequest, token: str) -> JSONResponse:
+async def update_user_controller(db_conn: DatabaseConnection, request: UpdateUserRequest, token: str | TokenClaims) -> JSONResponse:
     """
     Controlador para actualizar los datos de un usuario.
 
     Args:
         db_conn (DatabaseConnection): Conexión a la base de datos.
         request (UpdateUserRequest): Solicitud que contiene los datos del usuario a actualizar.
-        token (str): Token de acceso del usuario.
+        token (str | TokenClaims): Token de acceso del usuario o sus claims ya verificados.
 
     Returns:
         JSONResponse: Respuesta JSON con el estado de la operación.
@@ -142,7 +153,7 @@ async def update_user_controller(db_conn: DatabaseConnection, request: UpdateUse
             )
 
         # Hasheo de contraseña nueva
-        request.updated_user.password = hs.hashed_password(request.updated_user.password)
+        request.updated_user.password = await hs.hash_password_async(request.updated_user.password)
         
         # Proceso de actualización del usuario en la base de datos  
         await db.update_user(
@@ -151,6 +162,10 @@ async def update_user_controller(db_conn: DatabaseConnection, request: UpdateUse
             updated_user=request.updated_user
         )
         
+        # Los tokens emitidos para el username anterior dejan de ser válidos
+        if request.updated_user.username != request.username:
+            revoke_user_tokens(request.username)
+        
         # Retorno de JSONResponse
         return JSONResponse(
             status_code=status.HTTP_200_OK,
@@ -170,19 +185,20 @@ async def update_user_controller(db_conn: DatabaseConnection, request: UpdateUse
             }
         )
 
-async def delete_user_controller(db_conn: DatabaseConnection, token: str) -> JSONResponse: 
+async def delete_user_controller(db_conn: DatabaseConnection, token: str | TokenClaims) -> JSONResponse: 
     """
     Controlador para eliminar un usuario.
 
     Args:
         db_conn (DatabaseConnection): Conexión a la base de datos.
-        token (str): Token de acceso del usuario.
+        token (str | TokenClaims): Token de acceso del usuario o sus claims ya verificados.
 
     Returns:
         JSONResponse: Respuesta JSON con el estado de la operación.
     """
     # Validaciones de token
-    if not await validate_access_token(db_conn=db_conn, token=token):
+    claims = await authorize_access_token(db_conn=db_conn, token=token)
+    if claims is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail={
@@ -192,11 +208,12 @@ async def delete_user_controller(db_conn: DatabaseConnection, token: str) -> JSO
         )
     
     # Obtención de username guardado en el token
-    username = get_username_from_token(token)
+    username = claims.sub
     
     try:
         # Proceso de eliminación de usuario 
         await db.delete_user(db_conn=db_conn, username=username)
+        revoke_user_tokens(username)
         
         return JSONResponse(
             status_code=status.HTTP_200_OK,
@@ -227,3 +244,130 @@ async def delete_user_controller(db_conn: DatabaseConnection, token: str) -> JSO
                     "message": f"Error interno del servidor."
                 }
             )
+
+async def add_users_batch_controller(db_conn: DatabaseConnection, request: Request) -> StreamingResponse:
+    """
+    Controlador para la importación masiva de usuarios.
+
+    Acepta un arreglo JSON de usuarios o, con `Content-Type: application/x-ndjson`, un usuario por línea.
+    Las filas se validan, se hashean en paralelo (salvo las marcadas con `hashed`) y se insertan en lotes de
+    `BULK_INSERT_BATCH_SIZE` filas por sentencia; el resultado de cada lote se envía apenas se inserta.
+
+    El cuerpo se lee completo antes de responder, ya que Starlette escucha la desconexión del cliente
+    mientras transmite la respuesta y consumiría el resto de la solicitud. Las líneas NDJSON se interpretan
+    recién al procesar su lote.
+
+    Args:
+        db_conn (DatabaseConnection): Conexión a la base de datos.
+        request (Request): Solicitud HTTP con las filas a importar.
+
+    Returns:
+        StreamingResponse: Respuesta NDJSON con una línea por fila (`created`, `conflict`, `invalid` o
+            `error`) y una última línea con el resumen de la importación.
+
+    Raises:
+        HTTPException: 400 si el cuerpo no es un arreglo JSON válido.
+    """
+    if "ndjson" in request.headers.get("content-type", ""):
+        rows = _iterate_ndjson_rows(await request.body())
+    else:
+        try:
+            body = await request.json()
+        except json.JSONDecodeError:
+            body = None
+
+        if not isinstance(body, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "status": "error",
+                    "message": "El cuerpo debe ser un arreglo JSON de usuarios o NDJSON (application/x-ndjson)."
+                }
+            )
+        rows = iter(body)
+
+    async def import_rows() -> AsyncIterator[str]:
+        summary = {"created": 0, "conflict": 0, "invalid": 0, "error": 0}
+        batch: list[tuple[int, Any]] = []
+
+        async def flush() -> str:
+            results = await _import_users_batch(db_conn, batch)
+            batch.clear()
+            for result in results:
+                summary[result["status"]] += 1
+            return "".join(json.dumps(result) + "\n" for result in results)
+
+        for index, row in enumerate(rows):
+            batch.append((index, row))
+            if len(batch) >= BULK_INSERT_BATCH_SIZE:
+                yield await flush()
+
+        if batch:
+            yield await flush()
+
+        yield json.dumps({"status": "success", "summary": summary}) + "\n"
+
+    return StreamingResponse(import_rows(), media_type="application/x-ndjson")
+
+#======================================== AUXILIARES ================================================#
+
+def _iterate_ndjson_rows(body: bytes) -> Iterator[Any]:
+    """
+    Recorre el cuerpo NDJSON línea por línea. Una línea que no es JSON válido se entrega como texto
+    para que se informe como fila inválida sin interrumpir la importación.
+    """
+    for line in io.BytesIO(body):
+        if line.strip():
+            yield _parse_ndjson_line(line)
+
+def _parse_ndjson_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return line.decode(errors="replace")
+
+def _is_bcrypt_hash(value: str) -> bool:
+    return len(value) == 60 and value.startswith(("$2a$", "$2b$", "$2y$"))
+
+async def _import_users_batch(db_conn: DatabaseConnection, batch: list[tuple[int, Any]]) -> list[dict]:
+    """
+    Valida, hashea e inserta un lote de filas.
+
+    Args:
+        db_conn (DatabaseConnection): Conexión a la base de datos.
+        batch (list[tuple[int, Any]]): Pares (número de fila, datos de la fila).
+
+    Returns:
+        list[dict]: Resultado de cada fila, en el mismo orden del lote.
+    """
+    results: dict[int, dict] = {}
+    valid: list[tuple[int, BulkUserRow]] = []
+
+    for index, data in batch:
+        try:
+            row = BulkUserRow.model_validate(data)
+            if row.hashed and not _is_bcrypt_hash(row.password):
+                raise ValueError("'password' no es un hash bcrypt válido.")
+            valid.append((index, row))
+        except (ValidationError, ValueError) as error:
+            message = error.errors()[0]["msg"] if isinstance(error, ValidationError) else str(error)
+            results[index] = {"row": index, "username": data.get("username") if isinstance(data, dict) else None,
+                              "status": "invalid", "message": message}
+
+    async def password_hash(row: BulkUserRow) -> str:
+        return row.password if row.hashed else await hs.hash_password_async(row.password)
+
+    if valid:
+        hashes = await asyncio.gather(*(password_hash(row) for _, row in valid))
+        users = [UserDB(full_name=row.full_name, username=row.username, email=row.email, password=hash)
+                 for (_, row), hash in zip(valid, hashes)]
+        try:
+            inserted = await db.add_users_batch(db_conn=db_conn, users=users)
+            for (index, row), created in zip(valid, inserted):
+                results[index] = {"row": index, "username": row.username,
+                                  "status": "created" if created else "conflict"}
+        except (LibsqlError, DatabaseQueryError, DatabaseConnectionError) as error:
+            for index, row in valid:
+                results[index] = {"row": index, "username": row.username, "status": "error", "message": str(error)}
+
+    return [results[index] for index, _ in batch]
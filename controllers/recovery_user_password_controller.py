@@ -1,13 +1,15 @@
-from fastapi import HTTPException, status, concurrency
+from fastapi import HTTPException, status
 from fastapi.responses import JSONResponse
 from models.request.updated_password_request import UpdatedPasswordRequest
 from models.request.validate_code_request import ValidateRecoveryCodeRequest
-from services.hashing_service import hashed_password
+from services.hashing_service import hash_password_async
 from errors.recovery_code_errors import ExpiredCodeError
 from adapters.database_connection import DatabaseConnection
 from services.db_services import get_user_by_email, update_user
 from models.request.generate_code_request import RecoveryPasswordRequest
-from services.password_recovery_email_sender import PasswordRecoveryEmailSender, PasswordRecoveryCodeManager
+from models.token_claims import TokenClaims
+from services.password_recovery_email_sender import PasswordRecoveryEmailSender
+from services.password_recovery_code_manager import PasswordRecoveryCodeManager
 from services.auth_services import create_access_token, validate_access_token
 
 async def generate_and_send_code_controller(db_conn: DatabaseConnection, recovery_password_request: RecoveryPasswordRequest) -> JSONResponse:
@@ -24,13 +26,18 @@ async def generate_and_send_code_controller(db_conn: DatabaseConnection, recover
                 "message": "El email ingresado no esta registrado."
             })
     
-    await concurrency.run_in_threadpool(sender.send_email_recovery_password,
-                                        user.username,
-                                        recovery_password_request.sender_email,
-                                        recovery_password_request.password_email,
-                                        recovery_password_request.receiver_email,
-                                        recovery_password_request.email_template_html,
-                                        recovery_password_request.custom_code)
+    # El código se guarda antes del envío para que pueda validarse desde cualquier proceso
+    code = await PasswordRecoveryCodeManager().generate_code(user_email= recovery_password_request.receiver_email,
+                                                             code= recovery_password_request.custom_code)
+    
+    # El email se encola y lo entregan los workers de la cola: la respuesta no espera al servidor SMTP.
+    await sender.enqueue_email_recovery_password(db_conn= db_conn,
+                                                 username= user.username,
+                                                 sender_email= recovery_password_request.sender_email,
+                                                 password_email= recovery_password_request.password_email,
+                                                 receiver_email= recovery_password_request.receiver_email,
+                                                 email_template_html= recovery_password_request.email_template_html,
+                                                 custom_code= code.code)
 
     return JSONResponse(
             status_code = status.HTTP_200_OK, 
@@ -44,9 +51,8 @@ async def validate_code_controller(db_conn: DatabaseConnection, #Para futura imp
     
     code_manager = PasswordRecoveryCodeManager()
     try:
-        is_valid = await concurrency.run_in_threadpool(code_manager.validate_code,
-                                                       validate_code_request.code,
-                                                       validate_code_request.user_email)    
+        is_valid = await code_manager.validate_code(code= validate_code_request.code,
+                                                    email= validate_code_request.user_email)
     except ExpiredCodeError:
         raise HTTPException(
             status_code= status.HTTP_400_BAD_REQUEST,
@@ -79,7 +85,7 @@ async def validate_code_controller(db_conn: DatabaseConnection, #Para futura imp
 
 async def updated_password_controller(db_conn: DatabaseConnection, 
                                       updated_password_request: UpdatedPasswordRequest,
-                                      token: str
+                                      token: str | TokenClaims
                                      ) -> JSONResponse:
     
     token_is_valid = await validate_access_token(db_conn= db_conn,token= token)
@@ -102,7 +108,7 @@ async def updated_password_controller(db_conn: DatabaseConnection,
             }
         )
     
-    hash = hashed_password(password= updated_password_request.new_password)
+    hash = await hash_password_async(password= updated_password_request.new_password)
     user.password = hash  # Asignación de contraseña hasheada al usuario
     
     await update_user(db_conn= db_conn, username= user.username, updated_user= user)
@@ -4,4 +4,8 @@ class DatabaseConnectionError(Exception):
         
 class DatabaseQueryError(Exception):
     def __init__(self, *args):
-        super().__init__(*args)
\ No newline at end of file
+        super().__init__(*args)
+        
+class DatabasePoolTimeoutError(DatabaseConnectionError):
+    def __init__(self, *args):
+        super().__init__(*args)
@@ -4,4 +4,9 @@ class UserNotFoundError(Exception):
         
 class UsernameNotFoundError(Exception):
     def __init__(self, *args):
-        super().__init__(*args)
\ No newline at end of file
+        super().__init__(*args)
+
+class DuplicateUserError(Exception):
+    def __init__(self, fields: list[str], *args):
+        super().__init__(*args)
+        self.fields = fields
@@ -1,11 +1,46 @@
 from fastapi import FastAPI
+from contextlib import asynccontextmanager
 from utils.env_loader import EnvManager
 from fastapi.middleware.cors import CORSMiddleware
-from adapters.adapter_db_conn_libsql import AdapterDBConnLibsqlClient
-from routers import authentication_routers as atr, users_router as ur, recovery_password_routers as rpr
+from connections.db_connection import db_conn
+from services.migration_service import run_migrations
+from services.password_recovery_code_manager import PasswordRecoveryCodeManager
+from services.password_recovery_email_sender import SMTP_TRANSPORT, EMAIL_OUTBOX
+from utils.loop_lag_monitor import LoopLagMonitor
+from middlewares.metrics_middleware import MetricsMiddleware
+from middlewares.profiler_middleware import ProfilerMiddleware
+from routers import authentication_routers as atr, users_router as ur, recovery_password_routers as rpr, metrics_router as mr, profiler_router as pr
+
+DB_CONN = db_conn()
+RUN_MIGRATIONS = str(EnvManager().get("DATABASE_RUN_MIGRATIONS", "true")).lower() == "true"
+RECOVERY_CODE_SWEEP_INTERVAL = float(EnvManager().get("RECOVERY_CODE_SWEEP_INTERVAL_SECONDS", 60))
+METRICS_ENABLED = str(EnvManager().get("METRICS_ENABLED", "false")).lower() == "true"
+DB_INSTRUMENTED = METRICS_ENABLED or EnvManager().get("DB_SLOW_QUERY_THRESHOLD_MS") is not None
+LOOP_LAG_MONITOR_ENABLED = str(EnvManager().get("LOOP_LAG_MONITOR_ENABLED", "false")).lower() == "true"
+LOOP_LAG_MONITOR = LoopLagMonitor()
+PROFILER_ENABLED = float(EnvManager().get("PROFILER_SAMPLE_RATE", 0)) > 0 or bool(EnvManager().get("PROFILER_SECRET"))
+
+#====================LIFESPAN====================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if LOOP_LAG_MONITOR_ENABLED:
+        LOOP_LAG_MONITOR.start()
+    # Las conexiones se abren una vez al iniciar y se reutilizan entre requests.
+    await DB_CONN.connect()
+    if RUN_MIGRATIONS:
+        await run_migrations(DB_CONN)
+    PasswordRecoveryCodeManager().start_sweeper(interval= RECOVERY_CODE_SWEEP_INTERVAL)
+    EMAIL_OUTBOX.start(DB_CONN)
+    yield
+    await EMAIL_OUTBOX.stop()
+    await PasswordRecoveryCodeManager().stop_sweeper()
+    await SMTP_TRANSPORT.close()
+    await DB_CONN.close()
+    await LOOP_LAG_MONITOR.stop()
 
 #====================APP====================
 app = FastAPI(
+    lifespan= lifespan,
     title= "User Manager API", 
     description= "API for user management, including authentication, registration, and password recovery.", 
     version= "0.2.3",
@@ -24,4 +59,15 @@ app.add_middleware(
 )
 app.include_router(atr.router)
 app.include_router(ur.router)
-app.include_router(rpr.router)
\ No newline at end of file
+app.include_router(rpr.router)
+
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(mr.router)
+
+if DB_INSTRUMENTED:
+    app.include_router(mr.statements_router)
+
+if PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+    app.include_router(pr.router)
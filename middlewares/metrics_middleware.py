@@ -0,0 +1,50 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from utils.metrics import MetricsRegistry
+
+METRICS = MetricsRegistry()
+HTTP_REQUEST_DURATION = METRICS.histogram("http_request_duration_seconds",
+                                          "Duración de los requests HTTP por ruta y código de estado.",
+                                          ("method", "route", "status"))
+HTTP_REQUESTS_IN_FLIGHT = METRICS.gauge("http_requests_in_flight", "Requests HTTP en curso.")
+
+
+class MetricsMiddleware():
+    """
+    Middleware ASGI que mide la duración de cada request y la cantidad de requests en curso.
+
+    La ruta se etiqueta con la plantilla del endpoint (por ejemplo, `/user/me`) y no con la URL recibida,
+    para que la cantidad de series no dependa de los datos de los requests; los requests que no coinciden
+    con ningún endpoint se agrupan como `unmatched`.
+
+    Attributes:
+        app (ASGIApp): Aplicación ASGI envuelta.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start,
+                                          scope["method"],
+                                          getattr(route, "path", "unmatched"),
+                                          str(status_code))
@@ -0,0 +1,58 @@
+import random
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from utils.env_loader import EnvManager
+from utils.sampling_profiler import CURRENT_PROFILE, SamplingProfiler, verify_profile_request
+
+PROFILE_HEADER = "x-debug-profile"
+
+
+class ProfilerMiddleware():
+    """
+    Middleware ASGI que perfila una muestra de los requests con `SamplingProfiler`.
+
+    Se perfila un request con probabilidad `sample_rate`, o siempre que incluya la cabecera
+    `X-Debug-Profile` firmada con `secret` (ver `sign_profile_request`). La respuesta de un request
+    perfilado incluye la cabecera `X-Profile-Id` con el identificador del perfil, que puede descargarse
+    desde `/debug/profiles/{profile_id}`.
+
+    Attributes:
+        app (ASGIApp): Aplicación ASGI envuelta.
+        sample_rate (float): Probabilidad de perfilar cada request, entre 0 y 1.
+        secret (str | None): Clave para verificar la cabecera `X-Debug-Profile`. Si es None, la cabecera se ignora.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float | None = None, secret: str | None = None):
+        self.app = app
+        self.sample_rate = sample_rate if sample_rate is not None else float(EnvManager().get("PROFILER_SAMPLE_RATE", 0))
+        self.secret = secret if secret is not None else EnvManager().get("PROFILER_SECRET")
+        self.profiler = SamplingProfiler()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.__should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        session = self.profiler.start(scope["method"], scope["path"])
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", session.id.encode())]
+            await send(message)
+
+        token = CURRENT_PROFILE.set(session)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            CURRENT_PROFILE.reset(token)
+            self.profiler.stop(session, status_code, getattr(scope.get("route"), "path", None))
+
+    def __should_profile(self, scope: Scope) -> bool:
+        if self.secret:
+            header = Headers(scope= scope).get(PROFILE_HEADER)
+            if header is not None and verify_profile_request(self.secret, scope["path"], header):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
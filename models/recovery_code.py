@@ -1,12 +1,22 @@
+import time
 import random
-from datetime import datetime, timedelta, timezone
 
 
-class RecoveryCode():     
-    def __init__(self, minutes_of_code_lifetime: int, code: str = None):
+class RecoveryCode():
+    # Objetos compactos: sin __dict__ por instancia y con la expiración como epoch en segundos.
+    __slots__ = ("code", "expires_at")
+
+    def __init__(self, minutes_of_code_lifetime: float, code: str = None):
         self.code = "".join(str(random.randint(0, 9)) for _ in range(5)) if code is None else code
-        self.expired_datetime = datetime.now(timezone.utc)  + timedelta(minutes= minutes_of_code_lifetime)
+        self.expires_at = time.time() + minutes_of_code_lifetime * 60
+
+    @classmethod
+    def from_expiration(cls, code: str, expires_at: float) -> "RecoveryCode":
+        """Construye un código con un instante de expiración (epoch en segundos) ya conocido."""
+        recovery_code = cls.__new__(cls)
+        recovery_code.code = code
+        recovery_code.expires_at = expires_at
+        return recovery_code
 
-    def is_valid(self):
-        return self.expired_datetime > datetime.now(timezone.utc)
-    
\ No newline at end of file
+    def is_valid(self) -> bool:
+        return self.expires_at > time.time()
@@ -0,0 +1,5 @@
+from pydantic import Field
+from models.user_db import UserDB
+
+class BulkUserRow(UserDB):
+    hashed: bool = Field(False, description="Indica si 'password' ya es un hash bcrypt")
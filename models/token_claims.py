@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+class TokenClaims(BaseModel):
+    sub: str
+    exp: int
+    iat: float | None = None
@@ -4,9 +4,9 @@ from adapters.adapter_db_conn_libsql import AdapterDBConnLibsqlClient
 from controllers import auth_controller as at
 from models.user_db import UserDB
 from utils.env_loader import EnvManager
-from connections.db_connection import db_conn_libsql_client
+from connections.db_connection import db_conn
 
-DB_CONN = db_conn_libsql_client()
+DB_CONN = db_conn()
 
 router = APIRouter()
 oauth2 = OAuth2PasswordBearer(tokenUrl= "/login")
@@ -0,0 +1,23 @@
+from typing import Literal
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response, JSONResponse
+from controllers import auth_controller as at
+from utils.metrics import MetricsRegistry
+from adapters.instrumented_database_connection import QUERY_STATISTICS
+
+#==============================ROUTER==============================#
+router = APIRouter(tags= ["Metrics"])
+# Disponible siempre que la base de datos esté instrumentada, aunque METRICS_ENABLED sea false.
+statements_router = APIRouter(tags= ["Metrics"])
+
+@router.get("/metrics", include_in_schema= False)
+async def metrics():
+    # Las métricas se formatean sólo cuando se consultan.
+    return Response(content= MetricsRegistry().render(),
+                    media_type= "text/plain; version=0.0.4; charset=utf-8")
+
+@statements_router.get("/metrics/statements", dependencies= [Depends(at.verify_admin_api_key)])
+async def top_statements(limit: int = 10,
+                         order_by: Literal["total_ms", "mean_ms", "max_ms", "calls", "rows"] = "total_ms"):
+    return JSONResponse(content= {"status": "success",
+                                  "data": QUERY_STATISTICS.top(limit= limit, order_by= order_by)})
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response, JSONResponse
+from controllers import auth_controller as at
+from utils.sampling_profiler import SamplingProfiler
+
+#==============================ROUTER==============================#
+router = APIRouter(prefix= "/debug/profiles", tags= ["Profiler"], dependencies= [Depends(at.verify_admin_api_key)])
+
+@router.get("")
+async def list_profiles():
+    return JSONResponse(content= {"status": "success", "data": SamplingProfiler().profiles()})
+
+@router.get("/{profile_id}")
+async def get_profile(profile_id: str):
+    # Pilas colapsadas, listas para flamegraph.pl, speedscope o inferno.
+    profile = SamplingProfiler().get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code= status.HTTP_404_NOT_FOUND,
+            detail= {"status": "error", "message": "El perfil no existe o ya fue descartado del buffer."}
+        )
+    return Response(content= profile.collapsed(), media_type= "text/plain; charset=utf-8")
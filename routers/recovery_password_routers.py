@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2PasswordBearer
-from connections.db_connection import db_conn_libsql_client
+from connections.db_connection import db_conn
 from controllers import recovery_user_password_controller as c
-from services.auth_services import oauth2_schema
+from controllers.auth_controller import verified_token_claims
+from models.token_claims import TokenClaims
 
 router = APIRouter(tags=["Recovery password methods"], prefix="/recovery-password")
-DB_CONN = db_conn_libsql_client()
+DB_CONN = db_conn()
 
 
 @router.post("/request")
@@ -24,8 +25,8 @@ async def validate_code(validate_code_request: c.ValidateRecoveryCodeRequest):
 
 @router.post("/reset")
 async def update_password(updated_password_request: c.UpdatedPasswordRequest,
-                           token: str = Depends(oauth2_schema)):
+                           claims: TokenClaims = Depends(verified_token_claims)):
     res = await c.updated_password_controller(db_conn= DB_CONN,
                                              updated_password_request= updated_password_request,
-                                             token= token)
+                                             token= claims)
     return res
\ No newline at end of file
@@ -1,20 +1,20 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from controllers import db_controllers as c
 from controllers import auth_controller as at
-from services.auth_services import oauth2_schema
+from models.token_claims import TokenClaims
 from models.request.add_user_request import AddUserRequest
-from connections.db_connection import db_conn_libsql_client
+from connections.db_connection import db_conn
 from models.request.update_user_request import UpdateUserRequest
 
 #DATABASE CONNECTION CONSTANTS
-DB_CONN = db_conn_libsql_client()
+DB_CONN = db_conn()
 
 #==============================ROUTER==============================#
 router  = APIRouter(prefix= "/user", tags= ["User methods"])
 
 @router.get("/me")
-async def get_users_me(token: str = Depends(oauth2_schema)):
-    res = await at.get_current_user_controller(db_conn= DB_CONN, token= token)
+async def get_users_me(claims: TokenClaims = Depends(at.verified_token_claims)):
+    res = await at.get_current_user_controller(db_conn= DB_CONN, token= claims)
     return res
 
 @router.post("/register")
@@ -24,15 +24,22 @@ async def register(request: AddUserRequest):
     return res
 
 @router.delete("/delete")
-async def delete(token: str = Depends(oauth2_schema)):
+async def delete(claims: TokenClaims = Depends(at.verified_token_claims)):
     res = await c.delete_user_controller(db_conn= DB_CONN,
-                                         token= token)
+                                         token= claims)
     return res
 
 
 @router.put("/update")
-async def update(request: UpdateUserRequest, token: str = Depends(oauth2_schema)):
+async def update(request: UpdateUserRequest, claims: TokenClaims = Depends(at.verified_token_claims)):
     res = await c.update_user_controller(db_conn= DB_CONN,
                                          request= request, 
-                                         token= token)
+                                         token= claims)
+    return res
+
+
+@router.post("/bulk", dependencies= [Depends(at.verify_admin_api_key)])
+async def bulk_register(request: Request):
+    res = await c.add_users_batch_controller(db_conn= DB_CONN,
+                                             request= request)
     return res
@@ -1,11 +1,16 @@
 import jwt
+import time
+import hashlib
 from models.user_db import UserDB
+from utils.lru_cache import LRUCache
+from models.token_claims import TokenClaims
 from utils.env_loader import EnvManager
 from errors.users_errors import UserNotFoundError
 from models.responses.token_response import Token
 from datetime import datetime, timedelta, timezone
 from errors.token_format_error import TokenFormatError
 from adapters.database_connection import DatabaseConnection
+from services.token_revocation import TokenRevocationRegistry
 from services import db_services as db, hashing_service as hs
 from errors.users_errors import UserNotFoundError, UsernameNotFoundError
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
@@ -19,6 +24,12 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(ENV.get("JWT_EXPIRE_MINUTES"))
 
 TOKEN_TYPE = "Bearer" 
 
+# Modo sin estado: confía en la firma, `exp` y el registro de revocaciones, sin consultar la base de datos.
+STATELESS_VALIDATION = str(ENV.get("JWT_STATELESS_VALIDATION", "false")).lower() == "true"
+
+# Caché de tokens verificados: hash del token -> claims. Cada entrada expira junto con el token.
+CLAIMS_CACHE: LRUCache[str, TokenClaims] = LRUCache(max_size= int(ENV.get("JWT_CLAIMS_CACHE_SIZE", 1024)))
+
 
 #Schema
 oauth2_schema = OAuth2PasswordBearer(tokenUrl= "/")
@@ -51,8 +62,8 @@ async def authenticate_user(db_conn: DatabaseConnection, username: str, password
     if not user:
         raise UserNotFoundError("Usuario no encontrado.")
     
-    validated = hs.validate_password(password=password,
-                                     hashed_password=user.password)
+    validated = await hs.verify_password_async(password=password,
+                                               hashed_password=user.password)
     
     return validated
 
@@ -60,7 +71,7 @@ def create_access_token(username: str) -> str:
     """
     Crea un token de acceso JWT para un usuario.
 
-    Esta función genera un token JWT que contiene el nombre de usuario y la fecha de expiración.
+    Esta función genera un token JWT que contiene el nombre de usuario, la fecha de emisión y la de expiración.
 
     Args:
         username (str): Nombre de usuario para el cual se generará el token.
@@ -71,102 +82,155 @@ def create_access_token(username: str) -> str:
     # Data
     payload = {
         "sub": username,
+        "iat": time.time(),
         "exp": datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     }
     # Creación de JWT    
     encoded_jwt = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_username_from_token(token: str) -> str | None:
+def verify_access_token(token: str | TokenClaims) -> TokenClaims:
+    """
+    Verifica un token de acceso JWT y devuelve sus claims tipados.
+
+    El token se decodifica una única vez: el resultado se guarda en una caché LRU indexada por el hash
+    del token, cuyas entradas expiran junto con el claim `exp`. Si se recibe un `TokenClaims` ya
+    verificado, se devuelve sin volver a decodificar.
+
+    Args:
+        token (str | TokenClaims): Token JWT o claims previamente verificados.
+
+    Raises:
+        TokenFormatError: Si el token no contiene el claim 'sub'.
+        UsernameNotFoundError: Si el claim 'sub' está vacío.
+        InvalidTokenError: Si la firma no es válida o el token está expirado. Pertenece al módulo jwt.
+
+    Returns:
+        TokenClaims: Claims verificados del token.
+    """
+    if isinstance(token, TokenClaims):
+        return token
+
+    key = hashlib.sha256(token.encode()).hexdigest()
+    claims = CLAIMS_CACHE.get(key)
+    if claims is not None:
+        return claims
+
+    payload: dict = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options={"require": ["exp"]})
+
+    if "sub" not in payload:  # A modo de prevención de formato correcto del json web token.
+        raise TokenFormatError("No se encontró la clave username en el JWT decodificado")
+    if not payload["sub"]:
+        raise UsernameNotFoundError("Username no encontrado en el token.")
+
+    claims = TokenClaims(**payload)
+    CLAIMS_CACHE.set(key, claims, expires_at= claims.exp)
+    return claims
+
+def get_username_from_token(token: str | TokenClaims) -> str | None:
     """
     Extrae el nombre de usuario de un token JWT.
 
-    Esta función decodifica el token JWT y devuelve el nombre de usuario contenido en el payload.
+    Esta función verifica el token JWT y devuelve el nombre de usuario contenido en el payload.
 
     Args:
-        token (str): Token JWT del cual se extraerá el nombre de usuario.
+        token (str | TokenClaims): Token JWT del cual se extraerá el nombre de usuario.
 
     Returns: 
         str | None: Nombre de usuario si se encuentra, de lo contrario None.
     """
     try:
-        payload: dict = jwt.decode(token, SECRET_KEY, algorithms=ALGORITHM)
-        username = payload.get("sub", None)
-        return username if username else None
+        return verify_access_token(token).sub
     except Exception as e:
         return None
-        
-async def validate_access_token(db_conn: DatabaseConnection, token: str) -> bool:
+
+def revoke_user_tokens(username: str) -> None:
+    """
+    Revoca todos los tokens emitidos hasta el momento para un usuario.
+
+    Debe llamarse cuando el usuario se elimina o cambia su nombre de usuario, para que los tokens previos
+    dejen de ser aceptados también en el modo de validación sin estado.
+
+    Args:
+        username (str): Nombre de usuario cuyos tokens se revocan.
+    """
+    TokenRevocationRegistry().revoke(username)
+
+async def authorize_access_token(db_conn: DatabaseConnection, token: str | TokenClaims) -> TokenClaims | None:
+    """
+    Verifica un token de acceso JWT y comprueba que el usuario asociado siga siendo válido.
+
+    En el modo por defecto se consulta la existencia del usuario en la base de datos. Si la variable de
+    entorno `JWT_STATELESS_VALIDATION` es 'true', sólo se verifican la firma, la expiración y el registro
+    de revocaciones en memoria, sin realizar operaciones de entrada/salida.
+
+    Args:
+        db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
+        token (str | TokenClaims): Token JWT o claims previamente verificados.
+
+    Returns:
+        TokenClaims | None: Claims del token si es válido y el usuario existe, de lo contrario None.
+    """
+    try:
+        claims = verify_access_token(token)
+    except (jwt.PyJWTError, TokenFormatError, UsernameNotFoundError):
+        return None
+
+    if TokenRevocationRegistry().is_revoked(claims):
+        return None
+
+    if STATELESS_VALIDATION or await db.exists_username(db_conn= db_conn, username= claims.sub):
+        return claims
+    return None
+
+async def validate_access_token(db_conn: DatabaseConnection, token: str | TokenClaims) -> bool:
     """
     Valida un token de acceso JWT.
 
-    Esta función decodifica el token y verifica si el nombre de usuario asociado existe en la base de datos.
+    Esta función verifica el token y si el nombre de usuario asociado existe en la base de datos.
     Tambien verifíca que el token no este expirado, y la firma del mismo.
 
     Args:
         db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
-        token (str): Token JWT a validar.
+        token (str | TokenClaims): Token JWT a validar o claims previamente verificados.
 
     Returns:
         bool: Devuelve True si el token es válido y el usuario existe, de lo contrario False.
     """
-    try:
-        payload = jwt.decode(token, SECRET_KEY, ALGORITHM)
-        username = get_username_from_token(token)
+    return await authorize_access_token(db_conn= db_conn, token= token) is not None
 
-        if username:
-            return await db.exists_username(db_conn= db_conn, username= username)
-        
-    except (jwt.PyJWTError):
-        return False
-    except KeyError:
-        return False
-
-async def get_current_user(db_conn: DatabaseConnection, token: str) -> UserDB: 
+async def get_current_user(db_conn: DatabaseConnection, token: str | TokenClaims) -> UserDB: 
     """
     Recupera el usuario actual a partir de un token JWT.
 
-    Esta función decodifica el token JWT proporcionado y busca el usuario correspondiente en la base de datos.
+    Esta función verifica el token JWT proporcionado y busca el usuario correspondiente en la base de datos.
 
     Args:
         db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
-        token (str): Token JWT del cual se extraerá el nombre de usuario.
+        token (str | TokenClaims): Token JWT del cual se extraerá el nombre de usuario, o claims previamente verificados.
 
     Raises:
         UserNotFoundError: Si no se encuentra un usuario con el nombre de usuario extraído del token.
         UsernameNotFoundError: Si no se encuentra el nombre de usuario en el token.
         TokenFormatError: Si el formato del token no es válido.
-        InvalidTokenError: Si el token está expirado. Pertenece al módulo jwt.
+        InvalidTokenError: Si el token está expirado o fue revocado. Pertenece al módulo jwt.
 
     Returns:
         UserDB: Objeto de usuario correspondiente al nombre de usuario extraído del token.
     """
+    claims = verify_access_token(token)
+    if TokenRevocationRegistry().is_revoked(claims):
+        raise jwt.InvalidTokenError("Token revocado.")
+
+    # Recuperación de usuario en base de datos.
+    user = await db.get_user(db_conn= db_conn,
+                             username= claims.sub, 
+                             visible_password= True)
     
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=ALGORITHM)
-        username = payload["sub"]
-        
-        # Recuperación de username
-        if not username:
-            raise UsernameNotFoundError(f"Username no encontrado en el token.")
-        
-        # Recuperación de usuario en base de datos.
-        user = await db.get_user(db_conn= db_conn,
-                                 username= username, 
-                                 visible_password= True)
-        
-        if not user:
-            raise UserNotFoundError("Usuario no encontrado.")
-        
-        return user
-        
-    except KeyError as e:  # A modo de prevención de formato correcto del json web token.
-        raise TokenFormatError("No se encontró la clave username en el JWT decodificado")
-
-    except jwt.ExpiredSignatureError:
-        raise jwt.ExpiredSignatureError
-    except jwt.InvalidTokenError:
-        raise jwt.InvalidTokenError
+    if not user:
+        raise UserNotFoundError("Usuario no encontrado.")
+    
+    return user
         
 async def login_for_access_token(db_conn: DatabaseConnection, form_data: OAuth2PasswordRequestForm) -> Token:
     """
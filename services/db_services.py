@@ -1,12 +1,94 @@
-import asyncio
+import functools
 from adapters.database_connection import DatabaseConnection
 from models.user_db import User, UserDB
+from utils.env_loader import EnvManager
+from errors.users_errors import DuplicateUserError
+from services.user_cache import UserCache, MISS
+from utils.single_flight import SingleFlight
 from typing import Union
 
 
 #TODO actualizar documentacion
-# Bloqueo para controlar concurrencia de conexiones.
-look = asyncio.locks.Lock()
+# Cada operación toma una conexión con `db_conn.lease()`, o con `db_conn.reader()` las búsquedas de sólo
+# lectura, que pueden resolverse en una réplica. Con un `DatabaseConnectionPool` las
+# consultas independientes se ejecutan en paralelo sobre conexiones distintas.
+
+ENV = EnvManager()
+
+# Caché de lectura de usuarios. Las escrituras de este módulo la invalidan, pero sólo en el proceso que las
+# realiza; por eso las búsquedas con `visible_password`, que validan contraseñas, nunca se resuelven con ella.
+USER_CACHE = UserCache(max_size= int(ENV.get("USER_CACHE_MAX_SIZE", 1024)),
+                       ttl= float(ENV.get("USER_CACHE_TTL_SECONDS", 60)),
+                       negative_ttl= float(ENV.get("USER_CACHE_NEGATIVE_TTL_SECONDS", 5)))
+
+# Búsquedas en curso. Las llamadas concurrentes con la misma clave comparten una única consulta. La clave
+# incluye `USER_CACHE.generation`, por lo que una lectura iniciada antes de una escritura no se comparte
+# con las llamadas posteriores a ella.
+USER_LOOKUPS = SingleFlight()
+
+#==================== CONSTRUCCIÓN DE CONSULTAS ====================
+# Columnas públicas del usuario. `hashed_password` sólo se proyecta cuando se solicita explícitamente.
+USER_COLUMNS = ("full_name", "username", "email")
+PASSWORD_COLUMN = "hashed_password"
+
+def _select_user_query(column: str, visible_password: bool) -> str:
+    """
+    Construye la consulta de búsqueda de un usuario por `column`, proyectando sólo las columnas necesarias.
+
+    Args:
+        column (str): Columna de búsqueda ('username' o 'email').
+        visible_password (bool): Si es True, se incluye la columna hashed_password.
+
+    Returns:
+        str: Consulta SQL parametrizada.
+    """
+    columns = USER_COLUMNS + (PASSWORD_COLUMN,) if visible_password else USER_COLUMNS
+    return f"SELECT {', '.join(columns)} FROM user WHERE {column} = ? LIMIT 1;"
+
+def _row_to_user(row: tuple) -> User | UserDB:
+    """
+    Construye un User, o un UserDB si la fila incluye hashed_password, a partir de una fila de `_select_user_query`.
+    """
+    user_data = dict(zip(USER_COLUMNS, row))
+    if len(row) > len(USER_COLUMNS):
+        return UserDB(**user_data, password= row[len(USER_COLUMNS)])
+    return User(**user_data)
+
+SELECT_USER_QUERIES = {(column, visible_password): _select_user_query(column, visible_password)
+                       for column in ("username", "email") for visible_password in (False, True)}
+
+# Consultas con nombre. Cada una se construye una única vez para que el texto SQL sea idéntico entre
+# llamadas y la caché de sentencias preparadas del adaptador la reutilice.
+INSERT_USER_QUERY = "INSERT INTO user(full_name, username, email, hashed_password) VALUES (?, ?, ?, ?);"
+INSERT_USER_IF_UNIQUE_QUERY = """INSERT INTO user(full_name, username, email, hashed_password) VALUES (?, ?, ?, ?)
+            ON CONFLICT DO NOTHING RETURNING username;"""
+USER_COLLISIONS_QUERY = "SELECT username = ?, email = ? FROM user WHERE username = ? OR email = ?;"
+DELETE_USER_QUERY = "DELETE FROM user WHERE username = ?"
+UPDATE_USER_QUERY = """UPDATE user
+            SET full_name = ?, username = ?, email = ?, hashed_password = ?
+            WHERE username = ?"""
+EXISTS_USERNAME_QUERY = "SELECT 1 FROM user WHERE username = ? LIMIT 1;"
+# Basta con saber si hay cero, una o más filas coincidentes.
+IS_UNIQUE_QUERY = "SELECT 1 FROM user WHERE username = ? OR email = ? LIMIT 2;"
+
+@functools.lru_cache(maxsize=32)
+def _insert_users_batch_query(rows: int) -> str:
+    """
+    Construye la sentencia `INSERT` multi-fila para `rows` usuarios. Se memoriza por cantidad de filas,
+    de modo que los lotes completos comparten siempre el mismo texto SQL.
+    """
+    return f"""INSERT INTO user(full_name, username, email, hashed_password)
+            VALUES {", ".join(["(?, ?, ?, ?)"] * rows)}
+            ON CONFLICT DO NOTHING RETURNING username, email;"""
+
+def _record_user_write(db_conn: DatabaseConnection, username: str | None = None, email: str | None = None) -> None:
+    """
+    Registra la escritura de un usuario: invalida sus claves en la caché y las informa a la conexión
+    para que sus próximas lecturas vean la escritura.
+    """
+    USER_CACHE.invalidate(username= username, email= email)
+    db_conn.record_write(("username", username) if username is not None else None,
+                         ("email", email) if email is not None else None)
 
 # Operaciones CRUD
 
@@ -18,15 +100,78 @@ async def add_user(db_conn: DatabaseConnection, user: UserDB) -> None:
         db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
         user (UserDB): El objeto UserDB que contiene la información del usuario a agregar.
     """
-    try:
-        async with look:
-            await db_conn.connect()
-            await db_conn.execute(
-                "INSERT INTO user(full_name, username, email, hashed_password) VALUES (?, ?, ?, ?);",
-                [*user.model_dump().values()]
-            )
-    finally:
-        await db_conn.close()
+    async with db_conn.lease() as conn:
+        await conn.execute(INSERT_USER_QUERY, [*user.model_dump().values()])
+    _record_user_write(db_conn, username= user.username, email= user.email)
+
+async def insert_user_if_unique(db_conn: DatabaseConnection, user: UserDB) -> None:
+    """
+    Agrega un nuevo usuario si su nombre de usuario y su correo electrónico no existen, en una única consulta.
+
+    La unicidad se resuelve de forma atómica con `INSERT ... ON CONFLICT DO NOTHING RETURNING`, por lo que
+    no existe una ventana entre la verificación y la inserción. Sólo en caso de conflicto se realiza una
+    segunda consulta para informar qué columnas colisionaron.
+
+    Args:
+        db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
+        user (UserDB): El objeto UserDB que contiene la información del usuario a agregar.
+
+    Raises:
+        DuplicateUserError: Si el nombre de usuario y/o el correo electrónico ya existen. El atributo
+            `fields` indica las columnas en conflicto ('username', 'email').
+    """
+    async with db_conn.lease() as conn:
+        inserted = await conn.execute(INSERT_USER_IF_UNIQUE_QUERY,
+                                      [user.full_name, user.username, user.email, user.password])
+
+        if not inserted:
+            collisions = await conn.execute(USER_COLLISIONS_QUERY,
+                                            [user.username, user.email, user.username, user.email])
+
+    if inserted:
+        _record_user_write(db_conn, username= user.username, email= user.email)
+        return
+
+    fields = [field for index, field in enumerate(("username", "email"))
+              if any(row[index] for row in collisions)]
+    raise DuplicateUserError(fields or ["username", "email"],
+                             f"El usuario '{user.username}' ya existe. Columnas en conflicto: {fields}")
+
+async def add_users_batch(db_conn: DatabaseConnection, users: list[UserDB]) -> list[bool]:
+    """
+    Agrega un lote de usuarios en una única sentencia `INSERT` multi-fila, que se aplica de forma atómica.
+
+    Las filas cuyo username o email ya existen (en la base de datos o previamente en el mismo lote) se
+    omiten sin abortar el resto del lote.
+
+    Args:
+        db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
+        users (list[UserDB]): Usuarios a agregar, con la contraseña ya hasheada.
+
+    Returns:
+        list[bool]: Para cada usuario, en el mismo orden, True si se agregó o False si estaba en conflicto.
+    """
+    if not users:
+        return []
+
+    params = []
+    for user in users:
+        params.extend((user.full_name, user.username, user.email, user.password))
+
+    async with db_conn.lease() as conn:
+        inserted = await conn.execute(_insert_users_batch_query(len(users)), params)
+
+    # Un par (username, email) sólo puede haberse insertado una vez; las repeticiones son conflictos.
+    pending = {(row[0], row[1]) for row in inserted}
+    results = []
+    for user in users:
+        key = (user.username, user.email)
+        results.append(key in pending)
+        if key in pending:
+            pending.remove(key)
+            _record_user_write(db_conn, username= user.username, email= user.email)
+
+    return results
 
 async def get_user(db_conn: DatabaseConnection, username: str, visible_password: bool = False) -> User | UserDB | None:
     """
@@ -39,24 +184,12 @@ async def get_user(db_conn: DatabaseConnection, username: str, visible_password:
     Returns:
         User | UserDB | None: Un objeto User si se encuentra el usuario, de lo contrario None y UserDB si hidden_password es True.
     """
-    try:
-        async with look:
-            await db_conn.connect()
-            result = await db_conn.execute("""SELECT full_name, username, email, hashed_password
-                                        FROM user WHERE username = ?;""", [username])
-            
-            row = result[0] if len(result) == 1 else None #TODO mejorar logica de recuperacion de usuario.
-            
-            if row:
-                user_data = {"full_name": row[0], "username": row[1], "email": row[2]}
-                if visible_password:
-                    user_data["password"] = row[3]
-                    return UserDB(**user_data)
-                
-                return User(**user_data)
-            return None
-    finally:
-        await db_conn.close()
+    if not visible_password:
+        cached = USER_CACHE.get_by_username(username)
+        if cached is not MISS:
+            return cached
+
+    return await _lookup_user(db_conn, "username", username, visible_password)
 
 async def delete_user(db_conn: DatabaseConnection, username: str) -> None:
     """
@@ -66,12 +199,9 @@ async def delete_user(db_conn: DatabaseConnection, username: str) -> None:
         db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
         username (str): Nombre de usuario del usuario a eliminar.
     """
-    try:
-        async with look:
-            await db_conn.connect()
-            await db_conn.execute("DELETE FROM user WHERE username = ?", [username])
-    finally:
-        await db_conn.close()
+    async with db_conn.lease() as conn:
+        await conn.execute(DELETE_USER_QUERY, [username])
+    _record_user_write(db_conn, username= username)
 
 async def update_user(db_conn: DatabaseConnection, username: str, updated_user: UserDB) -> None:
     """
@@ -82,18 +212,15 @@ async def update_user(db_conn: DatabaseConnection, username: str, updated_user:
         username (str): Nombre de usuario del usuario a actualizar.
         updated_user (UserDB): Objeto UserDB que contiene la nueva información del usuario.
     """
-    try:
-        async with look:
-            await db_conn.connect()
-            await db_conn.execute(
-                """UPDATE user
-                SET full_name = ?, username = ?, email = ?, hashed_password = ?
-                WHERE username = ?""",
-                [updated_user.full_name, updated_user.username, updated_user.email,
-                updated_user.password, username]
-            )
-    finally:
-        await db_conn.close()
+    async with db_conn.lease() as conn:
+        await conn.execute(
+            UPDATE_USER_QUERY,
+            [updated_user.full_name, updated_user.username, updated_user.email,
+            updated_user.password, username]
+        )
+    # Se invalidan tanto las claves anteriores como las nuevas del usuario.
+    _record_user_write(db_conn, username= username)
+    _record_user_write(db_conn, username= updated_user.username, email= updated_user.email)
 
 async def exists_username(db_conn: DatabaseConnection, username: str) -> bool:
     """
@@ -107,15 +234,12 @@ async def exists_username(db_conn: DatabaseConnection, username: str) -> bool:
         bool: Devuelve True si el nombre de usuario existe en la base de datos,
               de lo contrario, devuelve False.
     """
-    try:
-        async with look:
-            await db_conn.connect()
-            result = await db_conn.execute("SELECT * FROM user WHERE username = ?;", [username])
-            
-            return len(result) != 0 
-    finally:
-        await db_conn.close()
-        
+    async def fetch() -> bool:
+        async with db_conn.reader(("username", username)) as conn:
+            return len(await conn.execute(EXISTS_USERNAME_QUERY, [username])) != 0
+
+    return await USER_LOOKUPS.do(("exists", username, USER_CACHE.generation), fetch)
+
 async def is_unique(db_conn: DatabaseConnection, user: User, for_update_user: bool = False) -> bool:
         """
         Verifica la existencia de un usuario en la base de datos basado en el nombre de usuario y el correo electrónico.
@@ -123,7 +247,7 @@ async def is_unique(db_conn: DatabaseConnection, user: User, for_update_user: bo
         Args:
             db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
             user (User): Un objeto que contiene el nombre de usuario y el correo electrónico a verificar.
-            for_update_user (bool): Un indicador que determina si se está verificando para actualizar un usuario 
+            for_update_user (bool): Un indicador que determina si se está verificando para actualizar un usuario
                 existente. Si se indica como 'True', se ajusta la consulta para aceptar al menos una fila, la cual
                 es resultante del usuario existente a actualizar.
 
@@ -132,17 +256,12 @@ async def is_unique(db_conn: DatabaseConnection, user: User, for_update_user: bo
                 cuando `for_update_user` es False, o si existe exactamente un usuario cuando `for_update_user` es True.
                 Devuelve False en caso contrario.
         """
-        try:
-            async with look:
-                await db_conn.connect()
-                result = await db_conn.execute("SELECT * FROM user WHERE username = ? OR email = ?;", 
-                                            [user.username, user.email])
-                
-                return len(result) == 0 if not for_update_user else len(result) == 1
-        finally:
-            await db_conn.close()
-
-async def get_user_by_email(db_conn: DatabaseConnection, email: str, 
+        async with db_conn.lease() as conn:
+            result = await conn.execute(IS_UNIQUE_QUERY, [user.username, user.email])
+
+        return len(result) == 0 if not for_update_user else len(result) == 1
+
+async def get_user_by_email(db_conn: DatabaseConnection, email: str,
                             visible_password: bool = False) -> Union[UserDB, User, None]:
     """
     Obtiene un usuario de la base de datos a partir de su correo electrónico.
@@ -154,21 +273,41 @@ async def get_user_by_email(db_conn: DatabaseConnection, email: str,
     Returns:
         UserDB | None: Un objeto UserDB si se encuentra el usuario, de lo contrario None.
     """
-    try:
-        async with look:
-            await db_conn.connect()
-            result = await db_conn.execute(""" SELECT full_name, username, email, hashed_password
-                                               FROM user WHERE email = ?;""", [email])
-            
-            row = result[0] if len(result) == 1 else None
-            if row:
-                user_data = {"full_name": row[0], "username": row[1], "email": row[2]}
-                if visible_password:
-                    user_data["password"] = row[3]
-                    
-                    return UserDB(**user_data)
-                return User(**user_data)
-            return None
-    finally:
-        await db_conn.close()
-        
\ No newline at end of file
+    if not visible_password:
+        cached = USER_CACHE.get_by_email(email)
+        if cached is not MISS:
+            return cached
+
+    return await _lookup_user(db_conn, "email", email, visible_password)
+
+async def _lookup_user(db_conn: DatabaseConnection, column: str, value: str,
+                       visible_password: bool) -> User | UserDB | None:
+    """
+    Busca un usuario en la base de datos tras un fallo de la caché (o sin consultarla, si se pide la
+    contraseña), compartiendo la consulta con las búsquedas concurrentes equivalentes.
+
+    Args:
+        db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
+        column (str): Columna de búsqueda ('username' o 'email').
+        value (str): Valor buscado.
+        visible_password (bool): Si es True, se incluye la contraseña hasheada.
+
+    Returns:
+        User | UserDB | None: Copia propia del usuario encontrado, o None.
+    """
+    generation = USER_CACHE.generation
+
+    async def fetch() -> User | UserDB | None:
+        async with db_conn.reader((column, value)) as conn:
+            result = await conn.execute(SELECT_USER_QUERIES[column, visible_password], [value])
+
+        if result:
+            user = _row_to_user(result[0])
+            USER_CACHE.set(user, generation)
+            return user
+
+        USER_CACHE.set_missing(column, value, generation)
+        return None
+
+    user = await USER_LOOKUPS.do((column, value, visible_password, generation), fetch)
+    return user.model_copy() if user is not None else None
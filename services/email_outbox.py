@@ -0,0 +1,327 @@
+import json
+import time
+import random
+import asyncio
+import logging
+from utils.env_loader import EnvManager
+from adapters.database_connection import DatabaseConnection
+from services.smtp_transport import SMTPTransport
+
+logger = logging.getLogger(__name__)
+
+# Los remitentes se pasan como un arreglo JSON para que el texto de la consulta no dependa de su cantidad.
+CLAIM_NEXT_EMAIL_QUERY = """UPDATE email_outbox SET status = 'sending', locked_until = ?
+                            WHERE id = (SELECT id FROM email_outbox
+                                        WHERE ((status = 'pending' AND next_attempt_at <= ?)
+                                               OR (status = 'sending' AND locked_until <= ?))
+                                          AND sender_email IN (SELECT value FROM json_each(?))
+                                        ORDER BY next_attempt_at LIMIT 1)
+                            RETURNING id, sender_email, receiver_email, message, attempts;"""
+QUEUED_SENDERS_QUERY = "SELECT DISTINCT sender_email FROM email_outbox WHERE status IN ('pending', 'sending');"
+INSERT_EMAIL_QUERY = """INSERT INTO email_outbox(sender_email, receiver_email, message, status, attempts,
+                                                 next_attempt_at, created_at)
+                        VALUES (?, ?, ?, 'pending', 0, ?, ?) RETURNING id;"""
+DELETE_EMAIL_QUERY = "DELETE FROM email_outbox WHERE id = ?;"
+RESCHEDULE_EMAIL_QUERY = """UPDATE email_outbox SET status = 'pending', attempts = ?, next_attempt_at = ?,
+                                                    last_error = ?
+                            WHERE id = ?;"""
+# El mensaje contiene el código de recuperación: al descartarlo sólo se conserva el error para su diagnóstico.
+DEAD_LETTER_EMAIL_QUERY = """UPDATE email_outbox SET status = 'dead', message = '', attempts = ?, last_error = ?
+                             WHERE id = ?;"""
+
+
+class SenderRateLimiter():
+    """
+    Limitador de envíos por remitente basado en token bucket.
+
+    Cada remitente dispone de `per_minute` envíos por minuto, con ráfagas de hasta `per_minute` envíos.
+
+    Attributes:
+        per_minute (float): Envíos por minuto permitidos a cada remitente. Si es 0, no se limita.
+    """
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.__buckets: dict[str, tuple[float, float]] = {}
+
+    def acquire(self, sender_email: str) -> float:
+        """
+        Consume un envío del remitente si hay disponible.
+
+        Args:
+            sender_email (str): Email del remitente.
+
+        Returns:
+            float: 0 si el envío se autorizó; en caso contrario, segundos hasta que haya un envío disponible.
+        """
+        if self.per_minute <= 0:
+            return 0
+
+        now = time.monotonic()
+        rate = self.per_minute / 60
+        tokens, updated_at = self.__buckets.get(sender_email, (self.per_minute, now))
+        tokens = min(self.per_minute, tokens + (now - updated_at) * rate)
+
+        if tokens < 1:
+            self.__buckets[sender_email] = (tokens, now)
+            return (1 - tokens) / rate
+
+        self.__buckets[sender_email] = (tokens - 1, now)
+        return 0
+
+
+class EmailOutbox():
+    """
+    Cola persistente de emails salientes, almacenada en la tabla `email_outbox` y vaciada por workers asíncronos.
+
+    Encolar un email es un único INSERT, por lo que el request no espera al servidor SMTP. Cada worker
+    reclama el siguiente email vencido con una única sentencia `UPDATE ... RETURNING`, de modo que varios
+    workers (o procesos) nunca envían el mismo email. Un email reclamado por un proceso que se detuvo vuelve
+    a estar disponible al vencer `lock_timeout`.
+
+    Un envío fallido se reintenta con backoff exponencial con jitter; al agotar `max_attempts` el email
+    queda con estado `dead` y su último error, para su revisión, y se borra su mensaje. Los envíos de cada remitente se limitan a
+    `rate_limit_per_minute`: un email que supera el límite se reprograma sin consumir intentos.
+
+    Las contraseñas SMTP nunca se guardan en la base de datos: se conservan en la memoria del proceso que
+    recibió el request, y cada proceso sólo reclama emails de los remitentes cuyas credenciales tiene. Así,
+    con varios procesos, un email lo entrega el proceso que lo encoló (u otro que recibió las credenciales
+    del mismo remitente) sin consumir intentos en los demás. Las credenciales de un remitente se descartan
+    cuando ya no quedan emails suyos en la cola. Si el remitente coincide con `SENDER_EMAIL`, se usa
+    `PASSWORD_EMAIL` del entorno, por lo que sus emails se entregan también tras reiniciar el proceso; los
+    de otros remitentes quedan pendientes hasta que un proceso vuelva a recibir sus credenciales.
+
+    Los mensajes pendientes se guardan completos, por lo que la tabla contiene códigos de recuperación
+    vigentes hasta que cada email se entrega o se descarta; su acceso debe restringirse como el de `user`.
+
+    Attributes:
+        transport (SMTPTransport): Transporte con el que se entregan los emails.
+        workers (int): Cantidad de workers.
+        max_attempts (int): Intentos antes de descartar un email como `dead`.
+        backoff (float): Segundos de espera tras el primer fallo; se duplica en cada intento.
+        max_backoff (float): Espera máxima entre intentos.
+        poll_interval (float): Segundos entre consultas de la cola cuando está vacía.
+        lock_timeout (float): Segundos tras los cuales un email reclamado y no resuelto vuelve a la cola.
+    """
+
+    def __init__(self, transport: SMTPTransport, workers: int | None = None, max_attempts: int | None = None,
+                 backoff: float | None = None, max_backoff: float | None = None,
+                 rate_limit_per_minute: float | None = None, poll_interval: float | None = None,
+                 lock_timeout: float = 300):
+        """
+        Inicializa una nueva instancia de EmailOutbox. Los valores no indicados se obtienen de las variables
+        de entorno `EMAIL_OUTBOX_*`.
+
+        Args:
+            transport (SMTPTransport): Transporte con el que se entregan los emails.
+            workers (int | None): Cantidad de workers.
+            max_attempts (int | None): Intentos antes de descartar un email como `dead`.
+            backoff (float | None): Segundos de espera tras el primer fallo.
+            max_backoff (float | None): Espera máxima entre intentos.
+            rate_limit_per_minute (float | None): Envíos por minuto permitidos a cada remitente; 0 no limita.
+            poll_interval (float | None): Segundos entre consultas de la cola cuando está vacía.
+            lock_timeout (float): Segundos tras los cuales un email reclamado y no resuelto vuelve a la cola.
+        """
+        ENV = EnvManager()
+
+        self.transport = transport
+        self.workers = int(workers or ENV.get("EMAIL_OUTBOX_WORKERS", 2))
+        self.max_attempts = int(max_attempts or ENV.get("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+        self.backoff = float(backoff if backoff is not None else ENV.get("EMAIL_OUTBOX_BACKOFF_SECONDS", 5))
+        self.max_backoff = float(max_backoff if max_backoff is not None else ENV.get("EMAIL_OUTBOX_MAX_BACKOFF_SECONDS", 600))
+        self.poll_interval = float(poll_interval if poll_interval is not None else ENV.get("EMAIL_OUTBOX_POLL_INTERVAL", 1))
+        self.lock_timeout = lock_timeout
+        self.rate_limiter = SenderRateLimiter(
+            float(rate_limit_per_minute if rate_limit_per_minute is not None
+                  else ENV.get("EMAIL_OUTBOX_RATE_LIMIT_PER_MINUTE", 60)))
+
+        self.__credentials: dict[str, str] = {}
+        self.__configured_sender = ENV.get("SENDER_EMAIL") if ENV.get("PASSWORD_EMAIL") else None
+        if self.__configured_sender:
+            self.__credentials[self.__configured_sender] = ENV.get("PASSWORD_EMAIL")
+        # Encolados en curso y último encolado terminado por remitente, para no descartar credenciales
+        # de emails que todavía no son visibles en la cola.
+        self.__enqueuing: dict[str, int] = {}
+        self.__enqueued_at: dict[str, float] = {}
+
+        self.__db_conn: DatabaseConnection | None = None
+        self.__tasks: list[asyncio.Task] = []
+        self.__wakeup: asyncio.Event | None = None
+        self.sent = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self.rate_limited = 0
+
+    async def enqueue(self, db_conn: DatabaseConnection, sender_email: str, password_email: str,
+                      receiver_email: str, message: str) -> int:
+        """
+        Encola un email para su entrega en segundo plano.
+
+        Args:
+            db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
+            sender_email (str): Email del remitente.
+            password_email (str): Contraseña SMTP del remitente. Se conserva sólo en memoria.
+            receiver_email (str): Email del destinatario.
+            message (str): Mensaje MIME completo.
+
+        Returns:
+            int: Identificador del email en la cola.
+        """
+        self.__credentials[sender_email] = password_email
+        self.__enqueuing[sender_email] = self.__enqueuing.get(sender_email, 0) + 1
+        now = time.time()
+        try:
+            async with db_conn.lease() as conn:
+                rows = await conn.execute(INSERT_EMAIL_QUERY, [sender_email, receiver_email, message, now, now])
+        finally:
+            self.__enqueuing[sender_email] -= 1
+            if not self.__enqueuing[sender_email]:
+                del self.__enqueuing[sender_email]
+            self.__enqueued_at[sender_email] = time.monotonic()
+
+        if self.__wakeup is not None:
+            self.__wakeup.set()
+        return rows[0][0]
+
+    def start(self, db_conn: DatabaseConnection) -> None:
+        """
+        Inicia los workers que vacían la cola. Debe llamarse con el event loop en ejecución (por ejemplo,
+        desde el lifespan de la aplicación).
+
+        Args:
+            db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
+        """
+        if self.__tasks:
+            return
+
+        self.__db_conn = db_conn
+        self.__wakeup = asyncio.Event()
+        self.__tasks = [asyncio.create_task(self.__work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """
+        Detiene los workers. Los emails en curso que no llegaron a resolverse vuelven a la cola al vencer
+        `lock_timeout`.
+        """
+        for task in self.__tasks:
+            task.cancel()
+        await asyncio.gather(*self.__tasks, return_exceptions= True)
+        self.__tasks = []
+        self.__wakeup = None
+
+    async def deliver_next(self, db_conn: DatabaseConnection) -> bool:
+        """
+        Reclama y procesa el siguiente email vencido de la cola.
+
+        Args:
+            db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
+
+        Returns:
+            bool: True si se procesó un email; False si no había emails vencidos.
+        """
+        if not self.__credentials:
+            return False
+
+        now = time.time()
+        async with db_conn.lease() as conn:
+            rows = await conn.execute(CLAIM_NEXT_EMAIL_QUERY, [now + self.lock_timeout, now, now,
+                                                               json.dumps(list(self.__credentials))])
+        if not rows:
+            return False
+
+        email_id, sender_email, receiver_email, message, attempts = rows[0]
+
+        wait = self.rate_limiter.acquire(sender_email)
+        if wait:
+            self.rate_limited += 1
+            await self.__update(db_conn, RESCHEDULE_EMAIL_QUERY, [attempts, time.time() + wait, None, email_id])
+            return True
+
+        password_email = self.__credentials.get(sender_email)
+        if password_email is None:
+            # Las credenciales se descartaron tras reclamarlo: vuelve a la cola sin consumir un intento.
+            await self.__update(db_conn, RESCHEDULE_EMAIL_QUERY, [attempts, time.time(), None, email_id])
+            return True
+
+        try:
+            await self.transport.send(sender_email, password_email, receiver_email, message)
+        except Exception as error:
+            await self.__fail(db_conn, email_id, attempts + 1, str(error))
+            return True
+
+        await self.__update(db_conn, DELETE_EMAIL_QUERY, [email_id])
+        self.sent += 1
+        return True
+
+    async def discard_unused_credentials(self, db_conn: DatabaseConnection) -> int:
+        """
+        Descarta de la memoria las contraseñas de los remitentes que ya no tienen emails en la cola.
+
+        Args:
+            db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
+
+        Returns:
+            int: Cantidad de credenciales descartadas.
+        """
+        if not any(sender != self.__configured_sender for sender in self.__credentials):
+            return 0
+
+        started_at = time.monotonic()
+        async with db_conn.lease() as conn:
+            queued = {row[0] for row in await conn.execute(QUEUED_SENDERS_QUERY, [])}
+
+        discarded = [sender for sender in self.__credentials
+                     if sender != self.__configured_sender and sender not in queued
+                     and sender not in self.__enqueuing and self.__enqueued_at.get(sender, 0) < started_at]
+        for sender in discarded:
+            del self.__credentials[sender]
+            self.__enqueued_at.pop(sender, None)
+        return len(discarded)
+
+    def stats(self) -> dict:
+        """
+        Devuelve los contadores de la cola desde el inicio del proceso.
+
+        Returns:
+            dict: Emails enviados, reintentados, descartados y reprogramados por el límite de envíos.
+        """
+        return {
+            "sent": self.sent,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "rate_limited": self.rate_limited
+        }
+
+    async def __fail(self, db_conn: DatabaseConnection, email_id: int, attempts: int, error: str) -> None:
+        if attempts >= self.max_attempts:
+            self.dead_lettered += 1
+            logger.error("Email %d descartado tras %d intentos: %s", email_id, attempts, error)
+            await self.__update(db_conn, DEAD_LETTER_EMAIL_QUERY, [attempts, error, email_id])
+            return
+
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1)) * random.uniform(0.5, 1)
+        self.retried += 1
+        logger.warning("Email %d fallido (intento %d), se reintenta en %.1f s: %s", email_id, attempts, delay, error)
+        await self.__update(db_conn, RESCHEDULE_EMAIL_QUERY, [attempts, time.time() + delay, error, email_id])
+
+    async def __update(self, db_conn: DatabaseConnection, query: str, params: list) -> None:
+        async with db_conn.lease() as conn:
+            await conn.execute(query, params)
+
+    async def __work(self) -> None:
+        while True:
+            # La señal se limpia antes de consultar la cola para no perder los emails encolados mientras tanto.
+            self.__wakeup.clear()
+            try:
+                if await self.deliver_next(self.__db_conn):
+                    continue
+                await self.discard_unused_credentials(self.__db_conn)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Error al procesar la cola de emails.")
+
+            try:
+                await asyncio.wait_for(self.__wakeup.wait(), timeout= self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
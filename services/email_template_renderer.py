@@ -0,0 +1,144 @@
+import re
+import html
+import uuid
+import hashlib
+from collections import OrderedDict
+from bs4 import BeautifulSoup
+
+USERNAME_SLOT_ID = "username-to-recovering-password"
+CODE_SLOT_ID = "password-recovery-code"
+
+
+class CompiledTemplate():
+    """
+    Plantilla de email precompilada: el HTML queda dividido en segmentos fijos alrededor de los huecos del
+    username y del código, de modo que renderizar consiste sólo en unir cadenas.
+
+    Attributes:
+        segments (tuple[str, ...]): Fragmentos fijos del HTML; hay uno más que huecos.
+        slots (tuple[str, ...]): Identificador del hueco que sigue a cada segmento, en orden de aparición.
+    """
+
+    __slots__ = ("segments", "slots")
+
+    def __init__(self, segments: tuple[str, ...], slots: tuple[str, ...]):
+        self.segments = segments
+        self.slots = slots
+
+    def render(self, username: str, code: str) -> str:
+        """
+        Completa la plantilla con el username y el código, escapados como texto HTML.
+
+        Args:
+            username (str): Nombre de usuario.
+            code (str): Código de recuperación.
+
+        Returns:
+            str: HTML del email.
+        """
+        values = {USERNAME_SLOT_ID: html.escape(username, quote= False), CODE_SLOT_ID: html.escape(code, quote= False)}
+        parts = [self.segments[0]]
+        for slot, segment in zip(self.slots, self.segments[1:]):
+            parts.append(values[slot])
+            parts.append(segment)
+        return "".join(parts)
+
+
+class EmailTemplateRenderer():
+    """
+    Renderizador de plantillas de email que analiza cada plantilla una única vez.
+
+    La primera vez que se usa una plantilla se analiza con BeautifulSoup, se ubican los elementos con id
+    `username-to-recovering-password` y `password-recovery-code` y se reemplaza su contenido por marcadores
+    para dividir el HTML serializado en segmentos. Las plantillas compiladas se guardan en una caché LRU
+    indexada por el SHA-256 de su contenido. Las plantillas sin alguno de los dos elementos se resuelven
+    con la plantilla por defecto.
+
+    Attributes:
+        max_size (int): Cantidad máxima de plantillas personalizadas en caché.
+    """
+
+    def __init__(self, default_template: str, max_size: int = 128):
+        """
+        Inicializa una nueva instancia de EmailTemplateRenderer.
+
+        Args:
+            default_template (str): HTML de la plantilla por defecto; debe contener ambos elementos.
+            max_size (int): Cantidad máxima de plantillas personalizadas en caché.
+
+        Raises:
+            ValueError: Si la plantilla por defecto no contiene los elementos del username y del código.
+        """
+        self.max_size = max(1, max_size)
+        self.__default = self.compile(default_template)
+        if self.__default is None:
+            raise ValueError("La plantilla por defecto no contiene los elementos del username y del código.")
+        self.__cache: OrderedDict[bytes, CompiledTemplate | None] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, template_html: str | None, username: str, code: str) -> str:
+        """
+        Renderiza una plantilla, compilándola sólo la primera vez que se usa.
+
+        Args:
+            template_html (str | None): HTML de la plantilla. Si es None, se usa la plantilla por defecto.
+            username (str): Nombre de usuario.
+            code (str): Código de recuperación.
+
+        Returns:
+            str: HTML del email.
+        """
+        return self.get(template_html).render(username= username, code= code)
+
+    def get(self, template_html: str | None) -> CompiledTemplate:
+        """
+        Obtiene la plantilla compilada correspondiente a un HTML.
+
+        Args:
+            template_html (str | None): HTML de la plantilla. Si es None, se usa la plantilla por defecto.
+
+        Returns:
+            CompiledTemplate: Plantilla compilada, o la plantilla por defecto si la indicada no tiene
+                los elementos del username y del código.
+        """
+        if template_html is None:
+            return self.__default
+
+        key = hashlib.sha256(template_html.encode()).digest()
+        if key in self.__cache:
+            self.hits += 1
+            self.__cache.move_to_end(key)
+        else:
+            self.misses += 1
+            self.__cache[key] = self.compile(template_html)
+            if len(self.__cache) > self.max_size:
+                self.__cache.popitem(last= False)
+
+        return self.__cache[key] or self.__default
+
+    @staticmethod
+    def compile(template_html: str) -> CompiledTemplate | None:
+        """
+        Compila una plantilla dividiéndola en segmentos alrededor de los elementos del username y del código.
+
+        Args:
+            template_html (str): HTML de la plantilla.
+
+        Returns:
+            CompiledTemplate | None: Plantilla compilada, o None si falta alguno de los dos elementos.
+        """
+        parser = BeautifulSoup(template_html, "html.parser")
+        elements = {slot: parser.find(id= slot) for slot in (USERNAME_SLOT_ID, CODE_SLOT_ID)}
+        if None in elements.values():
+            return None
+
+        # Los marcadores son únicos por compilación para no confundirse con texto de la propia plantilla.
+        nonce = uuid.uuid4().hex
+        markers = {f"{nonce}{slot}": slot for slot in elements}
+        for marker, slot in markers.items():
+            elements[slot].string = marker
+
+        parts = re.split(f"({'|'.join(map(re.escape, markers))})", str(parser))
+        return CompiledTemplate(segments= tuple(parts[0::2]),
+                                slots= tuple(markers[marker] for marker in parts[1::2]))
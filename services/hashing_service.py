@@ -1,4 +1,22 @@
+import os
+import time
+import asyncio
+import threading
 import bcrypt as bc
+from typing import Callable, TypeVar
+from utils.env_loader import EnvManager
+from utils.metrics import MetricsRegistry
+from utils.sampling_profiler import profiled_call
+from concurrent.futures import ThreadPoolExecutor
+
+T = TypeVar("T")
+
+METRICS = MetricsRegistry()
+METRICS_ENABLED = str(EnvManager().get("METRICS_ENABLED", "false")).lower() == "true"
+BCRYPT_DURATION = METRICS.histogram("bcrypt_duration_seconds", "Duración de las operaciones de bcrypt.",
+                                    ("operation",), buckets= (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0))
+BCRYPT_QUEUE_WAIT = METRICS.histogram("bcrypt_queue_wait_seconds",
+                                      "Espera de las operaciones de bcrypt hasta obtener un hilo del pool.")
 
 def hashed_password(password: str) -> str:
     """
@@ -26,3 +44,112 @@ def validate_password(password: str, hashed_password: str) -> bool:
         bool: True si la contraseña en texto plano coincide con la contraseña hasheada, False en caso contrario.
     """
     return bc.checkpw(password=password.encode(), hashed_password=hashed_password.encode())
+
+
+class HashingWorkerPool():
+    """
+    Pool acotado de hilos dedicado a las operaciones de bcrypt.
+
+    bcrypt libera el GIL mientras calcula el hash, por lo que un pool de hilos permite aprovechar varios
+    núcleos sin bloquear el event loop. Implementa el patrón Singleton para compartir el pool en todo el proceso.
+    El tamaño se configura con la variable de entorno `HASHING_POOL_MAX_WORKERS` (por defecto, la cantidad de CPUs).
+
+    Attributes:
+        max_workers (int): Cantidad máxima de hilos que ejecutan hashes en simultáneo.
+    """
+    __instance = None
+
+    def __new__(cls):
+        if not cls.__instance:
+            cls.__instance = super(HashingWorkerPool, cls).__new__(cls)
+        return cls.__instance
+
+    def __init__(self):
+        if not hasattr(self, "_initialized"):
+            self._initialized = True
+            self.max_workers = int(EnvManager().get("HASHING_POOL_MAX_WORKERS", os.cpu_count() or 1))
+            self.__executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+            self.__lock = threading.Lock()
+            self.__pending = 0
+            self.__active = 0
+            self.__completed = 0
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Ejecuta `func` en el pool y espera su resultado sin bloquear el event loop.
+
+        Args:
+            func (Callable[..., T]): Función bloqueante a ejecutar.
+            *args: Argumentos posicionales para `func`.
+
+        Returns:
+            T: Resultado de `func`.
+        """
+        loop = asyncio.get_running_loop()
+        with self.__lock:
+            self.__pending += 1
+        try:
+            return await loop.run_in_executor(self.__executor, profiled_call(self.__run), time.perf_counter(), func, *args)
+        finally:
+            with self.__lock:
+                self.__pending -= 1
+                self.__completed += 1
+
+    def stats(self) -> dict:
+        """
+        Devuelve las métricas de saturación del pool.
+
+        Returns:
+            dict: Hilos máximos, tareas en ejecución, tareas en cola y tareas completadas.
+        """
+        with self.__lock:
+            return {
+                "max_workers": self.max_workers,
+                "active": self.__active,
+                "queued": max(self.__pending - self.__active, 0),
+                "completed": self.__completed
+            }
+
+    def __run(self, enqueued_at: float, func: Callable[..., T], *args) -> T:
+        start = time.perf_counter()
+        if METRICS_ENABLED:
+            BCRYPT_QUEUE_WAIT.observe(start - enqueued_at)
+        with self.__lock:
+            self.__active += 1
+        try:
+            return func(*args)
+        finally:
+            if METRICS_ENABLED:
+                BCRYPT_DURATION.observe(time.perf_counter() - start, func.__name__)
+            with self.__lock:
+                self.__active -= 1
+
+
+METRICS.gauge("bcrypt_pool_tasks", "Operaciones de bcrypt en ejecución y en cola.", ("state",),
+              callback= lambda: {(state,): HashingWorkerPool().stats()[state] for state in ("active", "queued")})
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Versión asíncrona de `hashed_password`, ejecutada en el `HashingWorkerPool`.
+
+    Args:
+        password (str): La contraseña en texto plano que se desea hashear.
+
+    Returns:
+        str: La contraseña hasheada en formato de cadena.
+    """
+    return await HashingWorkerPool().run(hashed_password, password)
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    """
+    Versión asíncrona de `validate_password`, ejecutada en el `HashingWorkerPool`.
+
+    Args:
+        password (str): La contraseña en texto plano que se desea validar.
+        hashed_password (str): La contraseña hasheada con la que se desea comparar.
+
+    Returns:
+        bool: True si la contraseña en texto plano coincide con la contraseña hasheada, False en caso contrario.
+    """
+    return await HashingWorkerPool().run(validate_password, password, hashed_password)
@@ -0,0 +1,126 @@
+import asyncio
+from typing import NamedTuple
+from datetime import datetime, timezone
+from adapters.database_connection import DatabaseConnection
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    statements: tuple[str, ...]
+
+
+#========================================MIGRATIONS================================================#
+# Cada migración debe ser idempotente: varios procesos pueden ejecutarlas en simultáneo al iniciar.
+# Las migraciones ya publicadas no se modifican; los cambios de esquema se agregan como una versión nueva.
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(
+        version= 1,
+        description= "Tabla de usuarios",
+        statements= ("""CREATE TABLE IF NOT EXISTS user (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            full_name TEXT NOT NULL,
+                            username TEXT UNIQUE NOT NULL,
+                            email TEXT UNIQUE NOT NULL,
+                            hashed_password TEXT NOT NULL
+                        );""",)
+    ),
+    Migration(
+        version= 2,
+        description= "Índices únicos sobre user.username y user.email",
+        statements= ("CREATE UNIQUE INDEX IF NOT EXISTS idx_user_username ON user(username);",
+                     "CREATE UNIQUE INDEX IF NOT EXISTS idx_user_email ON user(email);")
+    ),
+    Migration(
+        version= 3,
+        description= "Tabla de códigos de recuperación de contraseña",
+        statements= ("""CREATE TABLE IF NOT EXISTS recovery_code (
+                            email TEXT PRIMARY KEY,
+                            code TEXT NOT NULL,
+                            expires_at REAL NOT NULL
+                        );""",
+                     "CREATE INDEX IF NOT EXISTS idx_recovery_code_expires_at ON recovery_code(expires_at);")
+    ),
+    Migration(
+        version= 4,
+        description= "Cola persistente de emails salientes",
+        statements= ("""CREATE TABLE IF NOT EXISTS email_outbox (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            sender_email TEXT NOT NULL,
+                            receiver_email TEXT NOT NULL,
+                            message TEXT NOT NULL,
+                            status TEXT NOT NULL,
+                            attempts INTEGER NOT NULL DEFAULT 0,
+                            next_attempt_at REAL NOT NULL,
+                            locked_until REAL,
+                            last_error TEXT,
+                            created_at REAL NOT NULL
+                        );""",
+                     "CREATE INDEX IF NOT EXISTS idx_email_outbox_status_next_attempt ON email_outbox(status, next_attempt_at);")
+    ),
+)
+
+#========================================SERVICES================================================#
+async def get_applied_versions(db_conn: DatabaseConnection) -> set[int]:
+    """
+    Obtiene las versiones de migración ya aplicadas, creando la tabla de control si no existe.
+
+    Args:
+        db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
+
+    Returns:
+        set[int]: Versiones registradas en la tabla `schema_migrations`.
+    """
+    async with db_conn.lease() as conn:
+        await conn.execute("""CREATE TABLE IF NOT EXISTS schema_migrations (
+                                  version INTEGER PRIMARY KEY,
+                                  description TEXT NOT NULL,
+                                  applied_at TEXT NOT NULL
+                              );""", [])
+        rows = await conn.execute("SELECT version FROM schema_migrations;", [])
+
+    return {row[0] for row in rows}
+
+async def run_migrations(db_conn: DatabaseConnection) -> list[int]:
+    """
+    Aplica, en orden, las migraciones pendientes y registra cada versión aplicada. Cada migración se
+    aplica junto con su registro de forma atómica.
+
+    Args:
+        db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
+
+    Returns:
+        list[int]: Versiones aplicadas en esta ejecución.
+    """
+    applied = await get_applied_versions(db_conn)
+    newly_applied = []
+
+    async with db_conn.lease() as conn:
+        for migration in MIGRATIONS:
+            if migration.version in applied:
+                continue
+
+            # Las sentencias de la migración y su registro se aplican de forma atómica en un único viaje.
+            await conn.batch([
+                *((statement, []) for statement in migration.statements),
+                ("INSERT OR IGNORE INTO schema_migrations(version, description, applied_at) VALUES (?, ?, ?);",
+                 [migration.version, migration.description, datetime.now(timezone.utc).isoformat()])
+            ])
+            newly_applied.append(migration.version)
+
+    return newly_applied
+
+
+# Ejecución manual: python -m services.migration_service
+if __name__ == "__main__":
+    from connections.db_connection import db_conn
+
+    async def main():
+        connection = db_conn()
+        try:
+            versions = await run_migrations(connection)
+            print(f"Migraciones aplicadas: {versions}" if versions else "El esquema está actualizado.")
+        finally:
+            await connection.close()
+
+    asyncio.run(main())
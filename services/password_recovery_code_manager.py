@@ -1,52 +1,110 @@
+import asyncio
+import logging
 from utils.env_loader import EnvManager
 from models.recovery_code import RecoveryCode
-from errors.recovery_code_errors import ExpiredCodeError
+from services.recovery_code_store import RecoveryCodeStore, MemoryRecoveryCodeStore, DatabaseRecoveryCodeStore
+
+
+def create_recovery_code_store() -> RecoveryCodeStore:
+    """
+    Construye el almacén de códigos indicado por la variable de entorno `RECOVERY_CODE_STORE`:
+    `memory` (por defecto, local al proceso) o `database` (compartido entre procesos).
+
+    Returns:
+        RecoveryCodeStore: Almacén de códigos de recuperación.
+
+    Raises:
+        ValueError: Si el almacén configurado no existe.
+    """
+    kind = str(EnvManager().get("RECOVERY_CODE_STORE", "memory")).lower()
+
+    if kind == "memory":
+        return MemoryRecoveryCodeStore(max_entries= int(EnvManager().get("RECOVERY_CODE_MAX_ENTRIES", 10000)))
+    if kind == "database":
+        from connections.db_connection import db_conn
+        return DatabaseRecoveryCodeStore(db_conn())
+    raise ValueError(f"Almacén de códigos desconocido: '{kind}'. Valores admitidos: 'memory', 'database'.")
+
+
+logger = logging.getLogger(__name__)
 
 
 class PasswordRecoveryCodeManager():
     __instance = None
     
     
-    def __new__(cls):
+    def __new__(cls, *args, **kwargs):
         if not cls.__instance:
             cls.__instance = super(PasswordRecoveryCodeManager, cls).__new__(cls)
         return cls.__instance
     
-    def __init__(self):
+    def __init__(self, store: RecoveryCodeStore | None = None):
         if not hasattr(self, "_initialized"):
             self._initialized = True
-            self.users_codes: dict[str, RecoveryCode] = {}
+            self.store = store if store is not None else create_recovery_code_store()
+            self.__sweeper: asyncio.Task | None = None
             
             self.min_code_lifetme = int(EnvManager().get("CODE_EXPIRE_MINUTES"))
         
         
-    def generate_code(self, user_email: str) -> RecoveryCode:
-        code = RecoveryCode(minutes_of_code_lifetime= self.min_code_lifetme)
-        self.save_code(user_email= user_email, code= code)
-        return code
+    async def generate_code(self, user_email: str, code: str | None = None) -> RecoveryCode:
+        """
+        Genera y guarda el código de recuperación de un usuario.
+
+        Args:
+            user_email (str): Email del usuario.
+            code (str | None): Código a utilizar. Si no se indica, se genera uno aleatorio.
+
+        Returns:
+            RecoveryCode: Código guardado.
+        """
+        recovery_code = RecoveryCode(minutes_of_code_lifetime= self.min_code_lifetme, code= code)
+        await self.save_code(user_email= user_email, code= recovery_code)
+        return recovery_code
     
-    def save_code(self, user_email: str, code: RecoveryCode) -> None:
-        self.users_codes[user_email] = code
+    async def save_code(self, user_email: str, code: RecoveryCode) -> None:
+        await self.store.save(email= user_email, code= code.code, expires_at= code.expires_at)
         
-    def validate_code(self, code: str, email: str) -> bool:
+    async def validate_code(self, code: str, email: str) -> bool:
         """
         La función valida el código de recuperación de contraseña para un usuario específico.
-        Si el código es válido, se elimina de la lista de códigos guardados.
+        Si el código es válido, se consume de forma atómica y no puede volver a utilizarse.
         
         raises: ExpiredCodeError si el código ha expirado.
         """
-        saved_code = self.users_codes.get(email)
-        
-        if saved_code is None:
-            return False
-        
-        if not saved_code.is_valid(): 
-            raise ExpiredCodeError("Código de recuperación de contraseña expirado.")
+        return await self.store.consume(email= email, code= code)
 
-        
-        validated = code == saved_code.code
-    
-        if validated:
-            self.users_codes.pop(email, None)
-        
-        return validated
\ No newline at end of file
+    def start_sweeper(self, interval: float) -> None:
+        """
+        Inicia una tarea en segundo plano que elimina los códigos vencidos cada `interval` segundos.
+        Debe llamarse con el event loop en ejecución (por ejemplo, desde el lifespan de la aplicación).
+
+        Args:
+            interval (float): Segundos entre depuraciones.
+        """
+        if self.__sweeper is None or self.__sweeper.done():
+            self.__sweeper = asyncio.create_task(self.__sweep_periodically(interval))
+
+    async def stop_sweeper(self) -> None:
+        """
+        Detiene la tarea de depuración de códigos vencidos, si está en ejecución.
+        """
+        if self.__sweeper is None:
+            return
+
+        self.__sweeper.cancel()
+        try:
+            await self.__sweeper
+        except asyncio.CancelledError:
+            pass
+        self.__sweeper = None
+
+    async def __sweep_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                purged = await self.store.purge_expired()
+                if purged:
+                    logger.debug("Códigos de recuperación vencidos eliminados: %d", purged)
+            except Exception:
+                logger.exception("Error al eliminar los códigos de recuperación vencidos.")
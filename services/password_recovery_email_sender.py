@@ -1,42 +1,32 @@
 import os
-import smtplib
+import functools
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from bs4 import BeautifulSoup
 from errors.send_email_error import SendEmailError
 from models.recovery_code import RecoveryCode
-from services.password_recovery_code_manager import PasswordRecoveryCodeManager
 from utils.env_loader import EnvManager
+from adapters.database_connection import DatabaseConnection
+from services.smtp_transport import SMTPTransport
+from services.email_outbox import EmailOutbox
+from services.email_template_renderer import EmailTemplateRenderer
+
+# Transporte compartido: las sesiones SMTP autenticadas se reutilizan entre requests.
+SMTP_TRANSPORT = SMTPTransport()
+# Cola persistente de emails; sus workers se inician en el lifespan de la aplicación.
+EMAIL_OUTBOX = EmailOutbox(transport= SMTP_TRANSPORT)
 
 class PasswordRecoveryEmailSender():
     def _set_code_in_html(self, html: str | None, code: str, username: str) -> str:
         
-        if html is None: 
-            html = self.load_default_template()
-                
-        parser = BeautifulSoup(html, "html.parser")
-        html_username = parser.find(id= "username-to-recovering-password")
-        html_code = parser.find(id= "password-recovery-code")
-        
-        if html_username is None or html_code is None:
-            html = self.load_default_template()
-            parser = BeautifulSoup(html, "html.parser")
-            html_username = parser.find(id="username-to-recovering-password")
-            html_code = parser.find(id="password-recovery-code")
-        
-        if html_username:
-            html_username.string = username
-        if html_code:
-            html_code.string = code
-
-        return str(parser)
+        # La plantilla se analiza una única vez; luego cada email sólo une cadenas.
+        return _template_renderer().render(template_html= html, username= username, code= code)
     
-    def send_email_recovery_password(self, username:str, sender_email: str, password_email: str,
-                                    receiver_email: str, email_template_html: str = None, custom_code: str = None) -> None:
+    def build_message(self, username: str, sender_email: str, receiver_email: str,
+                      email_template_html: str = None, custom_code: str = None) -> str:
         
-        if custom_code: 
-            code = RecoveryCode(code= custom_code, minutes_of_code_lifetime= int(EnvManager().get("CODE_EXPIRE_MINUTES")))
-            PasswordRecoveryCodeManager().save_code(user_email= receiver_email, code= code)
+        # El envío no guarda el código: quien lo solicita debe haberlo guardado con PasswordRecoveryCodeManager.
+        if custom_code is None:
+            custom_code = RecoveryCode(minutes_of_code_lifetime= int(EnvManager().get("CODE_EXPIRE_MINUTES"))).code
             
         message = MIMEMultipart("alternative")
         message["Subject"] = "Restablecer contraseña"
@@ -44,36 +34,62 @@ class PasswordRecoveryEmailSender():
         message["To"] = receiver_email
     
         html = self._set_code_in_html(html= email_template_html,
-                                      code= self.build_code(receiver_email).code if custom_code is None else custom_code,
+                                      code= custom_code,
                                       username= username) 
         
         part = MIMEText(html, "html")
         message.attach(part)
         
+        return message.as_string()
+    
+    def send_email_recovery_password(self, username:str, sender_email: str, password_email: str,
+                                    receiver_email: str, email_template_html: str = None, custom_code: str = None) -> None:
+        
+        message = self.build_message(username= username,
+                                     sender_email= sender_email,
+                                     receiver_email= receiver_email,
+                                     email_template_html= email_template_html,
+                                     custom_code= custom_code)
         try:
-            with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-                server.login(sender_email, password_email)
-                server.sendmail(sender_email, receiver_email, message.as_string())
+            # Misma configuración de servidor y TLS (`SMTP_USE_SSL`) que el transporte del outbox.
+            with SMTP_TRANSPORT.open_session(sender_email, password_email) as server:
+                server.sendmail(sender_email, receiver_email, message)
                 
         except Exception as E:
             raise SendEmailError(str(E))
+    
+    async def enqueue_email_recovery_password(self, db_conn: DatabaseConnection, username:str, sender_email: str,
+                                              password_email: str, receiver_email: str,
+                                              email_template_html: str = None, custom_code: str = None) -> int:
         
-    def build_code(self, user_email: str) -> RecoveryCode:
-        p = PasswordRecoveryCodeManager()
-        code = p.generate_code(user_email= user_email)
+        # El mensaje se arma antes de encolarlo para que los errores de plantilla lleguen al request.
+        message = self.build_message(username= username,
+                                     sender_email= sender_email,
+                                     receiver_email= receiver_email,
+                                     email_template_html= email_template_html,
+                                     custom_code= custom_code)
+        return await EMAIL_OUTBOX.enqueue(db_conn, sender_email, password_email, receiver_email, message)
         
-        return code
-    
     def load_default_template(self) -> str:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        relative_path = os.path.join("..", "templates", "default_email_template.html")
-        template_path = os.path.abspath(os.path.join(current_dir, relative_path))
+        return _read_default_template()
 
-        if not os.path.exists(template_path):
-            raise FileNotFoundError(f"""Plantilla no encontrada, relative path:{relative_path}, 
-                                    absolute path: {template_path}""")
-            
-        with open(template_path, encoding="utf-8") as file:
-            html = file.read()
-            
-        return html
\ No newline at end of file
+
+@functools.lru_cache(maxsize= 1)
+def _read_default_template() -> str:
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    relative_path = os.path.join("..", "templates", "default_email_template.html")
+    template_path = os.path.abspath(os.path.join(current_dir, relative_path))
+
+    if not os.path.exists(template_path):
+        raise FileNotFoundError(f"""Plantilla no encontrada, relative path:{relative_path}, 
+                                absolute path: {template_path}""")
+        
+    with open(template_path, encoding="utf-8") as file:
+        html = file.read()
+        
+    return html
+
+@functools.lru_cache(maxsize= 1)
+def _template_renderer() -> EmailTemplateRenderer:
+    return EmailTemplateRenderer(default_template= _read_default_template(),
+                                 max_size= int(EnvManager().get("EMAIL_TEMPLATE_CACHE_SIZE", 128)))
@@ -0,0 +1,235 @@
+import time
+import heapq
+from collections import OrderedDict
+from abc import ABC, abstractmethod
+from adapters.database_connection import DatabaseConnection
+from models.recovery_code import RecoveryCode
+from errors.recovery_code_errors import ExpiredCodeError
+
+
+class RecoveryCodeStore(ABC):
+    """
+    Interfaz de almacenamiento de códigos de recuperación de contraseña.
+
+    Cada email tiene a lo sumo un código vigente. Las implementaciones aplican la expiración por sí mismas
+    y verifican y consumen un código en una única operación atómica, de modo que un código no puede
+    validarse dos veces aunque lleguen solicitudes concurrentes (o a procesos distintos, si el almacén
+    es compartido).
+    """
+
+    @abstractmethod
+    async def save(self, email: str, code: str, expires_at: float) -> None:
+        """
+        Guarda el código de un email, reemplazando el anterior si existía.
+
+        Args:
+            email (str): Email del usuario.
+            code (str): Código de recuperación.
+            expires_at (float): Instante (epoch en segundos) en el que el código expira.
+        """
+        pass
+
+    @abstractmethod
+    async def consume(self, email: str, code: str) -> bool:
+        """
+        Verifica el código de un email y, si coincide, lo elimina.
+
+        Args:
+            email (str): Email del usuario.
+            code (str): Código ingresado.
+
+        Returns:
+            bool: True si el código coincidía y fue consumido; False si no hay código o no coincide.
+
+        Raises:
+            ExpiredCodeError: Si el código ya expiró. Según el almacén, puede informarse sólo cuando el
+                código ingresado coincide.
+        """
+        pass
+
+    async def purge_expired(self) -> int:
+        """
+        Elimina los códigos vencidos. Por defecto no realiza ninguna acción.
+
+        Returns:
+            int: Cantidad de códigos eliminados.
+        """
+        return 0
+
+
+class MemoryRecoveryCodeStore(RecoveryCodeStore):
+    """
+    Almacén de códigos en la memoria del proceso.
+
+    Los códigos se eliminan en orden de expiración mediante un heap, por lo que depurar los vencidos
+    cuesta O(vencidos · log n). Además, la cantidad de códigos está acotada por `max_entries`: al
+    superarse, se descarta el código usado menos recientemente. Sólo es adecuado cuando la aplicación
+    se ejecuta en un único proceso.
+
+    Attributes:
+        max_entries (int): Cantidad máxima de códigos almacenados.
+        evictions (int): Códigos descartados por superar `max_entries`.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        """
+        Inicializa una nueva instancia de MemoryRecoveryCodeStore.
+
+        Args:
+            max_entries (int): Cantidad máxima de códigos almacenados.
+        """
+        self.max_entries = max(1, max_entries)
+        self.evictions = 0
+        self.__codes: OrderedDict[str, RecoveryCode] = OrderedDict()
+        self.__expirations: list[tuple[float, str]] = []
+
+    async def save(self, email: str, code: str, expires_at: float) -> None:
+        """
+        Guarda el código de un email, reemplazando el anterior si existía.
+
+        Args:
+            email (str): Email del usuario.
+            code (str): Código de recuperación.
+            expires_at (float): Instante (epoch en segundos) en el que el código expira.
+        """
+        self.__purge(time.time())
+        self.__codes[email] = RecoveryCode.from_expiration(code= code, expires_at= expires_at)
+        self.__codes.move_to_end(email)
+        heapq.heappush(self.__expirations, (expires_at, email))
+
+        while len(self.__codes) > self.max_entries:
+            self.__codes.popitem(last= False)
+            self.evictions += 1
+
+        # Las entradas del heap de códigos reemplazados o descartados se compactan si predominan.
+        if len(self.__expirations) > 2 * len(self.__codes) + 64:
+            self.__expirations = [(saved.expires_at, saved_email) for saved_email, saved in self.__codes.items()]
+            heapq.heapify(self.__expirations)
+
+    async def consume(self, email: str, code: str) -> bool:
+        """
+        Verifica el código de un email y, si coincide, lo elimina. La operación no cede el event loop,
+        por lo que es atómica respecto de otras solicitudes del proceso.
+
+        Args:
+            email (str): Email del usuario.
+            code (str): Código ingresado.
+
+        Returns:
+            bool: True si el código coincidía y fue consumido; False si no hay código o no coincide.
+
+        Raises:
+            ExpiredCodeError: Si el código coincidía pero ya había expirado, igual que en
+                `DatabaseRecoveryCodeStore`.
+        """
+        saved = self.__codes.get(email)
+        if saved is None:
+            return False
+
+        if code != saved.code:
+            self.__codes.move_to_end(email)
+            return False
+
+        del self.__codes[email]
+        if not saved.is_valid():
+            raise ExpiredCodeError("Código de recuperación de contraseña expirado.")
+        return True
+
+    async def purge_expired(self) -> int:
+        """
+        Elimina los códigos vencidos.
+
+        Returns:
+            int: Cantidad de códigos eliminados.
+        """
+        return self.__purge(time.time())
+
+    def __purge(self, now: float) -> int:
+        purged = 0
+        while self.__expirations and self.__expirations[0][0] <= now:
+            expires_at, email = heapq.heappop(self.__expirations)
+            saved = self.__codes.get(email)
+            # Una entrada del heap puede corresponder a un código ya reemplazado, consumido o descartado.
+            if saved is not None and saved.expires_at == expires_at:
+                del self.__codes[email]
+                purged += 1
+
+        return purged
+
+    def __len__(self) -> int:
+        return len(self.__codes)
+
+
+class DatabaseRecoveryCodeStore(RecoveryCodeStore):
+    """
+    Almacén de códigos en la tabla `recovery_code` de la base de datos, compartido por todos los procesos.
+
+    El consumo se resuelve con una única sentencia `DELETE ... RETURNING`, por lo que sólo una solicitud
+    puede consumir cada código. Los códigos vencidos se eliminan al guardar uno nuevo.
+
+    Attributes:
+        db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
+    """
+
+    def __init__(self, db_conn: DatabaseConnection):
+        """
+        Inicializa una nueva instancia de DatabaseRecoveryCodeStore.
+
+        Args:
+            db_conn (DatabaseConnection): Cliente de conexión a la base de datos.
+        """
+        self.db_conn = db_conn
+
+    async def save(self, email: str, code: str, expires_at: float) -> None:
+        """
+        Guarda el código de un email, reemplazando el anterior si existía.
+
+        Args:
+            email (str): Email del usuario.
+            code (str): Código de recuperación.
+            expires_at (float): Instante (epoch en segundos) en el que el código expira.
+        """
+        async with self.db_conn.lease() as conn:
+            await conn.batch([
+                ("DELETE FROM recovery_code WHERE expires_at <= ?;", [time.time()]),
+                ("""INSERT INTO recovery_code(email, code, expires_at) VALUES (?, ?, ?)
+                 ON CONFLICT(email) DO UPDATE SET code = excluded.code, expires_at = excluded.expires_at;""",
+                 [email, code, expires_at])
+            ])
+
+    async def consume(self, email: str, code: str) -> bool:
+        """
+        Verifica el código de un email y, si coincide, lo elimina en una única sentencia atómica.
+
+        Args:
+            email (str): Email del usuario.
+            code (str): Código ingresado.
+
+        Returns:
+            bool: True si el código coincidía y fue consumido; False si no hay código o no coincide.
+
+        Raises:
+            ExpiredCodeError: Si el código coincidía pero ya había expirado.
+        """
+        async with self.db_conn.lease() as conn:
+            deleted = await conn.execute(
+                "DELETE FROM recovery_code WHERE email = ? AND code = ? RETURNING expires_at;",
+                [email, code]
+            )
+
+        if not deleted:
+            return False
+        if deleted[0][0] <= time.time():
+            raise ExpiredCodeError("Código de recuperación de contraseña expirado.")
+        return True
+
+    async def purge_expired(self) -> int:
+        """
+        Elimina los códigos vencidos de la tabla.
+
+        Returns:
+            int: Cantidad de códigos eliminados.
+        """
+        async with self.db_conn.lease() as conn:
+            deleted = await conn.execute("DELETE FROM recovery_code WHERE expires_at <= ? RETURNING 1;", [time.time()])
+        return len(deleted)
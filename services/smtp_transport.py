@@ -0,0 +1,293 @@
+import time
+import asyncio
+import hashlib
+import smtplib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from utils.env_loader import EnvManager
+from utils.metrics import MetricsRegistry
+from utils.sampling_profiler import profiled_call
+from errors.send_email_error import SendEmailError
+
+METRICS = MetricsRegistry()
+METRICS_ENABLED = str(EnvManager().get("METRICS_ENABLED", "false")).lower() == "true"
+EMAIL_SEND_DURATION = METRICS.histogram("email_send_duration_seconds", "Duración de los envíos de email por resultado.",
+                                        ("result",), buckets= (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+EMAIL_SEND_FAILURES = METRICS.counter("email_send_failures_total", "Envíos de email fallidos.")
+
+
+class SMTPTransport():
+    """
+    Transporte asíncrono de emails con un pool de sesiones SMTP autenticadas.
+
+    Las sesiones se agrupan por credenciales del remitente y se reutilizan entre envíos, evitando la
+    conexión TCP, el handshake TLS y el login por cada email. Una sesión que estuvo inactiva más de
+    `keepalive_interval` segundos se verifica con `NOOP` antes de reutilizarse, y una inactiva más de
+    `idle_timeout` segundos se cierra. Como `smtplib` es bloqueante, las sesiones se operan desde un
+    pool de hilos propio, sin ocupar los hilos de los requests.
+
+    Mientras hay sesiones ociosas, una tarea revisa el pool cada `keepalive_interval` segundos, cierra las
+    sesiones que superaron `idle_timeout` y descarta el estado de los remitentes sin sesiones ni envíos en
+    curso, de modo que la memoria y los sockets no crecen con cada remitente distinto.
+
+    Attributes:
+        host (str): Servidor SMTP.
+        port (int): Puerto del servidor SMTP.
+        use_ssl (bool): Si es True se usa SMTP sobre TLS implícito; si es False, STARTTLS.
+        allow_plaintext (bool): Si es True y el servidor no ofrece STARTTLS, se autentica sin cifrar. Sólo para
+            servidores SMTP locales de prueba.
+        max_sessions_per_sender (int): Sesiones simultáneas máximas por remitente.
+        keepalive_interval (float): Segundos de inactividad tras los cuales una sesión se verifica con NOOP.
+        idle_timeout (float): Segundos de inactividad tras los cuales una sesión se cierra.
+        timeout (float): Segundos de espera de las operaciones de red.
+    """
+
+    def __init__(self, host: str | None = None, port: int | None = None, use_ssl: bool | None = None,
+                 allow_plaintext: bool | None = None, max_sessions_per_sender: int | None = None, keepalive_interval: float = 30,
+                 idle_timeout: float = 240, timeout: float = 30):
+        """
+        Inicializa una nueva instancia de SMTPTransport. Los valores no indicados se obtienen de las
+        variables de entorno `SMTP_HOST`, `SMTP_PORT`, `SMTP_USE_SSL`, `SMTP_ALLOW_PLAINTEXT` y `SMTP_POOL_SIZE`.
+
+        Args:
+            host (str | None): Servidor SMTP.
+            port (int | None): Puerto del servidor SMTP.
+            use_ssl (bool | None): Si es True se usa TLS implícito; si es False, STARTTLS.
+            allow_plaintext (bool | None): Si es True, se admite autenticarse sin cifrar cuando el servidor no
+                ofrece STARTTLS.
+            max_sessions_per_sender (int | None): Sesiones simultáneas máximas por remitente.
+            keepalive_interval (float): Segundos de inactividad tras los cuales una sesión se verifica con NOOP.
+            idle_timeout (float): Segundos de inactividad tras los cuales una sesión se cierra.
+            timeout (float): Segundos de espera de las operaciones de red.
+        """
+        ENV = EnvManager()
+
+        self.host = host or ENV.get("SMTP_HOST", "smtp.gmail.com")
+        self.port = int(port or ENV.get("SMTP_PORT", 465))
+        self.use_ssl = use_ssl if use_ssl is not None else str(ENV.get("SMTP_USE_SSL", "true")).lower() == "true"
+        self.allow_plaintext = (allow_plaintext if allow_plaintext is not None
+                                else str(ENV.get("SMTP_ALLOW_PLAINTEXT", "false")).lower() == "true")
+        self.max_sessions_per_sender = int(max_sessions_per_sender or ENV.get("SMTP_POOL_SIZE", 2))
+        self.keepalive_interval = keepalive_interval
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+
+        self.__executor = ThreadPoolExecutor(max_workers= 8, thread_name_prefix= "smtp")
+        self.__idle: dict[tuple[str, str], deque[tuple[smtplib.SMTP, float]]] = {}
+        self.__limits: dict[tuple[str, str], asyncio.Semaphore] = {}
+        self.__active: dict[tuple[str, str], int] = {}
+        self.__sweeper: asyncio.Task | None = None
+        self.sent = 0
+        self.failed = 0
+        self.sessions_opened = 0
+
+    async def send(self, sender_email: str, password_email: str, receiver_email: str, message: str) -> None:
+        """
+        Envía un email reutilizando una sesión del pool del remitente.
+
+        Si una sesión reutilizada resultó estar cerrada por el servidor, el envío se reintenta una vez con
+        una sesión nueva.
+
+        Args:
+            sender_email (str): Email del remitente, usado también como usuario SMTP.
+            password_email (str): Contraseña SMTP del remitente.
+            receiver_email (str): Email del destinatario.
+            message (str): Mensaje MIME completo.
+
+        Raises:
+            SendEmailError: Si no se pudo enviar el email.
+        """
+        start = time.perf_counter()
+        try:
+            await self.__send(sender_email, password_email, receiver_email, message)
+        except BaseException:
+            if METRICS_ENABLED:
+                EMAIL_SEND_FAILURES.inc()
+                EMAIL_SEND_DURATION.observe(time.perf_counter() - start, "failed")
+            raise
+        if METRICS_ENABLED:
+            EMAIL_SEND_DURATION.observe(time.perf_counter() - start, "sent")
+
+    def open_session(self, sender_email: str, password_email: str) -> smtplib.SMTP:
+        """
+        Abre y autentica una sesión SMTP fuera del pool, con la misma configuración de servidor y TLS.
+        Es bloqueante; quien la abre debe cerrarla (por ejemplo, usándola con `with`).
+
+        Args:
+            sender_email (str): Email del remitente, usado también como usuario SMTP.
+            password_email (str): Contraseña SMTP del remitente.
+
+        Returns:
+            smtplib.SMTP: Sesión autenticada.
+
+        Raises:
+            smtplib.SMTPNotSupportedError: Si el servidor no ofrece STARTTLS y no se admite texto plano.
+        """
+        if self.use_ssl:
+            session = smtplib.SMTP_SSL(self.host, self.port, timeout= self.timeout)
+        else:
+            session = smtplib.SMTP(self.host, self.port, timeout= self.timeout)
+
+        try:
+            if not self.use_ssl:
+                session.ehlo()
+                if session.has_extn("starttls"):
+                    session.starttls()
+                    session.ehlo()
+                elif not self.allow_plaintext:
+                    # Sin STARTTLS la contraseña viajaría en texto plano.
+                    raise smtplib.SMTPNotSupportedError("El servidor SMTP no ofrece STARTTLS.")
+            session.login(sender_email, password_email)
+        except Exception:
+            session.close()
+            raise
+
+        self.sessions_opened += 1
+        return session
+
+    async def close(self) -> None:
+        """
+        Detiene la revisión de sesiones ociosas y cierra todas las sesiones del pool.
+        """
+        if self.__sweeper is not None:
+            self.__sweeper.cancel()
+            try:
+                await self.__sweeper
+            except asyncio.CancelledError:
+                pass
+            self.__sweeper = None
+
+        for sessions in self.__idle.values():
+            while sessions:
+                session, _ = sessions.pop()
+                await self.__quit(session)
+        self.__idle.clear()
+
+    async def evict_idle(self) -> int:
+        """
+        Cierra las sesiones inactivas por más de `idle_timeout` segundos y descarta el estado de los
+        remitentes que ya no tienen sesiones ociosas ni envíos en curso.
+
+        Returns:
+            int: Cantidad de sesiones cerradas.
+        """
+        now = time.monotonic()
+        expired = []
+        # Las sesiones vencidas se retiran del pool sin ceder el event loop, antes de cerrarlas.
+        for key, sessions in list(self.__idle.items()):
+            alive = [(session, last_used) for session, last_used in sessions if now - last_used < self.idle_timeout]
+            expired.extend(session for session, last_used in sessions if now - last_used >= self.idle_timeout)
+            sessions.clear()
+            sessions.extend(alive)
+            if not sessions:
+                del self.__idle[key]
+
+        for key in list(self.__limits):
+            if key not in self.__idle and key not in self.__active:
+                del self.__limits[key]
+
+        for session in expired:
+            await self.__quit(session)
+        return len(expired)
+
+    def stats(self) -> dict:
+        """
+        Devuelve el estado del transporte.
+
+        Returns:
+            dict: Sesiones ociosas, sesiones abiertas, remitentes con estado en el pool, enviados y fallidos.
+        """
+        return {
+            "idle_sessions": sum(len(sessions) for sessions in self.__idle.values()),
+            "sessions_opened": self.sessions_opened,
+            "senders": len(self.__limits),
+            "sent": self.sent,
+            "failed": self.failed
+        }
+
+    async def __send(self, sender_email: str, password_email: str, receiver_email: str, message: str) -> None:
+        key = (sender_email, hashlib.sha256(password_email.encode()).hexdigest())
+        limit = self.__limits.setdefault(key, asyncio.Semaphore(self.max_sessions_per_sender))
+        loop = asyncio.get_running_loop()
+
+        self.__active[key] = self.__active.get(key, 0) + 1
+        try:
+            async with limit:
+                await self.__send_with_session(loop, key, sender_email, password_email, receiver_email, message)
+        finally:
+            self.__active[key] -= 1
+            if not self.__active[key]:
+                del self.__active[key]
+            self.__start_sweeper()
+
+    async def __send_with_session(self, loop: asyncio.AbstractEventLoop, key: tuple[str, str], sender_email: str,
+                                  password_email: str, receiver_email: str, message: str) -> None:
+        for attempt in range(2):
+            session, reused = await self.__acquire(key, sender_email, password_email)
+            try:
+                await loop.run_in_executor(self.__executor, profiled_call(session.sendmail),
+                                           sender_email, receiver_email, message)
+            except smtplib.SMTPServerDisconnected as error:
+                await self.__quit(session)
+                if reused and attempt == 0:
+                    continue
+                self.failed += 1
+                raise SendEmailError(str(error))
+            except Exception as error:
+                await self.__quit(session)
+                self.failed += 1
+                raise SendEmailError(str(error))
+
+            self.__idle.setdefault(key, deque()).append((session, time.monotonic()))
+            self.sent += 1
+            return
+
+    async def __acquire(self, key: tuple[str, str], sender_email: str,
+                        password_email: str) -> tuple[smtplib.SMTP, bool]:
+        loop = asyncio.get_running_loop()
+        sessions = self.__idle.get(key)
+
+        while sessions:
+            session, last_used = sessions.pop()
+            idle = time.monotonic() - last_used
+            if idle >= self.idle_timeout:
+                await self.__quit(session)
+                continue
+            if idle < self.keepalive_interval or await loop.run_in_executor(self.__executor, profiled_call(_is_alive), session):
+                return session, True
+            await self.__quit(session)
+
+        try:
+            session = await loop.run_in_executor(self.__executor, profiled_call(self.open_session), sender_email, password_email)
+        except Exception as error:
+            self.failed += 1
+            raise SendEmailError(str(error))
+        return session, False
+
+    async def __quit(self, session: smtplib.SMTP) -> None:
+        await asyncio.get_running_loop().run_in_executor(self.__executor, profiled_call(_quit), session)
+
+    def __start_sweeper(self) -> None:
+        if self.__sweeper is None and (self.__idle or self.__limits):
+            self.__sweeper = asyncio.create_task(self.__sweep_loop())
+
+    async def __sweep_loop(self) -> None:
+        try:
+            while self.__idle or self.__limits:
+                await asyncio.sleep(max(self.keepalive_interval, 1))
+                await self.evict_idle()
+        finally:
+            self.__sweeper = None
+
+
+def _is_alive(session: smtplib.SMTP) -> bool:
+    try:
+        return session.noop()[0] == 250
+    except Exception:
+        return False
+
+def _quit(session: smtplib.SMTP) -> None:
+    try:
+        session.quit()
+    except Exception:
+        session.close()
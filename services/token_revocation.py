@@ -0,0 +1,65 @@
+import time
+from utils.env_loader import EnvManager
+from models.token_claims import TokenClaims
+
+
+class TokenRevocationRegistry():
+    """
+    Registro en memoria de usuarios cuyos tokens emitidos hasta cierto instante dejaron de ser válidos.
+
+    Por cada username se guarda únicamente el instante de revocación: cualquier token de ese usuario con
+    `iat` anterior o igual queda revocado. Las entradas se descartan cuando todos los tokens afectados ya
+    expiraron, por lo que el registro sólo crece con las revocaciones de la última ventana de expiración.
+    Implementa el patrón Singleton para compartir el registro en todo el proceso.
+    """
+    __instance = None
+
+    def __new__(cls):
+        if not cls.__instance:
+            cls.__instance = super(TokenRevocationRegistry, cls).__new__(cls)
+        return cls.__instance
+
+    def __init__(self):
+        if not hasattr(self, "_initialized"):
+            self._initialized = True
+            self.retention_seconds = int(EnvManager().get("JWT_EXPIRE_MINUTES")) * 60
+            # Diccionario ordenado por instante de revocación (las re-revocaciones se reinsertan al final).
+            self.__revoked_at: dict[str, float] = {}
+
+    def revoke(self, username: str) -> None:
+        """
+        Revoca todos los tokens emitidos hasta el momento para `username`.
+
+        Args:
+            username (str): Nombre de usuario cuyos tokens se revocan.
+        """
+        self.__revoked_at.pop(username, None)
+        self.__revoked_at[username] = time.time()
+        self.prune()
+
+    def is_revoked(self, claims: TokenClaims) -> bool:
+        """
+        Indica si el token descrito por `claims` fue revocado.
+
+        Args:
+            claims (TokenClaims): Claims verificados del token.
+
+        Returns:
+            bool: True si el token fue emitido antes de la última revocación de su usuario.
+        """
+        revoked_at = self.__revoked_at.get(claims.sub)
+        if revoked_at is None:
+            return False
+        return claims.iat is None or claims.iat <= revoked_at
+
+    def prune(self) -> None:
+        """Descarta las revocaciones cuyos tokens afectados ya expiraron."""
+        limit = time.time() - self.retention_seconds
+        while self.__revoked_at:
+            username, revoked_at = next(iter(self.__revoked_at.items()))
+            if revoked_at > limit:
+                break
+            del self.__revoked_at[username]
+
+    def __len__(self) -> int:
+        return len(self.__revoked_at)
@@ -0,0 +1,172 @@
+from utils.lru_cache import LRUCache
+from models.user_db import User, UserDB
+
+# Valor devuelto cuando la caché no tiene información sobre la clave buscada.
+MISS = object()
+
+
+class UserCache():
+    """
+    Caché de lectura de usuarios indexada por username y por email.
+
+    Los usuarios se almacenan una única vez por username (LRU con TTL) y un índice auxiliar resuelve
+    email -> username, de modo que invalidar un usuario elimina ambas claves. También guarda resultados
+    negativos (usuarios inexistentes) con un TTL más corto.
+
+    Sólo almacena los datos públicos del usuario, nunca `hashed_password`: la caché es propia de cada
+    proceso y las escrituras sólo la invalidan en el proceso que las realiza, por lo que las búsquedas que
+    validan contraseñas deben consultar siempre la base de datos.
+
+    Las escrituras se coordinan mediante `generation`: los servicios la leen antes de consultar la base de
+    datos y la pasan a `set()`, que descarta el resultado si hubo una invalidación en el medio.
+
+    Attributes:
+        generation (int): Contador que se incrementa con cada invalidación.
+        hits (int): Lecturas resueltas por la caché (incluye resultados negativos).
+        misses (int): Lecturas que requirieron consultar la base de datos.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60, negative_ttl: float = 5):
+        """
+        Inicializa una nueva instancia de UserCache.
+
+        Args:
+            max_size (int): Cantidad máxima de usuarios (y de resultados negativos) almacenados.
+            ttl (float): Segundos de vida de cada usuario almacenado.
+            negative_ttl (float): Segundos de vida de cada resultado negativo.
+        """
+        self.__users: LRUCache[str, User] = LRUCache(max_size= max_size, ttl= ttl)
+        self.__missing: LRUCache[tuple[str, str], bool] = LRUCache(max_size= max_size, ttl= negative_ttl)
+        self.__username_by_email: dict[str, str] = {}
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_by_username(self, username: str) -> User | None | object:
+        """
+        Busca un usuario por su username.
+
+        Args:
+            username (str): Nombre de usuario a buscar.
+
+        Returns:
+            User | None | object: Copia del usuario, None si se sabe que no existe, o `MISS`.
+        """
+        return self.__lookup(self.__users.get(username), ("username", username))
+
+    def get_by_email(self, email: str) -> User | None | object:
+        """
+        Busca un usuario por su email.
+
+        Args:
+            email (str): Email a buscar.
+
+        Returns:
+            User | None | object: Copia del usuario, None si se sabe que no existe, o `MISS`.
+        """
+        user = None
+        username = self.__username_by_email.get(email)
+        if username is not None:
+            user = self.__users.get(username)
+            if user is None or user.email != email:
+                self.__username_by_email.pop(email, None)
+                user = None
+        return self.__lookup(user, ("email", email))
+
+    def set(self, user: User | UserDB, generation: int) -> None:
+        """
+        Almacena los datos públicos de un usuario leído de la base de datos.
+
+        Args:
+            user (User | UserDB): Usuario leído. Si incluye hashed_password, ésta no se almacena.
+            generation (int): Valor de `generation` leído antes de la consulta.
+        """
+        if generation != self.generation:
+            return
+        user = User(full_name= user.full_name, username= user.username, email= user.email)
+
+        previous = self.__users.get(user.username)
+        if previous is not None and previous.email != user.email:
+            self.__username_by_email.pop(previous.email, None)
+
+        evicted = self.__users.set(user.username, user)
+        if evicted is not None:
+            _, evicted_user = evicted
+            if self.__username_by_email.get(evicted_user.email) == evicted_user.username:
+                del self.__username_by_email[evicted_user.email]
+
+        self.__username_by_email[user.email] = user.username
+        self.__missing.pop(("username", user.username))
+        self.__missing.pop(("email", user.email))
+
+    def set_missing(self, field: str, value: str, generation: int) -> None:
+        """
+        Registra que no existe un usuario con `field` igual a `value`.
+
+        Args:
+            field (str): 'username' o 'email'.
+            value (str): Valor buscado.
+            generation (int): Valor de `generation` leído antes de la consulta.
+        """
+        if generation == self.generation:
+            self.__missing.set((field, value), True)
+
+    def invalidate(self, username: str | None = None, email: str | None = None) -> None:
+        """
+        Elimina toda la información almacenada sobre un username y/o un email.
+
+        Args:
+            username (str | None): Username a invalidar.
+            email (str | None): Email a invalidar.
+        """
+        self.generation += 1
+
+        if email is not None:
+            self.__missing.pop(("email", email))
+            indexed_username = self.__username_by_email.pop(email, None)
+            if indexed_username is not None:
+                self.__pop_user(indexed_username)
+
+        if username is not None:
+            self.__missing.pop(("username", username))
+            self.__pop_user(username)
+
+    def clear(self) -> None:
+        """Elimina todas las entradas y reinicia los contadores."""
+        self.__users.clear()
+        self.__missing.clear()
+        self.__username_by_email.clear()
+        self.generation += 1
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Devuelve el estado de la caché.
+
+        Returns:
+            dict: Usuarios y resultados negativos almacenados, aciertos y fallos.
+        """
+        return {
+            "users": len(self.__users),
+            "missing": len(self.__missing),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def __lookup(self, user: User | None, missing_key: tuple[str, str]) -> User | None | object:
+        if user is not None:
+            self.hits += 1
+            return user.model_copy()
+
+        if user is None and self.__missing.get(missing_key):
+            self.hits += 1
+            return None
+
+        self.misses += 1
+        return MISS
+
+    def __pop_user(self, username: str) -> None:
+        user = self.__users.pop(username)
+        if user is not None and self.__username_by_email.get(user.email) == username:
+            del self.__username_by_email[user.email]
@@ -2,6 +2,7 @@ import pytest
 from models.user_db import UserDB
 from adapters.adapter_db_conn_sqlite3_test import AdapterDBConnMemorySqlite3Test
 from services.hashing_service import hashed_password
+from services.db_services import USER_CACHE
 
 #==================== FIXTURES ====================
 @pytest.fixture(scope= 'module')
@@ -9,6 +10,9 @@ async def database_mock():
     conn = AdapterDBConnMemorySqlite3Test()
     await conn.connect()
     
+    # Cada módulo de tests trabaja sobre una base de datos nueva.
+    USER_CACHE.clear()
+    
     original_connect = conn.connect
     original_close = conn.close
     
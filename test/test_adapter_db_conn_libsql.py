@@ -0,0 +1,111 @@
+import pytest
+from adapters.adapter_db_conn_libsql import AdapterDBConnLibsqlClient
+from libsql_client import LibsqlError
+from errors.database_errors import DatabaseConnectionError, DatabaseQueryError
+
+#==================== FIXTURES ====================
+@pytest.fixture
+async def libsql_conn(tmp_path):
+    conn = AdapterDBConnLibsqlClient(database_url= f"file:{tmp_path / 'test.db'}")
+    yield conn
+    await conn.close()
+
+#==================== TEST ====================
+async def test_lease_reuses_client(libsql_conn):
+    async with libsql_conn.lease() as conn:
+        await conn.execute("CREATE TABLE example (id INTEGER PRIMARY KEY);", [])
+    client = libsql_conn.current_client
+
+    async with libsql_conn.lease() as conn:
+        rows = await conn.execute("SELECT COUNT(*) FROM example;", [])
+
+    assert rows[0][0] == 0
+    assert libsql_conn.current_client is client
+    assert not client.closed
+
+async def test_execute_reconnects_closed_client(libsql_conn):
+    await libsql_conn.connect()
+    closed_client = libsql_conn.current_client
+    await closed_client.close()
+
+    rows = await libsql_conn.execute("SELECT 1;", [])
+
+    assert rows[0][0] == 1
+    assert libsql_conn.current_client is not closed_client
+
+async def test_batch_is_atomic(libsql_conn):
+    await libsql_conn.connect()
+    await libsql_conn.execute("CREATE TABLE example (id INTEGER PRIMARY KEY);", [])
+
+    results = await libsql_conn.batch([("INSERT INTO example VALUES (?);", [1]),
+                                       ("SELECT COUNT(*) FROM example;", [])])
+    assert results[1][0][0] == 1
+
+    with pytest.raises(DatabaseQueryError):
+        await libsql_conn.execute_many("INSERT INTO example VALUES (?);", [[2], [1]])
+
+    rows = await libsql_conn.execute("SELECT id FROM example;", [])
+    assert [row[0] for row in rows] == [1]
+
+async def test_transaction_commit_and_rollback(libsql_conn):
+    await libsql_conn.connect()
+    await libsql_conn.execute("CREATE TABLE example (id INTEGER PRIMARY KEY);", [])
+
+    async with libsql_conn.transaction() as tx:
+        await tx.execute("INSERT INTO example VALUES (?);", [1])
+
+    with pytest.raises(RuntimeError):
+        async with libsql_conn.transaction() as tx:
+            await tx.execute("INSERT INTO example VALUES (?);", [2])
+            raise RuntimeError("rollback")
+
+    rows = await libsql_conn.execute("SELECT id FROM example;", [])
+    assert [row[0] for row in rows] == [1]
+
+async def test_write_is_not_replayed_after_losing_the_connection(libsql_conn):
+    await libsql_conn.connect()
+    await libsql_conn.execute("CREATE TABLE example (id INTEGER PRIMARY KEY);", [])
+    client = libsql_conn.current_client
+    original_execute = client.execute
+
+    async def execute_and_drop(*args, **kwargs):
+        # La escritura se confirma pero la respuesta se pierde.
+        await original_execute(*args, **kwargs)
+        raise LibsqlError("The stream was closed", "STREAM_CLOSED")
+
+    client.execute = execute_and_drop
+    with pytest.raises(DatabaseConnectionError):
+        await libsql_conn.execute("INSERT INTO example VALUES (?);", [1])
+
+    rows = await libsql_conn.execute("SELECT COUNT(*) FROM example;", [])
+    assert rows[0][0] == 1
+
+async def test_read_is_retried_after_losing_the_connection(libsql_conn):
+    await libsql_conn.connect()
+    client = libsql_conn.current_client
+
+    async def drop(*args, **kwargs):
+        raise LibsqlError("The stream was closed", "STREAM_CLOSED")
+
+    client.execute = drop
+    rows = await libsql_conn.execute("SELECT 1;", [])
+
+    assert rows[0][0] == 1
+    assert libsql_conn.current_client is not client
+
+async def test_batch_with_writes_is_not_replayed(libsql_conn):
+    await libsql_conn.connect()
+    await libsql_conn.execute("CREATE TABLE example (id INTEGER PRIMARY KEY);", [])
+    client = libsql_conn.current_client
+    original_batch = client.batch
+
+    async def batch_and_drop(*args, **kwargs):
+        await original_batch(*args, **kwargs)
+        raise LibsqlError("The stream was closed", "STREAM_CLOSED")
+
+    client.batch = batch_and_drop
+    with pytest.raises(DatabaseConnectionError):
+        await libsql_conn.execute_many("INSERT INTO example VALUES (?);", [[1], [2]])
+
+    rows = await libsql_conn.execute("SELECT COUNT(*) FROM example;", [])
+    assert rows[0][0] == 2
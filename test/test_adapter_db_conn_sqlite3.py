@@ -0,0 +1,103 @@
+import time
+import asyncio
+import pytest
+import adapters.adapter_db_conn_sqlite3 as sqlite3_adapter
+from adapters.adapter_db_conn_sqlite3 import AdapterDBConnSqlite3
+from errors.database_errors import DatabaseConnectionError, DatabaseQueryError
+
+#==================== FIXTURES ====================
+@pytest.fixture
+async def sqlite_conn(tmp_path):
+    conn = AdapterDBConnSqlite3(database_path= str(tmp_path / "test.db"), read_connections= 2)
+    await conn.connect()
+    await conn.execute("CREATE TABLE example (id INTEGER PRIMARY KEY);", [])
+    yield conn
+    await conn.close()
+
+#==================== TEST ====================
+async def test_wal_mode_and_read_write(sqlite_conn):
+    assert (await sqlite_conn.execute("PRAGMA journal_mode;", []))[0][0] == "wal"
+
+    returned = await sqlite_conn.execute("INSERT INTO example VALUES (?) RETURNING id;", [1])
+    assert returned == [(1,)]
+    assert await sqlite_conn.execute("SELECT id FROM example;", []) == [(1,)]
+
+async def test_group_commit_isolates_failed_operations(sqlite_conn):
+    # Escrituras concurrentes: la clave duplicada falla sin revertir al resto del grupo.
+    results = await asyncio.gather(*(sqlite_conn.execute("INSERT INTO example VALUES (?);", [id])
+                                     for id in (1, 2, 2, 3)), return_exceptions= True)
+
+    assert isinstance(results[2], DatabaseQueryError)
+    assert sum(isinstance(result, Exception) for result in results) == 1
+    rows = await sqlite_conn.execute("SELECT id FROM example ORDER BY id;", [])
+    assert rows == [(1,), (2,), (3,)]
+
+async def test_batch_and_transaction_are_atomic(sqlite_conn):
+    with pytest.raises(DatabaseQueryError):
+        await sqlite_conn.execute_many("INSERT INTO example VALUES (?);", [[1], [1]])
+
+    with pytest.raises(RuntimeError):
+        async with sqlite_conn.transaction() as tx:
+            await tx.execute("INSERT INTO example VALUES (?);", [2])
+            raise RuntimeError("rollback")
+
+    async with sqlite_conn.transaction() as tx:
+        await tx.execute("INSERT INTO example VALUES (?);", [3])
+
+    assert await sqlite_conn.execute("SELECT id FROM example;", []) == [(3,)]
+
+async def test_statement_cache_stats(tmp_path):
+    conn = AdapterDBConnSqlite3(database_path= str(tmp_path / "cache.db"), cached_statements= 1)
+    await conn.connect()
+    try:
+        for query in ("SELECT 1;", "SELECT 1;", "SELECT 2;", "SELECT 1;"):
+            await conn.execute(query, [])
+
+        stats = conn.statement_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["max_size"]) == (1, 3, 1)
+        assert stats["hit_rate"] == 0.25
+    finally:
+        await conn.close()
+
+async def test_write_after_close_raises(tmp_path):
+    conn = AdapterDBConnSqlite3(database_path= str(tmp_path / "closed.db"))
+    await conn.connect()
+    await conn.close()
+
+    with pytest.raises(DatabaseConnectionError):
+        await asyncio.wait_for(conn.execute("CREATE TABLE example (id INTEGER PRIMARY KEY);", []), timeout= 5)
+
+async def test_write_during_close_does_not_hang(tmp_path, monkeypatch):
+    conn = AdapterDBConnSqlite3(database_path= str(tmp_path / "closing.db"))
+    await conn.connect()
+    original_commit = sqlite3_adapter._commit_group
+
+    def slow_commit(*args):
+        time.sleep(0.1)
+        return original_commit(*args)
+
+    monkeypatch.setattr(sqlite3_adapter, "_commit_group", slow_commit)
+    # La escritura y el fin de la cola se confirman en el mismo grupo; la siguiente llega durante el commit.
+    first = asyncio.create_task(conn.execute("CREATE TABLE example (id INTEGER PRIMARY KEY);", []))
+    closing = asyncio.create_task(conn.close())
+    await asyncio.sleep(0.02)
+
+    with pytest.raises(DatabaseConnectionError):
+        await asyncio.wait_for(conn.execute("INSERT INTO example VALUES (?);", [1]), timeout= 5)
+    await asyncio.wait_for(asyncio.gather(first, closing), timeout= 5)
+
+async def test_concurrent_connect_opens_once(tmp_path, monkeypatch):
+    conn = AdapterDBConnSqlite3(database_path= str(tmp_path / "connect.db"), read_connections= 2)
+    opened = []
+    original_open = conn._AdapterDBConnSqlite3__open_connection
+
+    def counting_open(read_only):
+        opened.append(read_only)
+        return original_open(read_only)
+
+    monkeypatch.setattr(conn, "_AdapterDBConnSqlite3__open_connection", counting_open)
+    try:
+        await asyncio.gather(*(conn.connect() for _ in range(5)))
+        assert opened == [False, True, True]
+    finally:
+        await conn.close()
@@ -0,0 +1,62 @@
+import jwt
+import time
+import pytest
+from services import auth_services as at
+from models.token_claims import TokenClaims
+from errors.token_format_error import TokenFormatError
+
+#==================== FIXTURES ====================
+@pytest.fixture
+def decode_counter(monkeypatch):
+    calls = []
+    original_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return original_decode(*args, **kwargs)
+
+    at.CLAIMS_CACHE.clear()
+    monkeypatch.setattr(at.jwt, "decode", counting_decode)
+    return calls
+
+#==================== TEST ====================
+def test_verify_access_token_decodes_once(decode_counter):
+    token = at.create_access_token(username= "test")
+
+    claims = at.verify_access_token(token)
+    assert isinstance(claims, TokenClaims)
+    assert claims.sub == "test"
+
+    assert at.verify_access_token(token) == claims
+    assert at.get_username_from_token(token) == "test"
+    assert at.verify_access_token(claims) is claims
+    assert len(decode_counter) == 1
+
+def test_verify_access_token_expired_is_not_cached(decode_counter):
+    token = jwt.encode({"sub": "test", "exp": int(time.time()) - 1}, at.SECRET_KEY, algorithm= at.ALGORITHM)
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        at.verify_access_token(token)
+    with pytest.raises(jwt.ExpiredSignatureError):
+        at.verify_access_token(token)
+    assert len(decode_counter) == 2
+
+def test_verify_access_token_without_sub():
+    token = jwt.encode({"exp": int(time.time()) + 60}, at.SECRET_KEY, algorithm= at.ALGORITHM)
+
+    with pytest.raises(TokenFormatError):
+        at.verify_access_token(token)
+
+async def test_stateless_authorization_and_revocation(monkeypatch):
+    monkeypatch.setattr(at, "STATELESS_VALIDATION", True)
+    token = at.create_access_token(username= "stateless")
+
+    # Sin conexión a la base de datos: el modo sin estado no realiza I/O.
+    claims = await at.authorize_access_token(db_conn= None, token= token)
+    assert claims is not None and claims.sub == "stateless"
+
+    at.revoke_user_tokens("stateless")
+    assert await at.authorize_access_token(db_conn= None, token= token) is None
+
+    new_token = at.create_access_token(username= "stateless")
+    assert await at.authorize_access_token(db_conn= None, token= new_token) is not None
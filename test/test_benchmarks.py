@@ -0,0 +1,23 @@
+from benchmarks.runner import ScenarioResult, percentile
+from benchmarks.report import find_regressions
+
+#==================== FIXTURES ====================
+def result(p95: float, rps: float, errors: int = 0) -> ScenarioResult:
+    return ScenarioResult(name= "me", requests= 100, concurrency= 10, errors= errors, duration= 1.0,
+                          rps= rps, mean= p95, p50= p95, p95= p95, p99= p95, max= p95)
+
+BASELINE = {"me": result(p95= 10, rps= 100)._asdict()}
+
+#==================== TEST ====================
+def test_percentile():
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.95) == 95
+    assert percentile(values, 0.99) == 99
+    assert percentile([], 0.5) == 0
+
+def test_find_regressions():
+    assert find_regressions([result(p95= 10.5, rps= 95)], BASELINE, threshold= 0.1) == []
+    assert len(find_regressions([result(p95= 12, rps= 80)], BASELINE, threshold= 0.1)) == 2
+    assert len(find_regressions([result(p95= 10, rps= 100, errors= 1)], BASELINE, threshold= 0.1)) == 1
@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from adapters.database_connection import DatabaseConnection
+from adapters.database_connection_pool import DatabaseConnectionPool
+from errors.database_errors import DatabaseConnectionError, DatabasePoolTimeoutError
+
+#==================== FIXTURES ====================
+class SlowConnection(DatabaseConnection):
+    """Conexión de prueba que simula latencia de red en cada consulta."""
+    def __init__(self):
+        self.connected = False
+        self.healthy = True
+
+    async def connect(self) -> None:
+        self.connected = True
+
+    async def execute(self, query: str, params: list) -> list[tuple]:
+        if not self.healthy:
+            raise DatabaseConnectionError("Conexión caída.")
+        await asyncio.sleep(0.05)
+        return [(1,)]
+
+    async def close(self) -> None:
+        self.connected = False
+
+@pytest.fixture
+def pool():
+    return DatabaseConnectionPool(connection_factory= SlowConnection,
+                                  min_size= 1,
+                                  max_size= 4,
+                                  acquire_timeout= 0.01,
+                                  health_check_interval= 0)
+
+#==================== TEST ====================
+async def test_connect_opens_min_size(pool):
+    await pool.connect()
+    assert pool.stats()["size"] == 1
+    assert pool.stats()["idle"] == 1
+
+async def test_queries_run_concurrently(pool):
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(*(pool.execute("SELECT 1;", []) for _ in range(4)))
+
+    # Cuatro consultas de 50ms en paralelo no deberían tardar lo mismo que en serie.
+    assert loop.time() - start < 0.15
+    assert pool.stats()["size"] == 4
+    assert pool.stats()["in_use"] == 0
+
+async def test_acquire_timeout(pool):
+    leased = [await pool.acquire() for _ in range(pool.max_size)]
+
+    with pytest.raises(DatabasePoolTimeoutError):
+        await pool.acquire()
+
+    for conn in leased:
+        await pool.release(conn)
+
+async def test_unhealthy_connection_is_replaced(pool):
+    conn = await pool.acquire()
+    await pool.release(conn)
+    conn.healthy = False
+
+    new_conn = await pool.acquire()
+    assert new_conn is not conn
+    assert not conn.connected
+    await pool.release(new_conn)
+
+async def test_close(pool):
+    await pool.connect()
+    await pool.close()
+
+    assert pool.stats()["size"] == 0
+    with pytest.raises(DatabaseConnectionError):
+        await pool.acquire()
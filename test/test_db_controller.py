@@ -1,5 +1,5 @@
 import json
-from fastapi import HTTPException
+from fastapi import HTTPException, Request
 import pytest
 from models.user import User
 from controllers import db_controllers as controller
@@ -90,4 +90,23 @@ async def test_delete_user_controller(database_mock, access_token_fixture, user_
                           username= user_fixture.username)
     assert user is None
     
-    
\ No newline at end of file
+    
+async def test_add_users_batch_controller(database_mock, monkeypatch):
+    monkeypatch.setattr(controller, "BULK_INSERT_BATCH_SIZE", 2)
+    rows = [{"full_name": "Bulk", "username": f"bulk{i}", "email": f"bulk{i}@example.com", "password": "pw"}
+            for i in range(3)]
+    body = "\n".join(json.dumps(row) for row in rows) + "\nnot json\n" + json.dumps(rows[0])
+
+    async def receive():
+        return {"type": "http.request", "body": body.encode(), "more_body": False}
+
+    request = Request({"type": "http", "method": "POST", "path": "/user/bulk",
+                       "headers": [(b"content-type", b"application/x-ndjson")]}, receive)
+    response = await controller.add_users_batch_controller(db_conn= database_mock, request= request)
+
+    chunks = [chunk async for chunk in response.body_iterator]
+    lines = [json.loads(line) for line in "".join(chunks).splitlines()]
+    # Un fragmento por lote, más el resumen.
+    assert len(chunks) == 4
+    assert [line["status"] for line in lines[:-1]] == ["created", "created", "created", "invalid", "conflict"]
+    assert lines[-1]["summary"] == {"created": 3, "conflict": 1, "invalid": 1, "error": 0}
@@ -1,5 +1,8 @@
+import asyncio
 import pytest
 from services import db_services as db
+from errors.users_errors import DuplicateUserError
+from errors.database_errors import DatabaseQueryError
 
 #============================== FIXTURES ==============================#
 from test.common_fixtures import database_mock, updated_user_fixture, user_fixture
@@ -56,4 +59,112 @@ async def test_get_user_by_email(database_mock, user_fixture):
     assert user is not None
     
     user2 = await db.get_user_by_email(db_conn= database_mock, email= "notExistEmail@example.com")
-    assert user2 is None
\ No newline at end of file
+    assert user2 is None
+
+@pytest.mark.asyncio
+async def test_user_cache_invalidation(database_mock, user_fixture, updated_user_fixture):
+    # El usuario agregado en el test anterior queda en caché tras la primera lectura.
+    await db.get_user_by_email(db_conn= database_mock, email= user_fixture.email)
+    hits = db.USER_CACHE.hits
+    user = await db.get_user(db_conn= database_mock, username= user_fixture.username)
+    assert user is not None
+    assert db.USER_CACHE.hits == hits + 1
+
+    # Al cambiar el email, la clave anterior deja de resolver al usuario.
+    await db.update_user(db_conn= database_mock,
+                         username= user_fixture.username,
+                         updated_user= updated_user_fixture)
+    assert await db.get_user_by_email(db_conn= database_mock, email= user_fixture.email) is None
+    updated = await db.get_user_by_email(db_conn= database_mock, email= updated_user_fixture.email)
+    assert updated.username == updated_user_fixture.username
+
+    # Los resultados negativos se invalidan al agregar el usuario.
+    await db.delete_user(db_conn= database_mock, username= updated_user_fixture.username)
+    assert await db.get_user(db_conn= database_mock, username= user_fixture.username) is None
+    await db.add_user(db_conn= database_mock, user= user_fixture)
+    assert await db.get_user(db_conn= database_mock, username= user_fixture.username) is not None
+
+@pytest.mark.asyncio
+async def test_insert_user_if_unique(database_mock, user_fixture, updated_user_fixture):
+    with pytest.raises(DuplicateUserError) as error:
+        await db.insert_user_if_unique(db_conn= database_mock, user= user_fixture)
+    assert error.value.fields == ["username", "email"]
+
+    new_user = updated_user_fixture.model_copy(update= {"username": "new_username", "email": user_fixture.email})
+    with pytest.raises(DuplicateUserError) as error:
+        await db.insert_user_if_unique(db_conn= database_mock, user= new_user)
+    assert error.value.fields == ["email"]
+
+    new_user.email = "newEmail@example.com"
+    await db.insert_user_if_unique(db_conn= database_mock, user= new_user)
+    assert await db.get_user(db_conn= database_mock, username= new_user.username) is not None
+
+@pytest.mark.asyncio
+async def test_add_users_batch(database_mock, user_fixture):
+    batch = [
+        user_fixture.model_copy(update= {"username": "batch1", "email": "batch1@example.com"}),
+        user_fixture.model_copy(update= {"username": "batch2"}),  # email ya registrado
+        user_fixture.model_copy(update= {"username": "batch1", "email": "batch3@example.com"}),  # username repetido en el lote
+        user_fixture.model_copy(update= {"username": "batch4", "email": "batch4@example.com"}),
+    ]
+
+    results = await db.add_users_batch(db_conn= database_mock, users= batch)
+
+    assert results == [True, False, False, True]
+    assert await db.get_user(db_conn= database_mock, username= "batch4") is not None
+
+async def test_database_transaction_and_batch(database_mock):
+    await database_mock.execute("CREATE TABLE IF NOT EXISTS batch_example (id INTEGER PRIMARY KEY);", [])
+
+    with pytest.raises(DatabaseQueryError):
+        await database_mock.execute_many("INSERT INTO batch_example VALUES (?);", [[1], [1]])
+
+    with pytest.raises(RuntimeError):
+        async with database_mock.transaction() as tx:
+            await tx.execute("INSERT INTO batch_example VALUES (?);", [2])
+            raise RuntimeError("rollback")
+
+    results = await database_mock.batch([("INSERT INTO batch_example VALUES (?);", [3]),
+                                         ("SELECT id FROM batch_example;", [])])
+    assert results[1] == [(3,)]
+
+async def test_concurrent_lookups_share_one_query(database_mock, user_fixture, monkeypatch):
+    await db.add_users_batch(db_conn= database_mock, users= [user_fixture])
+    db.USER_CACHE.clear()
+
+    queries = []
+    original_execute = database_mock.execute
+
+    async def counting_execute(query, params):
+        queries.append(query)
+        await asyncio.sleep(0)
+        return await original_execute(query, params)
+
+    monkeypatch.setattr(database_mock, "execute", counting_execute)
+
+    users = await asyncio.gather(*(db.get_user(db_conn= database_mock, username= user_fixture.username,
+                                               visible_password= True) for _ in range(10)))
+
+    assert len(queries) == 1
+    assert all(user.password == user_fixture.password for user in users)
+    # Cada llamada recibe su propia copia del usuario.
+    assert len({id(user) for user in users}) == 10
+
+async def test_password_lookups_bypass_user_cache(database_mock, user_fixture, monkeypatch):
+    await db.get_user(db_conn= database_mock, username= user_fixture.username)
+
+    queries = []
+    original_execute = database_mock.execute
+
+    async def counting_execute(query, params):
+        queries.append(query)
+        return await original_execute(query, params)
+
+    monkeypatch.setattr(database_mock, "execute", counting_execute)
+
+    # El usuario público se resuelve con la caché; la contraseña siempre se lee de la base de datos.
+    assert await db.get_user(db_conn= database_mock, username= user_fixture.username) is not None
+    assert len(queries) == 0
+    user = await db.get_user(db_conn= database_mock, username= user_fixture.username, visible_password= True)
+    assert user.password == user_fixture.password
+    assert len(queries) == 1
@@ -0,0 +1,129 @@
+import asyncio
+import pytest
+from errors.send_email_error import SendEmailError
+from services.email_outbox import EmailOutbox, SenderRateLimiter
+from services.migration_service import run_migrations
+
+#==================== FIXTURES ====================
+from test.common_fixtures import database_mock
+
+class StubTransport():
+    """Transporte de prueba que falla las primeras `failures` entregas y registra las exitosas."""
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.delivered: list[tuple[str, str, str, str]] = []
+
+    async def send(self, sender_email: str, password_email: str, receiver_email: str, message: str) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise SendEmailError("Servidor no disponible.")
+        self.delivered.append((sender_email, password_email, receiver_email, message))
+
+@pytest.fixture
+async def migrated_db(database_mock):
+    await run_migrations(db_conn= database_mock)
+    async with database_mock.lease() as conn:
+        await conn.execute("DELETE FROM email_outbox;", [])
+    return database_mock
+
+def outbox(transport: StubTransport, **options) -> EmailOutbox:
+    options = {"max_attempts": 3, "backoff": 0, "rate_limit_per_minute": 0, **options}
+    return EmailOutbox(transport= transport, workers= 1, poll_interval= 0.01, **options)
+
+async def outbox_rows(db_conn) -> list[tuple]:
+    async with db_conn.lease() as conn:
+        return await conn.execute("SELECT status, attempts, last_error FROM email_outbox;", [])
+
+#==================== TEST ====================
+async def test_enqueued_email_is_delivered_and_removed(migrated_db):
+    transport = StubTransport()
+    queue = outbox(transport)
+
+    await queue.enqueue(migrated_db, "sender@example.com", "secret", "receiver@example.com", "Hola")
+    assert not transport.delivered
+
+    assert await queue.deliver_next(migrated_db)
+    assert not await queue.deliver_next(migrated_db)
+    assert transport.delivered == [("sender@example.com", "secret", "receiver@example.com", "Hola")]
+    assert await outbox_rows(migrated_db) == []
+
+async def test_failed_email_is_retried_then_dead_lettered(migrated_db):
+    transport = StubTransport(failures= 5)
+    queue = outbox(transport)
+    await queue.enqueue(migrated_db, "sender@example.com", "secret", "receiver@example.com", "Hola")
+
+    for _ in range(3):
+        assert await queue.deliver_next(migrated_db)
+
+    assert not await queue.deliver_next(migrated_db)
+    assert await outbox_rows(migrated_db) == [("dead", 3, "Servidor no disponible.")]
+    assert queue.stats()["retried"] == 2 and queue.stats()["dead_lettered"] == 1
+    async with migrated_db.lease() as conn:
+        assert await conn.execute("SELECT message FROM email_outbox;", []) == [("",)]
+
+async def test_backoff_delays_the_next_attempt(migrated_db):
+    queue = outbox(StubTransport(failures= 1), backoff= 60)
+    await queue.enqueue(migrated_db, "sender@example.com", "secret", "receiver@example.com", "Hola")
+
+    assert await queue.deliver_next(migrated_db)
+    assert not await queue.deliver_next(migrated_db)
+    assert (await outbox_rows(migrated_db))[0][:2] == ("pending", 1)
+
+async def test_rate_limit_reschedules_without_consuming_attempts(migrated_db):
+    transport = StubTransport()
+    queue = outbox(transport, rate_limit_per_minute= 1)
+    for _ in range(2):
+        await queue.enqueue(migrated_db, "sender@example.com", "secret", "receiver@example.com", "Hola")
+
+    assert await queue.deliver_next(migrated_db)
+    assert await queue.deliver_next(migrated_db)
+    assert len(transport.delivered) == 1 and queue.stats()["rate_limited"] == 1
+    assert await outbox_rows(migrated_db) == [("pending", 0, None)]
+
+async def test_workers_drain_the_queue(migrated_db):
+    transport = StubTransport(failures= 1)
+    queue = outbox(transport)
+    queue.start(migrated_db)
+    try:
+        for index in range(3):
+            await queue.enqueue(migrated_db, "sender@example.com", "secret", f"user{index}@example.com", "Hola")
+        for _ in range(50):
+            if len(transport.delivered) == 3:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await queue.stop()
+
+    assert sorted(receiver for _, _, receiver, _ in transport.delivered) == [f"user{index}@example.com" for index in range(3)]
+
+def test_sender_rate_limiter():
+    limiter = SenderRateLimiter(per_minute= 2)
+
+    assert limiter.acquire("a@example.com") == 0
+    assert limiter.acquire("a@example.com") == 0
+    assert limiter.acquire("a@example.com") > 0
+    assert limiter.acquire("b@example.com") == 0
+
+async def test_emails_without_local_credentials_are_left_for_other_processes(migrated_db):
+    enqueuing, other = StubTransport(), StubTransport()
+    first, second = outbox(enqueuing), outbox(other)
+    await first.enqueue(migrated_db, "client@example.com", "secret", "receiver@example.com", "Hola")
+
+    # Otro proceso sin las credenciales del remitente no reclama el email ni consume intentos.
+    assert not await second.deliver_next(migrated_db)
+    assert await outbox_rows(migrated_db) == [("pending", 0, None)]
+
+    assert await first.deliver_next(migrated_db)
+    assert enqueuing.delivered and not other.delivered
+
+async def test_credentials_are_discarded_when_no_email_is_queued(migrated_db):
+    transport = StubTransport()
+    queue = outbox(transport)
+    await queue.enqueue(migrated_db, "client@example.com", "secret", "receiver@example.com", "Hola")
+
+    assert await queue.discard_unused_credentials(migrated_db) == 0
+    assert await queue.deliver_next(migrated_db)
+    assert await queue.discard_unused_credentials(migrated_db) == 1
+
+    await queue.enqueue(migrated_db, "client@example.com", "secret", "receiver@example.com", "Hola")
+    assert await queue.discard_unused_credentials(migrated_db) == 0
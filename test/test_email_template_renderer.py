@@ -0,0 +1,30 @@
+from services.email_template_renderer import EmailTemplateRenderer
+
+#==================== FIXTURES ====================
+TEMPLATE = """<p>Hola <span id="username-to-recovering-password"></span>,</p>
+<p>Código: <span id="password-recovery-code">00000</span></p>"""
+
+#==================== TEST ====================
+def test_render_escapes_values():
+    renderer = EmailTemplateRenderer(default_template= TEMPLATE)
+
+    result = renderer.render(template_html= None, username= "<b>Ana & Co</b>", code= "12345")
+
+    assert '<span id="username-to-recovering-password">&lt;b&gt;Ana &amp; Co&lt;/b&gt;</span>' in result
+    assert '<span id="password-recovery-code">12345</span>' in result
+
+def test_custom_templates_are_compiled_once():
+    renderer = EmailTemplateRenderer(default_template= TEMPLATE, max_size= 1)
+    custom = TEMPLATE.replace("Hola", "Hi")
+
+    for _ in range(3):
+        assert renderer.render(template_html= custom, username= "Ana", code= "12345").startswith("<p>Hi")
+
+    assert (renderer.hits, renderer.misses) == (2, 1)
+
+def test_template_without_slots_uses_default():
+    renderer = EmailTemplateRenderer(default_template= TEMPLATE)
+
+    result = renderer.render(template_html= "<p>Sin huecos</p>", username= "Ana", code= "12345")
+
+    assert result == renderer.render(template_html= None, username= "Ana", code= "12345")
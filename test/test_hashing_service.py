@@ -9,4 +9,16 @@ def test_hashing_and_validate_password():
     assert hs.validate_password(password, hash)
     
     fake_password = "fake example"
-    assert hs.validate_password(fake_password, hash) is False
\ No newline at end of file
+    assert hs.validate_password(fake_password, hash) is False
+
+async def test_hash_and_verify_password_async():
+    password = "example"
+    hash = await hs.hash_password_async(password)
+
+    assert await hs.verify_password_async(password, hash)
+    assert await hs.verify_password_async("fake example", hash) is False
+
+    stats = hs.HashingWorkerPool().stats()
+    assert stats["completed"] >= 3
+    assert stats["active"] == 0
+    assert stats["queued"] == 0
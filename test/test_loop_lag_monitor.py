@@ -0,0 +1,32 @@
+import time
+import asyncio
+from utils.loop_lag_monitor import LoopLagMonitor, EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG
+
+def blocking_call(seconds: float) -> None:
+    time.sleep(seconds)
+
+#==================== TEST ====================
+async def test_reports_blocking_call_once(caplog):
+    monitor = LoopLagMonitor(threshold= 0.05, interval= 0.01)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        blocking_call(0.3)
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    assert EVENT_LOOP_BLOCKED._values[("test_loop_lag_monitor.py:blocking_call",)] == 1
+    assert "Event loop bloqueado" in caplog.text
+    assert "in blocking_call" in caplog.text
+    assert EVENT_LOOP_LAG._series[()][2] > 0
+
+async def test_does_not_report_without_blocking(caplog):
+    monitor = LoopLagMonitor(threshold= 0.2, interval= 0.01)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.1)
+    finally:
+        await monitor.stop()
+
+    assert "Event loop bloqueado" not in caplog.text
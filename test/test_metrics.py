@@ -0,0 +1,89 @@
+import httpx
+from fastapi import FastAPI
+from utils.metrics import MetricsRegistry, Histogram
+from middlewares.metrics_middleware import MetricsMiddleware
+from adapters.instrumented_database_connection import (InstrumentedDatabaseConnection, QueryStatistics,
+                                                       DB_QUERY_DURATION, normalize_sql)
+
+#==================== FIXTURES ====================
+from test.common_fixtures import database_mock
+
+#==================== TEST ====================
+def test_histogram_exposition():
+    histogram = Histogram("test_duration_seconds", "Duración de prueba.", ("route",), buckets= (0.1, 1.0))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value, "/x")
+
+    samples = {(name, labels): value for name, labels, value in histogram.samples()}
+
+    assert samples[("test_duration_seconds_bucket", (("route", "/x"), ("le", "0.1")))] == 1
+    assert samples[("test_duration_seconds_bucket", (("route", "/x"), ("le", "1")))] == 2
+    assert samples[("test_duration_seconds_bucket", (("route", "/x"), ("le", "+Inf")))] == 3
+    assert samples[("test_duration_seconds_count", (("route", "/x"),))] == 3
+
+def test_registry_render():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_events_total", "Eventos de prueba.", ("kind",))
+    counter.inc('a"b')
+    registry.gauge("test_callback_value", "Valor calculado.", callback= lambda: 7)
+
+    text = registry.render()
+
+    assert "# TYPE test_events_total counter" in text
+    assert 'test_events_total{kind="a\\"b"} 1' in text
+    assert "test_callback_value 7" in text
+    assert registry.counter("test_events_total", "Eventos de prueba.", ("kind",)) is counter
+
+async def test_instrumented_connection_records_queries(database_mock):
+    conn = InstrumentedDatabaseConnection(database_mock)
+    before = {labels: series[2] for labels, series in DB_QUERY_DURATION._series.items()}
+
+    async with conn.lease() as leased:
+        await leased.execute("SELECT 1;", [])
+    await conn.batch([("SELECT 1;", [])])
+
+    after = {labels: series[2] for labels, series in DB_QUERY_DURATION._series.items()}
+    assert after[("execute", "SELECT")] == before.get(("execute", "SELECT"), 0) + 1
+    assert after[("batch", "")] == before.get(("batch", ""), 0) + 1
+
+async def test_middleware_labels_by_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    async with httpx.AsyncClient(transport= httpx.ASGITransport(app= app), base_url= "http://test") as client:
+        await client.get("/items/1")
+        await client.get("/items/2")
+        await client.get("/missing")
+
+    text = MetricsRegistry().render()
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"} 2' in text
+    assert 'http_request_duration_seconds_count{method="GET",route="unmatched",status="404"} 1' in text
+
+async def test_instrumented_connection_statistics_and_slow_log(database_mock, caplog):
+    statistics = QueryStatistics()
+    conn = InstrumentedDatabaseConnection(database_mock, slow_query_threshold= 0, statistics= statistics)
+
+    async with conn.lease() as leased:
+        for user_id in (1, 2):
+            await leased.execute(f"SELECT {user_id}, ?;", ["a"])
+
+    top = statistics.top(limit= 1)
+    assert top[0]["statement"] == "SELECT ?, ?;"
+    assert (top[0]["calls"], top[0]["params"], top[0]["rows"]) == (2, 2, 2)
+    assert "Consulta lenta" in caplog.text
+
+def test_normalize_sql():
+    assert normalize_sql("INSERT INTO t(a, b)\n VALUES (?, ?), (?, ?);") == "INSERT INTO t(a, b) VALUES (?, ?), ...;"
+    assert normalize_sql("SELECT * FROM t WHERE a = 'x''y' AND b = 10;") == "SELECT * FROM t WHERE a = ? AND b = ?;"
+
+def test_query_statistics_are_bounded():
+    statistics = QueryStatistics(max_statements= 2)
+    statistics.record("A", 3.0, 0, 0)
+    statistics.record("B", 1.0, 0, 0)
+    statistics.record("C", 2.0, 0, 0)
+
+    assert [stats["statement"] for stats in statistics.top()] == ["A", "C"]
@@ -0,0 +1,17 @@
+import pytest
+from services import migration_service as ms
+
+#==================== FIXTURES ====================
+from test.common_fixtures import database_mock
+
+#==================== TEST ====================
+async def test_run_migrations(database_mock):
+    applied = await ms.run_migrations(db_conn= database_mock)
+    assert applied == [migration.version for migration in ms.MIGRATIONS]
+    assert await ms.get_applied_versions(db_conn= database_mock) == set(applied)
+
+    indexes = await database_mock.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'user';", [])
+    assert {"idx_user_username", "idx_user_email"} <= {row[0] for row in indexes}
+
+async def test_run_migrations_is_idempotent(database_mock):
+    assert await ms.run_migrations(db_conn= database_mock) == []
@@ -0,0 +1,69 @@
+import time
+import asyncio
+import pytest
+from errors.recovery_code_errors import ExpiredCodeError
+from services.migration_service import run_migrations
+from services.recovery_code_store import MemoryRecoveryCodeStore, DatabaseRecoveryCodeStore
+from services.password_recovery_code_manager import PasswordRecoveryCodeManager
+
+#==================== FIXTURES ====================
+from test.common_fixtures import database_mock
+
+@pytest.fixture
+def memory_store():
+    return MemoryRecoveryCodeStore()
+
+@pytest.fixture(params= ["memory", "database"])
+async def store(request, database_mock):
+    if request.param == "memory":
+        return MemoryRecoveryCodeStore()
+    await run_migrations(db_conn= database_mock)
+    return DatabaseRecoveryCodeStore(db_conn= database_mock)
+
+#==================== TEST ====================
+async def test_code_is_consumed_once(store):
+    await store.save(email= "test@example.com", code= "12345", expires_at= time.time() + 60)
+
+    assert not await store.consume(email= "test@example.com", code= "00000")
+    results = await asyncio.gather(*(store.consume(email= "test@example.com", code= "12345") for _ in range(5)))
+    assert results.count(True) == 1
+    assert not await store.consume(email= "missing@example.com", code= "12345")
+
+async def test_expired_code(store):
+    await store.save(email= "expired@example.com", code= "12345", expires_at= time.time() - 1)
+
+    # Un código incorrecto no revela que el código guardado expiró, con cualquiera de los almacenes.
+    assert not await store.consume(email= "expired@example.com", code= "00000")
+    with pytest.raises(ExpiredCodeError):
+        await store.consume(email= "expired@example.com", code= "12345")
+    assert not await store.consume(email= "expired@example.com", code= "12345")
+
+async def test_memory_store_purges_expired_codes(memory_store):
+    for index in range(3):
+        await memory_store.save(email= f"user{index}@example.com", code= "12345",
+                                expires_at= time.time() - 1 if index else time.time() + 60)
+
+    assert await memory_store.purge_expired() == 1
+    assert len(memory_store) == 1
+
+async def test_memory_store_evicts_least_recently_used():
+    store = MemoryRecoveryCodeStore(max_entries= 2)
+    for index in range(3):
+        await store.save(email= f"user{index}@example.com", code= "12345", expires_at= time.time() + 60)
+
+    assert len(store) == 2 and store.evictions == 1
+    assert not await store.consume(email= "user0@example.com", code= "12345")
+    assert await store.consume(email= "user2@example.com", code= "12345")
+
+async def test_sweeper_purges_in_background():
+    store = MemoryRecoveryCodeStore()
+    manager = PasswordRecoveryCodeManager()
+    original_store, manager.store = manager.store, store
+    try:
+        await store.save(email= "sweep@example.com", code= "12345", expires_at= time.time() + 0.01)
+        manager.start_sweeper(interval= 0.02)
+        await asyncio.sleep(0.1)
+        assert len(store) == 0
+    finally:
+        await manager.stop_sweeper()
+        manager.store = original_store
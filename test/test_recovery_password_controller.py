@@ -4,6 +4,7 @@ from utils.env_loader import EnvManager
 from models.request.validate_code_request import ValidateRecoveryCodeRequest
 from models.request.generate_code_request import RecoveryPasswordRequest
 from services.db_services import add_user, get_user_by_email
+from services.migration_service import run_migrations
 from test.common_fixtures import database_mock, user_with_hashed_password_fixture
 from controllers.recovery_user_password_controller import (generate_and_send_code_controller, 
                                                            updated_password_controller,
@@ -47,6 +48,7 @@ def validate_code_request_with_fake_code(validated_code_request):
 
 @pytest.fixture(scope= "module")
 async def add_data_in_database(database_mock, user_with_hashed_password_fixture):
+    await run_migrations(db_conn= database_mock)
     user_with_hashed_password_fixture.email = EnvManager().get("SENDER_EMAIL")
     await add_user(db_conn= database_mock, user= user_with_hashed_password_fixture)
     
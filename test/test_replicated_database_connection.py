@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from adapters.database_connection import DatabaseConnection
+from adapters.replicated_database_connection import ReplicatedDatabaseConnection
+from errors.database_errors import DatabaseConnectionError, DatabasePoolTimeoutError
+from utils.env_loader import EnvManager
+from connections import db_connection
+
+#==================== FIXTURES ====================
+class NamedConnection(DatabaseConnection):
+    """Conexión de prueba que responde con su nombre y registra las consultas recibidas."""
+    def __init__(self, name: str):
+        self.name = name
+        self.healthy = True
+        self.busy = False
+        self.queries = 0
+
+    async def connect(self) -> None:
+        pass
+
+    async def execute(self, query: str, params: list) -> list[tuple]:
+        if self.busy:
+            raise DatabasePoolTimeoutError("Pool agotado.")
+        if not self.healthy:
+            raise DatabaseConnectionError("Conexión caída.")
+        self.queries += 1
+        await asyncio.sleep(0.01)
+        return [(self.name,)]
+
+    async def close(self) -> None:
+        pass
+
+@pytest.fixture
+def replicated():
+    return ReplicatedDatabaseConnection(primary= NamedConnection("primary"),
+                                        replicas= [NamedConnection("replica-1"), NamedConnection("replica-2")],
+                                        read_your_writes_window= 60,
+                                        retry_interval= 60)
+
+async def read(conn: DatabaseConnection, key=None) -> str:
+    async with conn.reader(key) as reader:
+        return (await reader.execute("SELECT name;", []))[0][0]
+
+#==================== TEST ====================
+async def test_reads_are_balanced_across_replicas(replicated):
+    names = await asyncio.gather(*(read(replicated) for _ in range(4)))
+
+    assert sorted(names) == ["replica-1", "replica-1", "replica-2", "replica-2"]
+    async with replicated.lease() as conn:
+        assert (await conn.execute("UPDATE ...;", []))[0][0] == "primary"
+
+async def test_read_your_writes_uses_primary(replicated):
+    replicated.record_write(("username", "test"))
+
+    assert await read(replicated, ("username", "test")) == "primary"
+    assert await read(replicated, ("username", "other")) != "primary"
+
+async def test_failed_replica_falls_back_and_is_skipped(replicated):
+    failed = replicated.replicas[0].connection
+    failed.healthy = False
+
+    names = [await read(replicated) for _ in range(3)]
+
+    assert names[0] == "primary"
+    assert names[1:] == ["replica-2", "replica-2"]
+    assert replicated.stats()["replicas"][0]["available"] is False
+
+async def test_busy_replica_falls_back_without_being_marked_failed(replicated):
+    busy = replicated.replicas[0].connection
+    busy.busy = True
+
+    assert await read(replicated) == "primary"
+    assert replicated.stats()["replicas"][0]["available"] is True
+
+    busy.busy = False
+    assert sorted(await asyncio.gather(read(replicated), read(replicated))) == ["replica-1", "replica-2"]
+
+def test_local_file_replicas_are_rejected(monkeypatch):
+    monkeypatch.setattr(db_connection, "_DB_CONN_LIBSQL", None)
+    monkeypatch.setitem(EnvManager().get_all(), "PRODUCTION_DATABASE_REPLICA_URLS", "libsql://replica, file:replica.db")
+
+    with pytest.raises(ValueError):
+        db_connection.db_conn_libsql_client()
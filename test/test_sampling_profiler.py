@@ -0,0 +1,72 @@
+import time
+import httpx
+import asyncio
+from fastapi import FastAPI
+from services.hashing_service import HashingWorkerPool
+from middlewares.profiler_middleware import ProfilerMiddleware
+from utils.sampling_profiler import SamplingProfiler, sign_profile_request, verify_profile_request
+
+SECRET = "profiler-test-secret"
+
+def busy_wait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+def build_app(sample_rate: float = 0) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ProfilerMiddleware, sample_rate= sample_rate, secret= SECRET)
+
+    async def child():
+        busy_wait(0.05)
+
+    @app.get("/slow")
+    async def slow():
+        await asyncio.create_task(child())
+        await HashingWorkerPool().run(busy_wait, 0.05)
+        return {"ok": True}
+
+    return app
+
+async def get(app: FastAPI, path: str, headers: dict | None = None) -> httpx.Response:
+    async with httpx.AsyncClient(transport= httpx.ASGITransport(app= app), base_url= "http://test") as client:
+        return await client.get(path, headers= headers)
+
+#==================== TEST ====================
+def test_verify_profile_request():
+    expires = int(time.time()) + 60
+    header = sign_profile_request(SECRET, "/slow", expires)
+
+    assert verify_profile_request(SECRET, "/slow", header)
+    assert not verify_profile_request(SECRET, "/other", header)
+    assert not verify_profile_request("other-secret", "/slow", header)
+    assert not verify_profile_request(SECRET, "/slow", sign_profile_request(SECRET, "/slow", int(time.time()) - 1))
+    assert not verify_profile_request(SECRET, "/slow", "invalid")
+
+async def test_unsigned_request_is_not_profiled():
+    response = await get(build_app(), "/slow", headers= {"X-Debug-Profile": "123.abc"})
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+
+async def test_signed_request_profiles_child_tasks_and_thread_pool():
+    header = sign_profile_request(SECRET, "/slow", int(time.time()) + 60)
+    response = await get(build_app(), "/slow", headers= {"X-Debug-Profile": header})
+
+    profile = SamplingProfiler().get(response.headers["x-profile-id"])
+    stacks = profile.collapsed()
+
+    assert profile.summary()["route"] == "/slow"
+    assert profile.summary()["status"] == 200
+    # La tarea hija corre en el event loop; la segunda espera, en el pool de bcrypt.
+    assert "test_sampling_profiler.py:build_app.<locals>.child;test_sampling_profiler.py:busy_wait" in stacks
+    assert "hashing_service.py:HashingWorkerPool.__run;test_sampling_profiler.py:busy_wait" in stacks
+
+async def test_sample_rate_profiles_every_request():
+    before = len(SamplingProfiler().profiles())
+    await get(build_app(sample_rate= 1), "/slow")
+
+    profiles = SamplingProfiler().profiles()
+    assert len(profiles) == min(before + 1, SamplingProfiler().buffer_size)
+    assert profiles[0]["path"] == "/slow"
+    assert profiles[0]["samples"] > 0
@@ -0,0 +1,123 @@
+import base64
+import asyncio
+import pytest
+from errors.send_email_error import SendEmailError
+from services.smtp_transport import SMTPTransport
+
+#==================== FIXTURES ====================
+class LocalSMTPServer():
+    """Servidor SMTP mínimo en localhost que acepta cualquier login salvo la contraseña "wrong"."""
+    def __init__(self):
+        self.connections = 0
+        self.logins = 0
+        self.noops = 0
+        self.messages: list[str] = []
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        reply = lambda line: writer.write(f"{line}\r\n".encode())
+        reply("220 localhost")
+        while line := (await reader.readline()).decode().strip():
+            command = line.split(" ")[0].upper()
+            if command == "EHLO":
+                reply("250-localhost")
+                reply("250 AUTH PLAIN")
+            elif command == "AUTH":
+                self.logins += 1
+                password = base64.b64decode(line.split(" ")[2]).split(b"\0")[2]
+                reply("535 Invalid credentials" if password == b"wrong" else "235 Authenticated")
+            elif command == "NOOP":
+                self.noops += 1
+                reply("250 OK")
+            elif command == "DATA":
+                reply("354 Send data")
+                data = []
+                while (data_line := (await reader.readline()).decode()) != ".\r\n":
+                    data.append(data_line)
+                self.messages.append("".join(data))
+                reply("250 Queued")
+            elif command == "QUIT":
+                reply("221 Bye")
+                await writer.drain()
+                break
+            else:
+                reply("250 OK")
+            await writer.drain()
+        writer.close()
+
+@pytest.fixture
+async def smtp_server():
+    server = LocalSMTPServer()
+    server.port = await server.start()
+    yield server
+    await server.stop()
+
+@pytest.fixture
+async def transport(smtp_server):
+    transport = SMTPTransport(host= "127.0.0.1", port= smtp_server.port, use_ssl= False, allow_plaintext= True,
+                              keepalive_interval= 0, timeout= 5)
+    yield transport
+    await transport.close()
+
+#==================== TEST ====================
+async def test_sessions_are_reused(smtp_server, transport):
+    for index in range(3):
+        await transport.send("sender@example.com", "secret", "receiver@example.com", f"Subject: {index}\r\n\r\nHola")
+
+    assert len(smtp_server.messages) == 3
+    assert smtp_server.connections == 1 and smtp_server.logins == 1
+    assert smtp_server.noops == 2
+    assert transport.stats()["idle_sessions"] == 1
+
+async def test_sessions_are_keyed_by_credentials(smtp_server, transport):
+    await transport.send("first@example.com", "secret", "receiver@example.com", "Subject: 1\r\n\r\nHola")
+    await transport.send("second@example.com", "secret", "receiver@example.com", "Subject: 2\r\n\r\nHola")
+
+    assert smtp_server.logins == 2
+
+    with pytest.raises(SendEmailError):
+        await transport.send("first@example.com", "wrong", "receiver@example.com", "Subject: 3\r\n\r\nHola")
+
+async def test_idle_sessions_and_senders_are_evicted(smtp_server):
+    transport = SMTPTransport(host= "127.0.0.1", port= smtp_server.port, use_ssl= False, allow_plaintext= True,
+                              idle_timeout= 0.05, timeout= 5)
+    try:
+        await transport.send("sender@example.com", "secret", "receiver@example.com", "Subject: 1\r\n\r\nHola")
+        with pytest.raises(SendEmailError):
+            await transport.send("other@example.com", "wrong", "receiver@example.com", "Subject: 2\r\n\r\nHola")
+        assert transport.stats()["senders"] == 2
+
+        await asyncio.sleep(0.1)
+        assert await transport.evict_idle() == 1
+        assert transport.stats()["idle_sessions"] == 0
+        assert transport.stats()["senders"] == 0
+    finally:
+        await transport.close()
+
+async def test_open_session_uses_configured_tls(smtp_server):
+    # El servidor de prueba no ofrece TLS: sólo responde con texto plano admitido explícitamente.
+    transport = SMTPTransport(host= "127.0.0.1", port= smtp_server.port, use_ssl= False, allow_plaintext= True, timeout= 5)
+
+    def open_and_send():
+        with transport.open_session("sender@example.com", "secret") as session:
+            session.sendmail("sender@example.com", "receiver@example.com", "Subject: 1\r\n\r\nHola")
+
+    await asyncio.to_thread(open_and_send)
+    assert len(smtp_server.messages) == 1
+
+async def test_plaintext_login_requires_opt_in(smtp_server):
+    transport = SMTPTransport(host= "127.0.0.1", port= smtp_server.port, use_ssl= False, timeout= 5)
+    try:
+        with pytest.raises(SendEmailError):
+            await transport.send("sender@example.com", "secret", "receiver@example.com", "Subject: 1\r\n\r\nHola")
+    finally:
+        await transport.close()
+
+    assert smtp_server.logins == 0
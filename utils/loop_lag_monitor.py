@@ -0,0 +1,127 @@
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from utils.env_loader import EnvManager
+from utils.metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+METRICS = MetricsRegistry()
+EVENT_LOOP_LAG = METRICS.histogram("event_loop_lag_seconds",
+                                   "Demora del event loop en ejecutar un callback programado.",
+                                   buckets= (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+EVENT_LOOP_BLOCKED = METRICS.counter("event_loop_blocked_total",
+                                     "Bloqueos del event loop que superaron el umbral, por función que bloqueaba.",
+                                     ("location",))
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LoopLagMonitor():
+    """
+    Detector de bloqueos del event loop.
+
+    Una tarea del event loop se despierta cada `interval` segundos y registra cuánto se demoró el loop en
+    ejecutarla (`event_loop_lag_seconds`). Un hilo aparte vigila esos latidos: si el último tiene más de
+    `threshold` segundos de atraso, el loop está bloqueado por código síncrono, por lo que toma la pila del
+    hilo del loop en ese momento, la registra en el log e incrementa `event_loop_blocked_total` con la
+    función del proyecto que estaba ejecutándose. Cada bloqueo se informa una sola vez.
+
+    Attributes:
+        threshold (float): Segundos de bloqueo a partir de los cuales se informa.
+        interval (float): Segundos entre latidos.
+    """
+
+    def __init__(self, threshold: float | None = None, interval: float | None = None):
+        """
+        Inicializa una nueva instancia de LoopLagMonitor.
+
+        Args:
+            threshold (float | None): Segundos de bloqueo a partir de los cuales se informa. Por defecto,
+                la variable de entorno `LOOP_LAG_THRESHOLD_MS`.
+            interval (float | None): Segundos entre latidos. Por defecto, la variable de entorno
+                `LOOP_LAG_INTERVAL_MS`.
+        """
+        self.threshold = threshold if threshold is not None else float(EnvManager().get("LOOP_LAG_THRESHOLD_MS", 100)) / 1000
+        self.interval = interval if interval is not None else float(EnvManager().get("LOOP_LAG_INTERVAL_MS", 20)) / 1000
+        self.__heartbeat: asyncio.Task | None = None
+        self.__watchdog: threading.Thread | None = None
+        self.__stopping = threading.Event()
+        self.__last_beat = 0.0
+        self.__loop_thread = 0
+
+    def start(self) -> None:
+        """
+        Comienza a vigilar el event loop en ejecución. Si ya está vigilando, no realiza ninguna acción.
+        """
+        if self.__heartbeat is not None:
+            return
+
+        self.__loop_thread = threading.get_ident()
+        self.__last_beat = time.perf_counter()
+        self.__stopping.clear()
+        self.__heartbeat = asyncio.get_running_loop().create_task(self.__beat())
+        self.__watchdog = threading.Thread(target= self.__watch, name= "loop-lag-monitor", daemon= True)
+        self.__watchdog.start()
+
+    async def stop(self) -> None:
+        """
+        Deja de vigilar el event loop.
+        """
+        if self.__heartbeat is None:
+            return
+
+        self.__stopping.set()
+        self.__heartbeat.cancel()
+        try:
+            await self.__heartbeat
+        except asyncio.CancelledError:
+            pass
+        self.__heartbeat = None
+        await asyncio.get_running_loop().run_in_executor(None, self.__watchdog.join)
+        self.__watchdog = None
+
+    async def __beat(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            EVENT_LOOP_LAG.observe(max(now - expected, 0.0))
+            self.__last_beat = now
+
+    def __watch(self) -> None:
+        reported = None
+        # Se revisa más seguido que el umbral para tomar la pila mientras el bloqueo sigue en curso.
+        while not self.__stopping.wait(min(self.interval, self.threshold / 2)):
+            last_beat = self.__last_beat
+            blocked = time.perf_counter() - last_beat - self.interval
+            if blocked < self.threshold or last_beat == reported:
+                continue
+
+            reported = last_beat
+            frame = sys._current_frames().get(self.__loop_thread)
+            if frame is not None:
+                self.__report(blocked, frame)
+            del frame
+
+    def __report(self, blocked: float, frame) -> None:
+        location = _blocking_location(frame)
+        EVENT_LOOP_BLOCKED.inc(location)
+        logger.warning("Event loop bloqueado durante al menos %.0f ms en %s. Pila del event loop:\n%s",
+                       blocked * 1000, location, "".join(traceback.format_stack(frame)))
+
+
+def _blocking_location(frame) -> str:
+    # La función del proyecto más interna de la pila; si no hay ninguna, el frame actual.
+    innermost = frame
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(PROJECT_ROOT) and "site-packages" not in filename:
+            innermost = frame
+            break
+        frame = frame.f_back
+    return f"{os.path.basename(innermost.f_code.co_filename)}:{innermost.f_code.co_qualname}"
@@ -0,0 +1,119 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Caché en memoria acotada por cantidad de entradas (LRU) y con expiración opcional por entrada.
+
+    No es segura entre hilos; está pensada para usarse desde el event loop, donde las operaciones
+    sobre el diccionario no se intercalan.
+
+    Attributes:
+        max_size (int): Cantidad máxima de entradas. Al superarse se descarta la menos usada recientemente.
+        ttl (float | None): Segundos de vida por defecto de cada entrada. None indica que no expiran.
+        hits (int): Cantidad de lecturas que encontraron una entrada vigente.
+        misses (int): Cantidad de lecturas que no encontraron una entrada vigente.
+    """
+
+    def __init__(self, max_size: int, ttl: float | None = None):
+        if max_size < 1:
+            raise ValueError(f"Tamaño de caché inválido: {max_size}.")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.__entries: OrderedDict[K, tuple[V, float | None]] = OrderedDict()
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """
+        Obtiene el valor asociado a `key` si existe y no expiró.
+
+        Args:
+            key (K): Clave a buscar.
+            default (V | None): Valor a devolver si no hay una entrada vigente.
+
+        Returns:
+            V | None: Valor almacenado o `default`.
+        """
+        entry = self.__entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self.__entries[key]
+            self.misses += 1
+            return default
+
+        self.__entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, expires_at: float | None = None) -> tuple[K, V] | None:
+        """
+        Almacena `value` bajo `key`.
+
+        Args:
+            key (K): Clave de la entrada.
+            value (V): Valor a almacenar.
+            expires_at (float | None): Instante (epoch en segundos) en el que la entrada expira. Si no se
+                indica, se utiliza `ttl` a partir del momento actual.
+
+        Returns:
+            tuple[K, V] | None: Entrada descartada para respetar `max_size`, si la hubo.
+        """
+        if expires_at is None and self.ttl is not None:
+            expires_at = time.time() + self.ttl
+
+        self.__entries[key] = (value, expires_at)
+        self.__entries.move_to_end(key)
+
+        if len(self.__entries) > self.max_size:
+            evicted_key, (evicted_value, _) = self.__entries.popitem(last=False)
+            return evicted_key, evicted_value
+        return None
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        """
+        Elimina la entrada asociada a `key`.
+
+        Args:
+            key (K): Clave a eliminar.
+            default (V | None): Valor a devolver si la clave no existe.
+
+        Returns:
+            V | None: Valor eliminado o `default`.
+        """
+        entry = self.__entries.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[0]
+
+    def clear(self) -> None:
+        """Elimina todas las entradas y reinicia los contadores."""
+        self.__entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Devuelve el estado de la caché.
+
+        Returns:
+            dict: Cantidad de entradas, tamaño máximo, aciertos y fallos.
+        """
+        return {
+            "size": len(self.__entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def __len__(self) -> int:
+        return len(self.__entries)
@@ -0,0 +1,235 @@
+import math
+import bisect
+import threading
+from typing import Callable
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric():
+    """
+    Métrica con etiquetas. Registrar un valor cuesta una búsqueda en un diccionario y una suma bajo un
+    lock; el formateo sólo ocurre cuando se exponen las métricas.
+
+    Attributes:
+        name (str): Nombre de la métrica.
+        documentation (str): Descripción de la métrica.
+        labelnames (tuple[str, ...]): Nombres de las etiquetas, en el orden en que se indican los valores.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def samples(self) -> list[tuple[str, tuple[tuple[str, str], ...], float]]:
+        """
+        Devuelve las muestras actuales de la métrica.
+
+        Returns:
+            list[tuple[str, tuple[tuple[str, str], ...], float]]: Ternas (nombre, etiquetas, valor).
+        """
+        with self._lock:
+            values = list(self._values.items())
+        return [(self.name, tuple(zip(self.labelnames, labels)), value) for labels, value in values]
+
+    def clear(self) -> None:
+        """
+        Elimina los valores registrados.
+        """
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(Metric):
+    """
+    Contador monótono creciente.
+    """
+
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """
+        Incrementa el contador.
+
+        Args:
+            *labels (str): Valores de las etiquetas, en el orden de `labelnames`.
+            amount (float): Cantidad a sumar.
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    """
+    Valor que puede subir y bajar. Si se indica `callback`, el valor se calcula al exponer las métricas.
+
+    Attributes:
+        callback (Callable | None): Función que devuelve el valor, o un diccionario de valores por etiquetas.
+    """
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+                 callback: Callable[[], float | dict[tuple[str, ...], float] | None] | None = None):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount= -amount)
+
+    def samples(self) -> list[tuple[str, tuple[tuple[str, str], ...], float]]:
+        if self.callback is None:
+            return super().samples()
+
+        value = self.callback()
+        if value is None:
+            return []
+        if not isinstance(value, dict):
+            value = {(): value}
+        return [(self.name, tuple(zip(self.labelnames, labels)), float(sample)) for labels, sample in value.items()]
+
+
+class Histogram(Metric):
+    """
+    Histograma de observaciones con buckets fijos. Cada observación incrementa un único bucket; los
+    acumulados se calculan al exponer las métricas.
+
+    Attributes:
+        buckets (tuple[float, ...]): Límites superiores de los buckets, en orden creciente.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Registra una observación.
+
+        Args:
+            value (float): Valor observado (por ejemplo, una duración en segundos).
+            *labels (str): Valores de las etiquetas, en el orden de `labelnames`.
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Conteos por bucket (más el bucket +Inf), suma y cantidad de observaciones.
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self) -> list[tuple[str, tuple[tuple[str, str], ...], float]]:
+        with self._lock:
+            series = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items()]
+
+        samples = []
+        for labels, counts, total, count in series:
+            labelpairs = tuple(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                samples.append((f"{self.name}_bucket", (*labelpairs, ("le", _format_value(bound))), cumulative))
+            samples.append((f"{self.name}_sum", labelpairs, total))
+            samples.append((f"{self.name}_count", labelpairs, count))
+        return samples
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry():
+    """
+    Registro de métricas del proceso, expuesto en el formato de texto de Prometheus.
+
+    Implementa el patrón Singleton para que todos los módulos registren sus métricas en el mismo lugar.
+    Registrar dos veces una métrica con el mismo nombre devuelve la existente.
+    """
+    __instance = None
+
+    def __new__(cls):
+        if not cls.__instance:
+            cls.__instance = super(MetricsRegistry, cls).__new__(cls)
+        return cls.__instance
+
+    def __init__(self):
+        if not hasattr(self, "_initialized"):
+            self._initialized = True
+            self.__metrics: dict[str, Metric] = {}
+            self.__lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self.__register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+              callback: Callable[[], float | dict[tuple[str, ...], float] | None] | None = None) -> Gauge:
+        return self.__register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+                  buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.__register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Metric | None:
+        return self.__metrics.get(name)
+
+    def render(self) -> str:
+        """
+        Expone todas las métricas en el formato de texto de Prometheus (versión 0.0.4).
+
+        Returns:
+            str: Métricas formateadas.
+        """
+        lines = []
+        for metric in list(self.__metrics.values()):
+            try:
+                samples = metric.samples()
+            except Exception:
+                # Una métrica calculada que falla no debe impedir exponer el resto.
+                continue
+
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation, help_text= True)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labelpairs, value in samples:
+                labels = ",".join(f'{key}="{_escape(str(label))}"' for key, label in labelpairs)
+                lines.append(f"{name}{{{labels}}} {_format_value(value)}" if labels else f"{name} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def __register(self, metric: Metric) -> Metric:
+        with self.__lock:
+            existing = self.__metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self.__metrics[metric.name] = metric
+            return metric
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+def _escape(text: str, help_text: bool = False) -> str:
+    text = text.replace("\\", "\\\\").replace("\n", "\\n")
+    return text if help_text else text.replace('"', '\\"')
@@ -0,0 +1,333 @@
+import os
+import sys
+import hmac
+import time
+import uuid
+import asyncio
+import hashlib
+import functools
+import threading
+from collections import Counter, deque
+from contextvars import ContextVar
+from typing import Callable, TypeVar
+from utils.env_loader import EnvManager
+
+T = TypeVar("T")
+
+CURRENT_PROFILE: ContextVar["ProfileSession | None"] = ContextVar("current_profile", default= None)
+WAITING_STACK = "(waiting)"
+
+
+class ProfileSession():
+    """
+    Muestras de un request perfilado.
+
+    Se muestrea el hilo del event loop sólo mientras ejecuta una tarea del request (la que lo atiende o las
+    que ésta crea), y los hilos de los pools mientras ejecutan una función enviada con `profiled_call`. Los
+    instantes en los que ninguno de ellos trabaja para el request se registran como `(waiting)`, de modo que
+    la suma de las muestras refleja la duración total del request.
+
+    Attributes:
+        id (str): Identificador del perfil.
+        method (str): Método HTTP.
+        path (str): Ruta recibida.
+        route (str | None): Plantilla del endpoint, si el request coincidió con alguno.
+        status (int | None): Código de estado de la respuesta.
+        started_at (float): Marca de tiempo de inicio (epoch).
+        duration (float | None): Duración del request en segundos.
+        samples (Counter[str]): Cantidad de muestras por pila colapsada.
+    """
+
+    def __init__(self, method: str, path: str, loop: asyncio.AbstractEventLoop):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.route: str | None = None
+        self.status: int | None = None
+        self.started_at = time.time()
+        self.duration: float | None = None
+        self.samples: Counter[str] = Counter()
+        self.loop = loop
+        self.loop_thread = threading.get_ident()
+        self.tasks: set[asyncio.Task] = set()
+        self.__start = time.perf_counter()
+        self.__threads: dict[int, int] = {}
+        self.__lock = threading.Lock()
+
+    def add_task(self, task: asyncio.Task) -> None:
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def enter_thread(self, ident: int) -> None:
+        with self.__lock:
+            self.__threads[ident] = self.__threads.get(ident, 0) + 1
+
+    def exit_thread(self, ident: int) -> None:
+        with self.__lock:
+            if self.__threads[ident] == 1:
+                del self.__threads[ident]
+            else:
+                self.__threads[ident] -= 1
+
+    def sample(self, frames: dict, max_depth: int) -> None:
+        """
+        Registra una muestra a partir de las pilas actuales de los hilos.
+
+        Args:
+            frames (dict): Resultado de `sys._current_frames()`.
+            max_depth (int): Cantidad máxima de frames por pila.
+        """
+        with self.__lock:
+            threads = list(self.__threads)
+        if asyncio.current_task(self.loop) in self.tasks:
+            threads.append(self.loop_thread)
+
+        stacks = [collapse_stack(frames[ident], max_depth) for ident in threads if ident in frames]
+        with self.__lock:
+            self.samples.update(stacks or (WAITING_STACK,))
+
+    def finish(self, status: int, route: str | None) -> None:
+        self.status = status
+        self.route = route
+        self.duration = time.perf_counter() - self.__start
+
+    def collapsed(self) -> str:
+        """
+        Devuelve las muestras en formato de pilas colapsadas (`frame;frame;frame cantidad` por línea), el que
+        usan `flamegraph.pl`, speedscope e inferno.
+
+        Returns:
+            str: Pilas colapsadas.
+        """
+        with self.__lock:
+            samples = sorted(self.samples.items())
+        return "".join(f"{stack} {count}\n" for stack, count in samples)
+
+    def summary(self) -> dict:
+        with self.__lock:
+            sample_count = sum(self.samples.values())
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3) if self.duration is not None else None,
+            "samples": sample_count
+        }
+
+
+class SamplingProfiler():
+    """
+    Profiler estadístico para requests individuales.
+
+    Mientras hay requests perfilados, un hilo lee las pilas de todos los hilos con `sys._current_frames()`
+    cada `interval` segundos y las asigna a los perfiles en curso; sin requests perfilados no hay hilo ni
+    costo alguno. Los perfiles terminados se guardan en un buffer circular de `buffer_size` elementos.
+
+    Para seguir al request entre tareas se instala un task factory en el event loop que asocia las tareas
+    nuevas al perfil del request que las crea. Los saltos a los pools de hilos se siguen envolviendo la
+    función enviada al pool con `profiled_call`.
+
+    Implementa el patrón Singleton.
+
+    Attributes:
+        interval (float): Segundos entre muestras.
+        buffer_size (int): Cantidad máxima de perfiles guardados.
+        max_depth (int): Cantidad máxima de frames por pila.
+    """
+    __instance = None
+
+    def __new__(cls):
+        if not cls.__instance:
+            cls.__instance = super(SamplingProfiler, cls).__new__(cls)
+        return cls.__instance
+
+    def __init__(self):
+        if not hasattr(self, "_initialized"):
+            self._initialized = True
+            self.interval = float(EnvManager().get("PROFILER_INTERVAL_MS", 5)) / 1000
+            self.buffer_size = max(1, int(EnvManager().get("PROFILER_BUFFER_SIZE", 50)))
+            self.max_depth = 128
+            self.__profiles: deque[ProfileSession] = deque(maxlen= self.buffer_size)
+            self.__active: set[ProfileSession] = set()
+            self.__sampler: threading.Thread | None = None
+            self.__lock = threading.Lock()
+
+    def start(self, method: str, path: str) -> ProfileSession:
+        """
+        Comienza a perfilar la tarea actual. Debe llamarse desde la tarea que atiende el request.
+
+        Args:
+            method (str): Método HTTP.
+            path (str): Ruta recibida.
+
+        Returns:
+            ProfileSession: Perfil en curso; se termina con `stop()`.
+        """
+        loop = asyncio.get_running_loop()
+        _install_task_factory(loop)
+
+        session = ProfileSession(method, path, loop)
+        session.add_task(asyncio.current_task())
+        with self.__lock:
+            self.__active.add(session)
+            if self.__sampler is None:
+                self.__sampler = threading.Thread(target= self.__sample_loop, name= "sampling-profiler", daemon= True)
+                self.__sampler.start()
+        return session
+
+    def stop(self, session: ProfileSession, status: int, route: str | None = None) -> None:
+        """
+        Termina un perfil y lo guarda en el buffer.
+
+        Args:
+            session (ProfileSession): Perfil devuelto por `start()`.
+            status (int): Código de estado de la respuesta.
+            route (str | None): Plantilla del endpoint, si el request coincidió con alguno.
+        """
+        session.finish(status, route)
+        session.tasks.clear()
+        with self.__lock:
+            self.__active.discard(session)
+            self.__profiles.append(session)
+
+    def profiles(self) -> list[dict]:
+        """
+        Devuelve el resumen de los perfiles guardados, del más reciente al más antiguo.
+
+        Returns:
+            list[dict]: Resumen de cada perfil.
+        """
+        with self.__lock:
+            profiles = list(self.__profiles)
+        return [profile.summary() for profile in reversed(profiles)]
+
+    def get(self, profile_id: str) -> ProfileSession | None:
+        with self.__lock:
+            return next((profile for profile in self.__profiles if profile.id == profile_id), None)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__profiles.clear()
+
+    def __sample_loop(self) -> None:
+        while True:
+            with self.__lock:
+                sessions = list(self.__active)
+                if not sessions:
+                    # El siguiente request perfilado vuelve a iniciar el hilo.
+                    self.__sampler = None
+                    return
+
+            frames = sys._current_frames()
+            for session in sessions:
+                session.sample(frames, self.max_depth)
+            del frames
+            time.sleep(self.interval)
+
+
+def profiled_call(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Prepara una función para ejecutarla en un pool de hilos de modo que, si el request actual se está
+    perfilando, también se muestree el hilo que la ejecuta.
+
+    Debe llamarse en la tarea que envía la función al pool, por ejemplo
+    `loop.run_in_executor(executor, profiled_call(func), *args)`.
+
+    Args:
+        func (Callable[..., T]): Función a ejecutar en el pool.
+
+    Returns:
+        Callable[..., T]: La propia función si no hay un perfil en curso; si lo hay, un envoltorio que
+            registra el hilo en el perfil mientras se ejecuta.
+    """
+    session = CURRENT_PROFILE.get()
+    if session is None:
+        return func
+
+    @functools.wraps(func)
+    def call(*args, **kwargs) -> T:
+        ident = threading.get_ident()
+        session.enter_thread(ident)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            session.exit_thread(ident)
+
+    return call
+
+def collapse_stack(frame, max_depth: int) -> str:
+    """
+    Convierte una pila en una línea de pila colapsada, de la raíz al frame actual.
+
+    Args:
+        frame (FrameType): Frame actual del hilo.
+        max_depth (int): Cantidad máxima de frames; se conservan los más cercanos al frame actual.
+
+    Returns:
+        str: Frames separados por `;`, con el formato `archivo.py:función`.
+    """
+    names = []
+    while frame is not None and len(names) < max_depth:
+        names.append(_frame_name(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+def sign_profile_request(secret: str, path: str, expires: int) -> str:
+    """
+    Genera el valor de la cabecera `X-Debug-Profile` que solicita perfilar un request.
+
+    Args:
+        secret (str): Valor de la variable de entorno `PROFILER_SECRET`.
+        path (str): Ruta del request a perfilar (por ejemplo, `/user/me`).
+        expires (int): Marca de tiempo (epoch, en segundos) a partir de la cual la firma deja de ser válida.
+
+    Returns:
+        str: Valor de la cabecera, con el formato `<expires>.<firma>`.
+    """
+    signature = hmac.new(secret.encode(), f"{expires}:{path}".encode(), hashlib.sha256).hexdigest()
+    return f"{expires}.{signature}"
+
+def verify_profile_request(secret: str, path: str, header: str) -> bool:
+    """
+    Verifica el valor de la cabecera `X-Debug-Profile`.
+
+    Args:
+        secret (str): Valor de la variable de entorno `PROFILER_SECRET`.
+        path (str): Ruta del request.
+        header (str): Valor recibido en la cabecera.
+
+    Returns:
+        bool: True si la firma corresponde a la ruta y no expiró.
+    """
+    expires, _, _ = header.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(header.encode(), sign_profile_request(secret, path, int(expires)).encode())
+
+
+@functools.lru_cache(maxsize= 4096)
+def _frame_name(code) -> str:
+    return f"{os.path.basename(code.co_filename)}:{code.co_qualname}"
+
+def _install_task_factory(loop: asyncio.AbstractEventLoop) -> None:
+    previous = loop.get_task_factory()
+    if getattr(previous, "_profiler_factory", False):
+        return
+
+    def task_factory(loop: asyncio.AbstractEventLoop, coro, **kwargs) -> asyncio.Task:
+        if previous is not None:
+            task = previous(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop= loop, **kwargs)
+
+        context = kwargs.get("context")
+        session = context.get(CURRENT_PROFILE) if context is not None else CURRENT_PROFILE.get()
+        if session is not None:
+            session.add_task(task)
+        return task
+
+    task_factory._profiler_factory = True
+    loop.set_task_factory(task_factory)
@@ -0,0 +1,66 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Agrupa llamadas concurrentes con la misma clave para que compartan una única ejecución.
+
+    La primera llamada con una clave lanza `func` como tarea; las llamadas que llegan mientras esa tarea
+    está en curso esperan su mismo resultado (o su misma excepción). La tarea se protege con
+    `asyncio.shield`, de modo que cancelar a uno de los que esperan no cancela la consulta del resto.
+
+    Attributes:
+        calls (int): Ejecuciones lanzadas.
+        shared (int): Llamadas resueltas con una ejecución ya en curso.
+    """
+
+    def __init__(self):
+        self.__in_flight: dict[K, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: K, func: Callable[[], Awaitable[V]]) -> V:
+        """
+        Ejecuta `func`, o espera la ejecución en curso para `key` si la hay.
+
+        Args:
+            key (K): Clave que identifica llamadas equivalentes.
+            func (Callable[[], Awaitable[V]]): Función que realiza la operación.
+
+        Returns:
+            V: Resultado compartido de la ejecución. Quien lo reciba no debe modificarlo.
+        """
+        task = self.__in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self.__in_flight[key] = task
+            task.add_done_callback(lambda done: self.__forget(key, done))
+            self.calls += 1
+        else:
+            self.shared += 1
+
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """
+        Devuelve el estado de las ejecuciones agrupadas.
+
+        Returns:
+            dict: Ejecuciones en curso, ejecuciones lanzadas y llamadas que compartieron una ejecución.
+        """
+        return {
+            "in_flight": len(self.__in_flight),
+            "calls": self.calls,
+            "shared": self.shared
+        }
+
+    def __forget(self, key: K, task: asyncio.Task) -> None:
+        if self.__in_flight.get(key) is task:
+            del self.__in_flight[key]
+        # Si todos los que esperaban fueron cancelados, la excepción se da por consumida.
+        if not task.cancelled():
+            task.exception()